@@ -1,38 +1,137 @@
 import argparse
+import csv
+import sqlite3
+import sys
 from pathlib import Path
 
+from models.benchmark_cache import CACHE_DIR_NAME, fingerprint_benchmark_dir
+from models.cross_benchmark import CrossBenchmark
+from models.run_index import RUN_COLUMNS, RUN_INDEX_FILE_NAME, RunIndex
+from models.run_store import RUN_STORE_SUFFIX, RunStore, is_run_store
+from performance.performance_suite import REPORT_TYPES, PerformanceSuite
+from performance.synthetic_benchmark import STOP_CONDITIONS, SyntheticBenchmark
+from report.batch_report import BatchReport
 from report.report_factory import ReportFactory
 from src.models.benchmark import Benchmark
+from statistics.regression_detection import METHODS, RegressionDetector
+from utils.benchmark_archive import PACK_FORMATS, archive_format, check_archive_format, is_benchmark_archive, \
+    pack_benchmark
+from utils.benchmark_filter import GeneratorFilter
+from utils.benchmark_paths import benchmark_name, find_benchmark_dirs, is_benchmark_dir
+from utils.parallel import parallel_map
+from utils.profiler import TIMINGS_FILE_NAME, Profiler, profile_stage
 
-if __name__ == '__main__':
+def _generator_filter(parser: argparse.ArgumentParser, args: argparse.Namespace) -> GeneratorFilter:
+    try:
+        return GeneratorFilter(args.whitelist, args.blacklist)
+    except ValueError as e:
+        parser.error(str(e))
+
+
+def _check_archive_formats(parser: argparse.ArgumentParser, paths: list[Path]):
+    try:
+        for path in paths:
+            if is_benchmark_archive(path):
+                check_archive_format(archive_format(path))
+    except ImportError as e:
+        parser.error(str(e))
+
+
+def report_main(arguments: list[str]):
     parser = argparse.ArgumentParser(
-        description='Create benchmark plots & human-readable reports from GraphWalker benchmark output.')
-    parser.add_argument('--benchmark', '-b', type=str, help='Path to the benchmark directory.', required=True)
+        description='Create benchmark plots & human-readable reports from GraphWalker benchmark output. Other '
+                    'commands: \"main.py cross --help\", \"main.py compare --help\", \"main.py perf --help\", '
+                    '\"main.py pack --help\", \"main.py convert --help\", \"main.py query --help\".')
+    parser.add_argument('--benchmark', '-b', type=str, nargs='+', required=True,
+                        help='Path to the benchmark directory, a .zip, .tar.gz or .tar.zst archive of it (see '
+                             '\"main.py pack\") or a run store (see \"main.py convert\"). Several directories, '
+                             'parent directories of benchmarks or glob patterns (e.g. \"results/*_fast\") create a '
+                             'report per benchmark concurrently, with a summary index.html in the output directory.')
     parser.add_argument('--output', '-o', type=str, help='Path to the output directory. Default \".\"', default='.')
     parser.add_argument('--output_suffix', '-s', type=str, help='Suffix to append to the output directory name.')
     parser.add_argument('--report_type', '-r', type=str,
                         help='Type of report to generate. Default \"html\". Options: html, pdf, raw_data, csv\nNote that pdf requires playwright to be installed. (\'playwright install\', using an activated python environment with playwright)',
                         default='html')
-    parser.add_argument('--whitelist', nargs='+', help='Whitelist of generators to include in the report.')
-    parser.add_argument('--blacklist', nargs='+', help='Blacklist of generators to exclude from the report.')
+    parser.add_argument('--whitelist', nargs='+',
+                        help='Whitelist of generators to include in the report, by algorithm name, glob or /regex/, '
+                             'with optional coverage and stop condition clauses, e.g. \"QuickRandom*:coverage>=80\" '
+                             'or \"*:condition=reached_vertex\". Other generators are not loaded.')
+    parser.add_argument('--blacklist', nargs='+',
+                        help='Blacklist of generators to exclude from the report, as the whitelist patterns. Excluded '
+                             'generators are not loaded.')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Number of workers used to load the benchmark and render plots, or to process benchmarks '
+                             'in batch mode. Default 1, 0 uses every available CPU.')
+    parser.add_argument('--threads', action='store_true',
+                        help='Use a thread pool instead of a process pool to load the benchmark.')
+    parser.add_argument('--no_cache', action='store_true',
+                        help='Do not load the runs from, or store them in, the benchmark\'s columnar cache.')
+    parser.add_argument('--cache_dir', type=str,
+                        help='Directory of the benchmark\'s columnar cache, with a subdirectory per benchmark in batch '
+                             'mode. Default \"<benchmark>/.benchmark_cache\", or '
+                             '\"<file directory>/.benchmark_cache/<file name>\" for an archive or run store')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only recreate the plots, statistics and files whose inputs changed since the previous '
+                             'report in the output directory.')
+    parser.add_argument('--models_dir', type=str, default='graphwalker_models',
+                        help='Directory of the GraphWalker model files, used to add path redundancy statistics when '
+                             'the benchmark\'s model file is found there. Default \"graphwalker_models\"')
+    parser.add_argument('--profile', action='store_true',
+                        help=f'Measure the time and peak memory of every stage of the report, and of every plot and '
+                             f'statistics function, and write them to \"{TIMINGS_FILE_NAME}\" next to the report. '
+                             f'Memory tracing slows the report down.')
     parser.add_argument('--verbose', '-v', action='store_true', help='Print verbose output.')
-    args = parser.parse_args()
+    args = parser.parse_args(arguments)
+    # Compiled early to fail fast if a pattern is invalid
+    generator_filter = _generator_filter(parser, args)
 
-    input_path = Path(args.benchmark)
-    if not input_path.exists():
-        print(f'Error: Path \"{input_path.absolute()}\" does not exist.')
-        raise FileNotFoundError(input_path.absolute())
+    try:
+        input_paths = find_benchmark_dirs(args.benchmark)
+    except FileNotFoundError as e:
+        print(f'Error: {e}')
+        raise
+    _check_archive_formats(parser, input_paths)
+    if not input_paths:
+        print(f'Error: No benchmark directories found in {", ".join(args.benchmark)}.')
+        raise FileNotFoundError(args.benchmark)
+
+    if len(args.benchmark) > 1 or not is_benchmark_dir(Path(args.benchmark[0])):
+        if args.verbose:
+            print(f'Creating reports for {len(input_paths)} benchmarks')
+
+        batch_report = BatchReport(args.report_type, jobs=args.jobs, use_threads=args.threads,
+                                   use_cache=not args.no_cache, cache_dir=args.cache_dir,
+                                   incremental=args.incremental, output_suffix=args.output_suffix,
+                                   models_dir=args.models_dir, profile=args.profile, verbose=args.verbose)
+        summaries = batch_report.create_reports(input_paths, Path(args.output), whitelist=args.whitelist,
+                                                blacklist=args.blacklist)
+        print(f'Summary index created at \"{Path(args.output) / "index.html"}\"')
+        if any(summary['error'] for summary in summaries):
+            raise SystemExit(1)
+        return
+
+    input_path = input_paths[0]
+    profiler = Profiler() if args.profile else None
 
     # Create early to fail fast if the report type is invalid
-    report_factory = ReportFactory(args.report_type)
+    report_factory = ReportFactory(args.report_type, jobs=args.jobs, incremental=args.incremental, profiler=profiler)
 
     if args.verbose:
         print(f'Creating benchmark from \"{input_path}\"')
 
-    benchmark = Benchmark.from_dir(str(input_path.absolute()))
+    with profile_stage(profiler, 'load'):
+        benchmark = Benchmark.from_dir(str(input_path.absolute()), jobs=args.jobs, use_threads=args.threads,
+                                       use_cache=not args.no_cache, cache_dir=args.cache_dir,
+                                       generator_filter=generator_filter)
     if args.verbose:
         print(f'Loaded benchmark \"{benchmark}\" with {len(benchmark.report.generators)} generators.')
 
+    with profile_stage(profiler, 'model_graph'):
+        model_graph = benchmark.load_model_graph(args.models_dir)
+    if model_graph is not None and args.verbose:
+        print(f'Loaded model graph with {benchmark.model_graph.vertex_count} vertices and '
+              f'{benchmark.model_graph.edge_count} edges.')
+
     output = Path(args.output)
     output = output / benchmark.name if not args.output_suffix else output / f'{benchmark.name}{args.output_suffix}'
     output.mkdir(parents=True, exist_ok=True)
@@ -40,4 +139,322 @@ if __name__ == '__main__':
     if args.verbose:
         print(f'Saving output to \"{output.absolute()}\"')
 
-    report_factory.create_report(benchmark, output, whitelist=args.whitelist, blacklist=args.blacklist)
+    with profile_stage(profiler, 'report'):
+        report_factory.create_report(benchmark, output, whitelist=args.whitelist, blacklist=args.blacklist)
+
+    if profiler is not None:
+        profiler.write(output / TIMINGS_FILE_NAME, benchmark=benchmark.name, report_type=args.report_type,
+                       jobs=args.jobs, cache=not args.no_cache, incremental=args.incremental)
+        if args.verbose:
+            print(f'Timings written to \"{output / TIMINGS_FILE_NAME}\"')
+
+
+def cross_main(arguments: list[str]):
+    parser = argparse.ArgumentParser(
+        prog='main.py cross',
+        description='Compare the same generators across benchmarks of different models, aligned by algorithm and stop '
+                    'coverage and normalized by model size.')
+    parser.add_argument('--benchmark', '-b', type=str, nargs='+', required=True,
+                        help='Paths to the benchmark directories, parent directories of benchmarks or glob patterns. '
+                             'The first benchmark is the baseline for relative differences.')
+    parser.add_argument('--output', '-o', type=str, help='Path to the output directory. Default \".\"', default='.')
+    parser.add_argument('--output_suffix', '-s', type=str, help='Suffix to append to the output directory name.')
+    parser.add_argument('--whitelist', nargs='+',
+                        help='Whitelist of generators to include in the report, by algorithm name, glob or /regex/, '
+                             'with optional coverage and stop condition clauses, e.g. \"QuickRandom*:coverage>=80\" '
+                             'or \"*:condition=reached_vertex\". Other generators are not loaded.')
+    parser.add_argument('--blacklist', nargs='+',
+                        help='Blacklist of generators to exclude from the report, as the whitelist patterns. Excluded '
+                             'generators are not loaded.')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Number of workers used to load the benchmarks and render plots. Default 1, 0 uses every '
+                             'available CPU.')
+    parser.add_argument('--no_cache', action='store_true',
+                        help='Do not load the runs from, or store them in, the benchmarks\' columnar caches.')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Print verbose output.')
+    args = parser.parse_args(arguments)
+    generator_filter = _generator_filter(parser, args)
+
+    input_paths = find_benchmark_dirs(args.benchmark)
+    _check_archive_formats(parser, input_paths)
+
+    benchmarks = []
+    for input_path in input_paths:
+        if args.verbose:
+            print(f'Creating benchmark from \"{input_path}\"')
+        benchmarks.append(Benchmark.from_dir(str(input_path.absolute()), jobs=args.jobs,
+                                             use_cache=not args.no_cache, generator_filter=generator_filter))
+
+    cross_benchmark = CrossBenchmark(benchmarks, args.whitelist, args.blacklist)
+    if args.verbose:
+        print(f'Aligned {len(cross_benchmark.aligned_keys)} generators across {len(benchmarks)} benchmarks.')
+
+    output = Path(args.output) / f'cross_benchmark{args.output_suffix or ""}'
+    output.mkdir(parents=True, exist_ok=True)
+
+    if args.verbose:
+        print(f'Saving output to \"{output.absolute()}\"')
+
+    ReportFactory.create_cross_report(cross_benchmark, output, args.jobs)
+
+
+def compare_main(arguments: list[str]):
+    parser = argparse.ArgumentParser(
+        prog='main.py compare',
+        description='Detect performance regressions of a candidate benchmark compared to a baseline benchmark, by '
+                    'testing the per-run generation time, test suite size and test duration of every generator. Exits '
+                    'with status 1 if a regression is found.')
+    parser.add_argument('--baseline', '-b', type=str, required=True, help='Path to the baseline benchmark directory.')
+    parser.add_argument('--candidate', '-c', type=str, required=True,
+                        help='Path to the candidate benchmark directory.')
+    parser.add_argument('--output', '-o', type=str,
+                        help='Path to the output directory to write comparison.json and comparison.csv to.')
+    parser.add_argument('--method', '-m', type=str, choices=METHODS, default='mann_whitney',
+                        help='Statistical test. Default \"mann_whitney\" (one-sided Mann-Whitney U test), '
+                             '\"bootstrap\" uses a bootstrap confidence interval of the ratio of the medians.')
+    parser.add_argument('--alpha', type=float, default=0.05, help='Significance level. Default 0.05')
+    parser.add_argument('--threshold', type=float, default=5.0,
+                        help='Minimum change of the median, in percentage, to report. Default 5')
+    parser.add_argument('--resamples', type=int, default=10000, help='Number of bootstrap resamples. Default 10000')
+    parser.add_argument('--whitelist', nargs='+',
+                        help='Whitelist of generators to compare, by algorithm name, glob or /regex/, with optional '
+                             'coverage and stop condition clauses, e.g. \"QuickRandom*:coverage>=80\".')
+    parser.add_argument('--blacklist', nargs='+',
+                        help='Blacklist of generators to exclude from the comparison, as the whitelist patterns.')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Number of workers used to load the benchmarks. Default 1, 0 uses every available CPU.')
+    parser.add_argument('--no_cache', action='store_true',
+                        help='Do not load the runs from, or store them in, the benchmarks\' columnar caches.')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Print verbose output.')
+    args = parser.parse_args(arguments)
+
+    detector = RegressionDetector(args.method, args.alpha, args.threshold, args.resamples)
+    generator_filter = _generator_filter(parser, args)
+    _check_archive_formats(parser, [Path(args.baseline), Path(args.candidate)])
+    baseline = Benchmark.from_dir(args.baseline, jobs=args.jobs, use_cache=not args.no_cache,
+                                  generator_filter=generator_filter)
+    candidate = Benchmark.from_dir(args.candidate, jobs=args.jobs, use_cache=not args.no_cache,
+                                   generator_filter=generator_filter)
+
+    results = detector.compare(baseline, candidate, args.whitelist, args.blacklist)
+
+    if args.output:
+        output = Path(args.output)
+        output.mkdir(parents=True, exist_ok=True)
+        ReportFactory.create_comparison_report(results, output)
+        if args.verbose:
+            print(f'Saving output to \"{output.absolute()}\"')
+
+    regressions = [result for result in results if result['status'] == 'regression']
+    for result in results:
+        if result['status'] != 'unchanged' or args.verbose:
+            print(f'{result["status"].upper():<12} {result["generator"]:<50} {result["metric"]:<15} '
+                  f'{result["baseline_median"]:>12.1f} -> {result["candidate_median"]:>12.1f} '
+                  f'({result["change"]:+.1f}%)')
+
+    print(f'Compared {len(results)} generator metrics: {len(regressions)} regressions, '
+          f'{sum(result["status"] == "improvement" for result in results)} improvements.')
+    if regressions:
+        raise SystemExit(1)
+
+
+def perf_main(arguments: list[str]):
+    parser = argparse.ArgumentParser(
+        prog='main.py perf',
+        description='Measure the performance of this tool on a synthetic benchmark of the given size: loading, '
+                    'statistics, plots and every report type. Results are appended to a JSON history and compared to '
+                    'the previous result of the same parameters.')
+    parser.add_argument('--generators', '-g', type=int, default=3,
+                        help='Number of path generator algorithms. Default 3')
+    parser.add_argument('--coverage_values', '-c', type=int, nargs='+', default=[80, 90, 100],
+                        help='Stop coverages every algorithm is run with. Default 80 90 100')
+    parser.add_argument('--runs', '-n', type=int, default=30, help='Number of runs per generator. Default 30')
+    parser.add_argument('--vertices', type=int, default=75, help='Number of vertices of the model. Default 75')
+    parser.add_argument('--edges', type=int, default=144,
+                        help='Number of edges of the model, at least the number of vertices. Default 144')
+    parser.add_argument('--path_length', '-l', type=int, default=500,
+                        help='Average number of elements of the paths at 100%% coverage. Default 500')
+    parser.add_argument('--stop_condition', type=str, choices=STOP_CONDITIONS, default='EdgeCoverage',
+                        help='Stop condition of the generators. Default \"EdgeCoverage\"')
+    parser.add_argument('--no_test_results', action='store_true', help='Do not create test results for the runs.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic benchmark. Default 0')
+    parser.add_argument('--report_types', '-r', type=str, nargs='+', choices=REPORT_TYPES,
+                        default=REPORT_TYPES[:-1],
+                        help='Report types to measure. Default html raw_data csv, pdf requires playwright.')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of times to measure every stage, the minimum and median are reported. Default 3')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Number of workers used to load the benchmark and render plots. Default 1, 0 uses every '
+                             'available CPU.')
+    parser.add_argument('--history', type=str, default='performance_history.json',
+                        help='JSON file to append the result to. Default \"performance_history.json\"')
+    parser.add_argument('--label', type=str, help='Name of the result in the history, such as the change measured.')
+    parser.add_argument('--work_dir', type=str,
+                        help='Directory to write the synthetic benchmark and reports to, which is kept. Default a '
+                             'temporary directory.')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Print verbose output.')
+    args = parser.parse_args(arguments)
+
+    synthetic_benchmark = SyntheticBenchmark(args.generators, args.coverage_values, args.runs, args.vertices,
+                                             args.edges, args.path_length, args.stop_condition,
+                                             not args.no_test_results, args.seed)
+    suite = PerformanceSuite(synthetic_benchmark, args.report_types, args.repeat, args.jobs,
+                             Path(args.work_dir) if args.work_dir else None, args.verbose)
+    result = suite.run(args.label)
+
+    previous = PerformanceSuite.append_history(Path(args.history), result)
+    print(PerformanceSuite.format_comparison(result, previous))
+    print(f'Result appended to \"{args.history}\"')
+
+
+def _pack(task: tuple[Path, Path, str, int]) -> Path:
+    benchmark_dir, output_file, archive_type, compression_level = task
+    pack_benchmark(benchmark_dir, output_file, archive_type, compression_level, exclude=[CACHE_DIR_NAME])
+    return output_file
+
+
+def pack_main(arguments: list[str]):
+    parser = argparse.ArgumentParser(
+        prog='main.py pack',
+        description='Pack benchmark output directories into archives, which every command reads. Zip archives are '
+                    'read without extracting them, tar archives are extracted once to the temporary directory. The '
+                    'columnar cache is left out.')
+    parser.add_argument('--benchmark', '-b', type=str, nargs='+', required=True,
+                        help='Paths to the benchmark directories, parent directories of benchmarks or glob patterns.')
+    parser.add_argument('--output', '-o', type=str, default='.',
+                        help='Path to the output directory, an archive named after the benchmark is written per '
+                             'benchmark. Default \".\"')
+    parser.add_argument('--format', '-f', type=str, choices=PACK_FORMATS, default='zip',
+                        help='Archive format. Default \"zip\", the only format whose files are read on demand. '
+                             'tar.zst requires the zstandard package.')
+    parser.add_argument('--level', type=int, help='Compression level. Default the format\'s default level')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Number of benchmarks to pack concurrently. Default 1, 0 uses every available CPU.')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Print verbose output.')
+    args = parser.parse_args(arguments)
+    try:
+        check_archive_format(args.format)
+    except ImportError as e:
+        parser.error(str(e))
+
+    benchmark_dirs = [path for path in find_benchmark_dirs(args.benchmark) if not is_benchmark_archive(path)]
+    if not benchmark_dirs:
+        print(f'Error: No benchmark directories found in {", ".join(args.benchmark)}.')
+        raise FileNotFoundError(args.benchmark)
+
+    output = Path(args.output)
+    output.mkdir(parents=True, exist_ok=True)
+    tasks = [(benchmark_dir, output / f'{benchmark_dir.name}.{args.format}', args.format, args.level)
+             for benchmark_dir in benchmark_dirs]
+    for output_file in parallel_map(_pack, tasks, args.jobs):
+        if args.verbose:
+            print(f'Packed \"{output_file}\" ({output_file.stat().st_size / 2 ** 20:.1f} MiB)')
+
+
+def convert_main(arguments: list[str]):
+    parser = argparse.ArgumentParser(
+        prog='main.py convert',
+        description=f'Convert benchmark directories or archives to run stores: a single SQLite database per benchmark '
+                    f'holding every run, indexed by generator, stop coverage and iteration, which every command reads '
+                    f'like a benchmark directory.')
+    parser.add_argument('--benchmark', '-b', type=str, nargs='+', required=True,
+                        help='Paths to the benchmark directories or archives, parent directories of benchmarks or glob '
+                             'patterns.')
+    parser.add_argument('--output', '-o', type=str, default='.',
+                        help=f'Path to the output directory, a \"<benchmark>{RUN_STORE_SUFFIX}\" store is written per '
+                             f'benchmark. Default \".\"')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Number of workers used to read the runs of a benchmark. Default 1, 0 uses every '
+                             'available CPU.')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Print verbose output.')
+    args = parser.parse_args(arguments)
+
+    benchmark_paths = [path for path in find_benchmark_dirs(args.benchmark) if not is_run_store(path)]
+    _check_archive_formats(parser, benchmark_paths)
+    if not benchmark_paths:
+        print(f'Error: No benchmark directories found in {", ".join(args.benchmark)}.')
+        raise FileNotFoundError(args.benchmark)
+
+    output = Path(args.output)
+    output.mkdir(parents=True, exist_ok=True)
+    for benchmark_path in benchmark_paths:
+        output_file = RunStore.convert(benchmark_path,
+                                       output / f'{benchmark_name(benchmark_path)}{RUN_STORE_SUFFIX}',
+                                       args.jobs)
+        if args.verbose:
+            print(f'Converted \"{benchmark_path}\" to \"{output_file}\" '
+                  f'({output_file.stat().st_size / 2 ** 20:.1f} MiB)')
+
+
+def query_main(arguments: list[str]):
+    parser = argparse.ArgumentParser(
+        prog='main.py query',
+        description='Query the generators, runs and per-element visits of benchmarks through an SQLite index. The '
+                    'tables are benchmarks, generators, runs, elements and visits, the views run_view and visit_view '
+                    'join them. Without a query, the runs matching the filter options are listed.',
+        epilog='Example: main.py query -b results \"SELECT seed, test_suite_size FROM run_view WHERE algorithm = '
+               '\'QuickRandomPath\' AND stop_coverage = 90 ORDER BY test_suite_size DESC\"')
+    parser.add_argument('sql', type=str, nargs='?', help='SQL query to run.')
+    parser.add_argument('--index', '-i', type=str, default=RUN_INDEX_FILE_NAME,
+                        help=f'Path to the index file, created if it does not exist. Default \"{RUN_INDEX_FILE_NAME}\"')
+    parser.add_argument('--benchmark', '-b', type=str, nargs='+',
+                        help='Benchmark directories, archives or run stores, parent directories of benchmarks or glob '
+                             'patterns to add to the index before querying. Benchmarks whose files did not change '
+                             'since they were indexed are skipped.')
+    parser.add_argument('--remove', type=str, nargs='+', help='Names of benchmarks to remove from the index.')
+    parser.add_argument('--columns', type=str, nargs='+', choices=RUN_COLUMNS,
+                        help='Columns to list without a query. Default every column')
+    parser.add_argument('--algorithm', type=str, help='Only list the runs of this algorithm, without a query.')
+    parser.add_argument('--stop_coverage', type=int, help='Only list the runs of this stop coverage, without a query.')
+    parser.add_argument('--seed', type=int, help='Only list the runs of this seed, without a query.')
+    parser.add_argument('--csv', action='store_true', help='Print the result as CSV instead of a table.')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Number of workers used to load the benchmarks. Default 1, 0 uses every available CPU.')
+    parser.add_argument('--no_cache', action='store_true',
+                        help='Do not load the runs from, or store them in, the benchmarks\' columnar caches.')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Print verbose output.')
+    args = parser.parse_args(arguments)
+    input_paths = find_benchmark_dirs(args.benchmark) if args.benchmark else []
+    _check_archive_formats(parser, input_paths)
+
+    with RunIndex(Path(args.index)) as index:
+        for name in args.remove or []:
+            index.remove(name)
+
+        indexed = index.benchmarks
+        for input_path in input_paths:
+            fingerprint = fingerprint_benchmark_dir(input_path)
+            if indexed.get(benchmark_name(input_path)) == fingerprint:
+                if args.verbose:
+                    print(f'\"{input_path}\" is already indexed')
+                continue
+            benchmark = Benchmark.from_dir(str(input_path.absolute()), jobs=args.jobs, use_cache=not args.no_cache)
+            index.add(benchmark, fingerprint, jobs=args.jobs)
+            if args.verbose:
+                print(f'Indexed \"{input_path}\"')
+
+        if args.sql:
+            try:
+                result = index.query(args.sql)
+            except sqlite3.Error as e:
+                parser.error(f'Invalid query: {e}')
+        else:
+            result = index.runs(args.columns, algorithm=args.algorithm, stop_coverage=args.stop_coverage,
+                                seed=args.seed)
+
+    if args.csv:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(result)
+        writer.writerows(zip(*(values.tolist() for values in result.values())))
+    else:
+        print(RunIndex.format_table(result))
+
+
+COMMANDS = {'cross': cross_main, 'compare': compare_main, 'perf': perf_main, 'pack': pack_main,
+            'convert': convert_main, 'query': query_main}
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        COMMANDS[sys.argv[1]](sys.argv[2:])
+    else:
+        report_main(sys.argv[1:])
@@ -1,8 +1,16 @@
 import json
 from pathlib import Path
 
+from models.benchmark_cache import BenchmarkCache, CACHE_DIR_NAME, fingerprint_benchmark_dir
 from models.benchmark_run_group import BenchmarkRunGroup
+from models.element_index import ElementIndex
+from models.model_graph import ModelGraph
+from models.run_store import RunStore, is_run_store
 from src.models.benchmark_report import BenchmarkReport
+from utils.benchmark_archive import BenchmarkArchive, archive_benchmark_name, is_benchmark_archive
+from utils.benchmark_filter import GeneratorFilter
+from utils.benchmark_name_parser import group_by_series
+from utils.parallel import parallel_map
 
 
 class Benchmark:
@@ -18,6 +26,8 @@ class Benchmark:
         """
         self.report = report
         self.run_groups = run_groups
+        self._element_index = None
+        self.model_graph = None
 
     @property
     def name(self) -> str:
@@ -26,33 +36,108 @@ class Benchmark:
         """
         return self.report.name
 
+    @property
+    def element_index(self) -> ElementIndex:
+        """
+        Get the index of the model's elements, from the report's generators or else from the first run.
+        """
+        if self._element_index is None:
+            runs = [run for run_group in self.run_groups for run in run_group.runs[:1]]
+            if self.report["Generators"] or not runs:
+                self._element_index = self.report.element_index
+            else:
+                self._element_index = ElementIndex.from_visits(runs[0].vertex_visits, runs[0].edge_visits)
+        return self._element_index
+
+    def load_model_graph(self, models_dir: str) -> ModelGraph | None:
+        """
+        Load the graph of the benchmark's model from its GraphWalker model file, see ModelGraph.find_model_file. Edges
+        missing from the model file are completed from the first run of every run group.
+
+        :param models_dir: The directory of the GraphWalker model files
+        :return: The model graph, also stored in model_graph, or None if there is no model file for the benchmark
+        """
+        model_file = ModelGraph.find_model_file(self.report, Path(models_dir))
+        if model_file is None:
+            return None
+
+        graph = ModelGraph.from_file(model_file, self.element_index)
+        self.model_graph = graph.with_path_edges([run_group.runs[0].path_codes(self.element_index)
+                                                  for run_group in self.run_groups if run_group.runs])
+        return self.model_graph
+
     @classmethod
-    def from_dir(cls, path: str) -> "Benchmark":
+    def from_dir(cls, path: str, jobs: int = 1, use_threads: bool = False, use_cache: bool = False,
+                 cache_dir: str = None, generator_filter: GeneratorFilter = None) -> "Benchmark":
         """
-        Load benchmark from a directory.
+        Load benchmark from a directory, from a .zip, .tar.gz or .tar.zst archive of one (see BenchmarkArchive), or
+        from a run store (see RunStore).
+
+        :param path: Path to the benchmark directory, archive or run store
+        :param jobs: Number of workers to load run groups with, 0 or less to use every available CPU
+        :param use_threads: Whether to load run groups in a thread pool instead of a process pool
+        :param use_cache: Whether to load the runs from, and store them in, a columnar snapshot
+        :param cache_dir: Directory of the snapshot. Default "<path>/.benchmark_cache", or
+                          "<file directory>/.benchmark_cache/<file name>" for an archive or run store
+        :param generator_filter: Only load the run groups of the generators kept by this filter, the runs of the other
+                                 generators are never read. A filtered load is read from the snapshot, but not stored
         """
         path = Path(path)
         if not path.exists():
             raise FileNotFoundError(f"{path} does not exist.")
 
-        if not path.is_dir():
-            raise NotADirectoryError(f"{path} is not a directory.")
-
-        report_path = path / "report.json"
+        load_run_group = BenchmarkRunGroup.from_dir
+        if is_benchmark_archive(path):
+            benchmark_path = BenchmarkArchive.open(path).path()
+            name = archive_benchmark_name(path)
+            default_cache_dir = path.parent / CACHE_DIR_NAME / path.name
+        elif is_run_store(path):
+            benchmark_path = RunStore.open(path).path()
+            name = RunStore.open(path).name
+            default_cache_dir = path.parent / CACHE_DIR_NAME / path.name
+            load_run_group = RunStore.load_run_group
+        elif path.is_dir():
+            benchmark_path = path
+            name = path.name
+            default_cache_dir = path / CACHE_DIR_NAME
+        else:
+            raise NotADirectoryError(f"{path} is not a directory, benchmark archive or run store.")
+
+        report_path = benchmark_path / "report.json"
         if not report_path.exists():
             raise FileNotFoundError(f"{report_path} does not exist.")
 
         with report_path.open() as f:
-            report = BenchmarkReport(json.load(f), path.name)
+            report = BenchmarkReport(json.load(f), name)
 
-        runs_path = path / "runs"
+        runs_path = benchmark_path / "runs"
         if not runs_path.exists():
             raise FileNotFoundError(f"{runs_path} does not exist.")
 
-        runs = []
-        for generator_folder in runs_path.iterdir():
-            if generator_folder.is_dir():
-                runs.append(BenchmarkRunGroup.from_dir(generator_folder))
+        cache = None
+        fingerprint = None
+        if use_cache:
+            cache = BenchmarkCache(Path(cache_dir) if cache_dir else default_cache_dir)
+            fingerprint = fingerprint_benchmark_dir(path)
+            runs = cache.load(fingerprint, runs_path)
+            if runs is not None:
+                if generator_filter is not None:
+                    runs = [run_group for run_group in runs if generator_filter.matches(run_group.generator_name)]
+                return cls(report, runs)
+
+        generator_folders = [generator_folder for generator_folder in runs_path.iterdir() if generator_folder.is_dir()]
+        folder_count = len(generator_folders)
+        if generator_filter is not None:
+            generator_folders = [generator_folder for generator_folder in generator_folders
+                                 if generator_filter.matches(generator_folder.name)]
+        runs = parallel_map(load_run_group, generator_folders, jobs, use_threads)
+
+        # A snapshot holds every run group, so a load that left generators out is not stored
+        if cache is not None and len(generator_folders) == folder_count:
+            try:
+                cache.store(fingerprint, runs, jobs, use_threads)
+            except OSError as e:
+                print(f'Warning: Could not write benchmark cache to \"{cache.cache_dir}\": {e}')
 
         return cls(report, runs)
 
@@ -72,16 +157,11 @@ class Benchmark:
 
     @staticmethod
     def _run_group_sort_lambda(run_group: BenchmarkRunGroup):
-        return run_group.algorithm, run_group.stop_coverage
+        return run_group.generator_name.sort_key
 
     @property
     def run_groups_grouped(self) -> dict[str, list[BenchmarkRunGroup]]:
         """
-        Get the run groups grouped by algorithm.
+        Get the run groups grouped by series, see group_by_series.
         """
-        run_groups = {}
-        for run_group in self.run_groups_sorted:
-            if run_group.algorithm not in run_groups:
-                run_groups[run_group.algorithm] = []
-            run_groups[run_group.algorithm].append(run_group)
-        return run_groups
+        return group_by_series(self.run_groups_sorted)
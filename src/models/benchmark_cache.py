@@ -0,0 +1,286 @@
+import hashlib
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+from models.benchmark_run import BenchmarkRun
+from models.benchmark_run_group import BenchmarkRunGroup
+from models.element_index import ElementIndex
+from utils.parallel import parallel_map
+
+CACHE_VERSION = 1
+CACHE_DIR_NAME = '.benchmark_cache'
+
+_INTEGER_COLUMNS = ['iteration', 'seed', 'generation_time', 'test_suite_size', 'test_duration',
+                    'driver_time_spent_waiting', 'vertex_coverage', 'edge_coverage']
+_BOOLEAN_COLUMNS = ['has_test_results', 'is_failure']
+_TEST_RESULT_KEYS = {'test_duration': 'testDuration', 'driver_time_spent_waiting': 'driverTimeSpentWaiting',
+                     'vertex_coverage': 'vertexCoverage', 'edge_coverage': 'edgeCoverage'}
+
+
+def fingerprint_benchmark_dir(path: Path) -> str:
+    """
+    Fingerprint the inputs of a benchmark directory by the name, size and modification time of its files, or a
+    benchmark archive or run store by its own name, size and modification time.
+
+    :param path: The benchmark directory, archive or run store
+    :return: The fingerprint
+    """
+    digest = hashlib.sha1(f'v{CACHE_VERSION}'.encode())
+    if path.is_file():
+        stat = path.stat()
+        digest.update(f'{path.name}:{stat.st_size}:{stat.st_mtime_ns}\n'.encode())
+        return digest.hexdigest()
+
+    files = [path / "report.json"]
+    for generator_folder in sorted((path / "runs").iterdir()):
+        if generator_folder.is_dir():
+            files.extend(sorted(generator_folder.iterdir()))
+
+    for file in files:
+        stat = file.stat()
+        digest.update(f'{file.relative_to(path).as_posix()}:{stat.st_size}:{stat.st_mtime_ns}\n'.encode())
+    return digest.hexdigest()
+
+
+class BenchmarkColumns:
+    """
+    Columnar snapshot of every run in a benchmark, one row per run.
+    """
+
+    def __init__(self, columns: dict[str, np.ndarray], vertex_names: list[str], edge_names: list[str]):
+        """
+        Create a columnar snapshot
+
+        :param columns: The columns, by name
+        :param vertex_names: The vertex names, in the order of the vertex visit matrix columns
+        :param edge_names: The edge names, in the order of the edge visit matrix columns
+        """
+        self.columns = columns
+        self.vertex_names = vertex_names
+        self.edge_names = edge_names
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    @staticmethod
+    def visits_to_dict(names: list[str], visits: np.ndarray) -> dict[str, int]:
+        """
+        Convert a row of a visit matrix back to a visit map, skipping elements that were absent (-1)
+
+        :param names: The element names
+        :param visits: The visit counts
+        :return: The visit map
+        """
+        return {name: int(count) for name, count in zip(names, visits.tolist()) if count >= 0}
+
+
+class CachedBenchmarkRun(BenchmarkRun):
+    """
+    A benchmark run backed by a row of a columnar snapshot.
+
+    The report and test result values come from the snapshot, the path and full test results are read from the run's
+    files when accessed.
+    """
+
+    def __init__(self, columns: BenchmarkColumns, row: int, path_file: Path, report_file: Path,
+                 test_results_file: Path):
+        """
+        Create a cached benchmark run
+
+        :param columns: The snapshot the run belongs to
+        :param row: The row of the run in the snapshot
+        :param path_file: The file to load the path from
+        :param report_file: The run's report file
+        :param test_results_file: The file to load the full test results from
+        """
+        super().__init__(None, None, None, path_file=path_file, report_file=report_file,
+                         test_results_file=test_results_file, iteration=int(columns['iteration'][row]))
+        self.columns = columns
+        self.row = row
+
+    @property
+    def report(self) -> dict:
+        """
+        The report of the run, rebuilt from the snapshot
+
+        :return: The report of the run
+        """
+        return {'Seed': self.seed, 'GenerationTime': self.generation_time, 'TestSuiteSize': self.test_suite_size,
+                'VertexVisits': self.vertex_visits, 'EdgeVisits': self.edge_visits}
+
+    @property
+    def seed(self) -> int:
+        return int(self.columns['seed'][self.row])
+
+    @property
+    def generation_time(self) -> int:
+        return int(self.columns['generation_time'][self.row])
+
+    @property
+    def test_suite_size(self) -> int:
+        return int(self.columns['test_suite_size'][self.row])
+
+    @property
+    def vertex_visits(self) -> dict[str, int]:
+        return BenchmarkColumns.visits_to_dict(self.columns.vertex_names, self.columns['vertex_visits'][self.row])
+
+    @property
+    def edge_visits(self) -> dict[str, int]:
+        return BenchmarkColumns.visits_to_dict(self.columns.edge_names, self.columns['edge_visits'][self.row])
+
+    def vertex_visit_vector(self, element_index: ElementIndex) -> np.ndarray:
+        if self.columns.vertex_names == element_index.vertex_names:
+            return np.maximum(self.columns['vertex_visits'][self.row], 0)
+        return super().vertex_visit_vector(element_index)
+
+    def edge_visit_vector(self, element_index: ElementIndex) -> np.ndarray:
+        if self.columns.edge_names == element_index.edge_names:
+            return np.maximum(self.columns['edge_visits'][self.row], 0)
+        return super().edge_visit_vector(element_index)
+
+    def _test_result_value(self, column: str) -> int:
+        if not self.columns['has_test_results'][self.row]:
+            raise KeyError(_TEST_RESULT_KEYS[column])
+        return int(self.columns[column][self.row])
+
+    @property
+    def test_duration(self) -> float:
+        return self._test_result_value('test_duration')
+
+    @property
+    def driver_time_spent_waiting(self) -> float:
+        return self._test_result_value('driver_time_spent_waiting')
+
+    @property
+    def vertex_coverage(self) -> int:
+        return self._test_result_value('vertex_coverage')
+
+    @property
+    def edge_coverage(self) -> int:
+        return self._test_result_value('edge_coverage')
+
+    @property
+    def is_failure(self) -> bool:
+        return bool(self.columns['is_failure'][self.row])
+
+    @property
+    def has_test_results(self) -> bool:
+        return bool(self.columns['has_test_results'][self.row])
+
+
+def extract_run_group_rows(run_group: BenchmarkRunGroup) -> list[dict]:
+    """
+    Extract the snapshot values of every run in a group
+
+    :param run_group: The run group
+    :return: One dictionary of values per run
+    """
+    rows = []
+    for run in run_group.runs:
+        test_results = run.test_results
+        row = {'iteration': run.iteration, 'seed': run.seed, 'generation_time': run.generation_time,
+               'test_suite_size': run.test_suite_size, 'vertex_visits': run.vertex_visits,
+               'edge_visits': run.edge_visits, 'has_test_results': run.has_test_results,
+               'is_failure': run.is_failure}
+        for column, key in _TEST_RESULT_KEYS.items():
+            row[column] = test_results.get(key, 0)
+        rows.append(row)
+    return rows
+
+
+class BenchmarkCache:
+    """
+    Cache of the runs of a benchmark directory, stored as memory-mappable NumPy arrays.
+    """
+
+    def __init__(self, cache_dir: Path):
+        """
+        Create a benchmark cache
+
+        :param cache_dir: The directory to store the snapshot in
+        """
+        self.cache_dir = Path(cache_dir)
+
+    @property
+    def meta_path(self) -> Path:
+        """
+        The snapshot's metadata file
+        """
+        return self.cache_dir / 'meta.json'
+
+    def load(self, fingerprint: str, runs_path: Path) -> list[BenchmarkRunGroup] | None:
+        """
+        Load the run groups from the snapshot
+
+        :param fingerprint: The fingerprint of the benchmark directory
+        :param runs_path: The benchmark's runs directory, used to locate the run files
+        :return: The run groups, or None if there is no snapshot for this fingerprint
+        """
+        if not self.meta_path.exists():
+            return None
+
+        meta = json.loads(self.meta_path.read_text())
+        if meta.get('version') != CACHE_VERSION or meta.get('fingerprint') != fingerprint:
+            return None
+
+        arrays = {name: np.load(self.cache_dir / f'{name}.npy', mmap_mode='r')
+                  for name in _INTEGER_COLUMNS + _BOOLEAN_COLUMNS + ['vertex_visits', 'edge_visits']}
+        columns = BenchmarkColumns(arrays, meta['vertex_names'], meta['edge_names'])
+
+        run_groups = []
+        for group in meta['groups']:
+            folder = runs_path / group['name']
+            runs = []
+            for row in range(group['start'], group['stop']):
+                iteration = int(arrays['iteration'][row])
+                runs.append(CachedBenchmarkRun(columns, row, folder / f"run_{iteration}_path.json",
+                                               folder / f"run_{iteration}_report.json",
+                                               folder / f"run_{iteration}_test_results.json"))
+            run_groups.append(BenchmarkRunGroup.from_runs(group['name'], runs))
+        return run_groups
+
+    def store(self, fingerprint: str, run_groups: list[BenchmarkRunGroup], jobs: int = 1, use_threads: bool = False):
+        """
+        Build and store the snapshot of the run groups, replacing any previous snapshot
+
+        :param fingerprint: The fingerprint of the benchmark directory
+        :param run_groups: The run groups to store
+        :param jobs: Number of workers to read the run reports with
+        :param use_threads: Whether to use a thread pool instead of a process pool
+        """
+        group_rows = parallel_map(extract_run_group_rows, run_groups, jobs, use_threads)
+        rows = [row for group in group_rows for row in group]
+
+        vertex_names = list(dict.fromkeys(name for row in rows for name in row['vertex_visits']))
+        edge_names = list(dict.fromkeys(name for row in rows for name in row['edge_visits']))
+
+        arrays = {name: np.array([row[name] for row in rows], dtype=np.int64) for name in _INTEGER_COLUMNS}
+        arrays.update({name: np.array([row[name] for row in rows], dtype=bool) for name in _BOOLEAN_COLUMNS})
+        arrays['vertex_visits'] = np.array([[row['vertex_visits'].get(name, -1) for name in vertex_names]
+                                            for row in rows], dtype=np.int32).reshape(len(rows), len(vertex_names))
+        arrays['edge_visits'] = np.array([[row['edge_visits'].get(name, -1) for name in edge_names]
+                                          for row in rows], dtype=np.int32).reshape(len(rows), len(edge_names))
+
+        groups = []
+        start = 0
+        for run_group, group in zip(run_groups, group_rows):
+            groups.append({'name': run_group.name, 'start': start, 'stop': start + len(group)})
+            start += len(group)
+
+        # Write next to the current snapshot, then swap, so an interrupted write never leaves a partial snapshot
+        temp_dir = self.cache_dir.with_name(f'{self.cache_dir.name}.tmp')
+        if temp_dir.exists():
+            shutil.rmtree(temp_dir)
+        temp_dir.mkdir(parents=True)
+        for name, array in arrays.items():
+            np.save(temp_dir / f'{name}.npy', array)
+        (temp_dir / 'meta.json').write_text(json.dumps({'version': CACHE_VERSION, 'fingerprint': fingerprint,
+                                                        'vertex_names': vertex_names, 'edge_names': edge_names,
+                                                        'groups': groups}))
+
+        if self.cache_dir.exists():
+            shutil.rmtree(self.cache_dir)
+        temp_dir.rename(self.cache_dir)
@@ -1,14 +1,19 @@
-from utils.benchmark_name_parser import parse_stop_condition_from_name, parse_coverage_from_stop_condition, \
-    parse_algorithm_from_name
+import numpy as np
+
+from models.element_index import ElementIndex
+from utils.benchmark_name_parser import GeneratorName, parse_generator_name
 
 
 class BenchmarkGenerator(dict):
     """
     Represents a generator in a benchmark report.
     """
-    def __init__(self, generator: dict, name: str):
+    def __init__(self, generator: dict, name: str, element_index: ElementIndex = None):
         super().__init__(generator)
         self._name = name
+        self._element_index = element_index
+        self._visit_vectors = {}
+        self._generator_name = parse_generator_name(name)
 
     @property
     def name(self) -> str:
@@ -17,26 +22,33 @@ class BenchmarkGenerator(dict):
         """
         return self._name
 
+    @property
+    def generator_name(self) -> GeneratorName:
+        """
+        Get the parsed generator name, with the terms of the stop condition.
+        """
+        return self._generator_name
+
     @property
     def algorithm(self) -> str:
         """
         Get the generator's algorithm.
         """
-        return parse_algorithm_from_name(self.name)
+        return self._generator_name.algorithm
 
     @property
     def stop_condition(self) -> str:
         """
         Get the stop condition.
         """
-        return parse_stop_condition_from_name(self.name)
+        return self._generator_name.stop_condition.text
 
     @property
-    def stop_coverage(self) -> int:
+    def stop_coverage(self) -> int | None:
         """
-        Get the stop condition's coverage.
+        Get the stop condition's coverage, of its first coverage term.
         """
-        return parse_coverage_from_stop_condition(self.stop_condition)
+        return self._generator_name.stop_coverage
 
     @property
     def total_generation_time(self) -> int:
@@ -178,6 +190,52 @@ class BenchmarkGenerator(dict):
         """
         return self["AverageEdgeVisitsIndividual"]
 
+    @property
+    def element_index(self) -> ElementIndex:
+        """
+        Get the index of the model's elements, shared with the other generators of the benchmark.
+        """
+        if self._element_index is None:
+            self._element_index = ElementIndex.from_visits(self.total_vertex_visits_individual,
+                                                           self.total_edge_visits_individual)
+        return self._element_index
+
+    def _visit_vector(self, key: str, vertices: bool) -> np.ndarray:
+        if key not in self._visit_vectors:
+            if vertices:
+                self._visit_vectors[key] = self.element_index.vertex_vector(self[key])
+            else:
+                self._visit_vectors[key] = self.element_index.edge_vector(self[key])
+        return self._visit_vectors[key]
+
+    @property
+    def total_vertex_visits_vector(self) -> np.ndarray:
+        """
+        Get the total vertex visits by vertex code, see ElementIndex.
+        """
+        return self._visit_vector("TotalVertexVisitsIndividual", True)
+
+    @property
+    def total_edge_visits_vector(self) -> np.ndarray:
+        """
+        Get the total edges visits by edge code, see ElementIndex.
+        """
+        return self._visit_vector("TotalEdgeVisitsIndividual", False)
+
+    @property
+    def average_vertex_visits_vector(self) -> np.ndarray:
+        """
+        Get the average vertex visits by vertex code, see ElementIndex.
+        """
+        return self._visit_vector("AverageVertexVisitsIndividual", True)
+
+    @property
+    def average_edge_visits_vector(self) -> np.ndarray:
+        """
+        Get the average edges visits by edge code, see ElementIndex.
+        """
+        return self._visit_vector("AverageEdgeVisitsIndividual", False)
+
     def __str__(self):
         """
         Return the string representation.
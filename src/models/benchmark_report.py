@@ -1,12 +1,17 @@
 import json
 
+from models.element_index import ElementIndex
 from models.model import Model
 from src.models.benchmark_generator import BenchmarkGenerator
+from utils.benchmark_name_parser import group_by_series
 
 
 class BenchmarkReport(dict):
     """
     Represents a general benchmark report, read from a JSON file.
+
+    Derived views (generators, sorting, grouping, model) are computed once and cached. Assigning to the report clears
+    them; call invalidate_views after modifying nested values in place.
     """
 
     def __init__(self, data: dict, name: str):
@@ -15,6 +20,49 @@ class BenchmarkReport(dict):
         """
         super().__init__(data)
         self._name = name
+        self._views = {}
+
+    def invalidate_views(self):
+        """
+        Clear the cached derived views, so they are recomputed from the report's data on next access.
+        """
+        self._views = {}
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.invalidate_views()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.invalidate_views()
+
+    def __ior__(self, other):
+        result = super().__ior__(other)
+        self.invalidate_views()
+        return result
+
+    def clear(self):
+        super().clear()
+        self.invalidate_views()
+
+    def pop(self, *args):
+        result = super().pop(*args)
+        self.invalidate_views()
+        return result
+
+    def popitem(self):
+        result = super().popitem()
+        self.invalidate_views()
+        return result
+
+    def setdefault(self, key, default=None):
+        result = super().setdefault(key, default)
+        self.invalidate_views()
+        return result
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.invalidate_views()
 
     @classmethod
     def from_file(cls, path: str) -> "BenchmarkReport":
@@ -29,42 +77,57 @@ class BenchmarkReport(dict):
         """
         Get the generator results.
         """
-        generators = []
-        for generator in self["Generators"].keys():
-            generators.append(BenchmarkGenerator(self["Generators"][generator], generator))
-        return generators
+        if 'generators' not in self._views:
+            generators = []
+            for generator in self["Generators"].keys():
+                generators.append(BenchmarkGenerator(self["Generators"][generator], generator, self.element_index))
+            self._views['generators'] = generators
+        return self._views['generators']
 
     @property
     def generators_sorted(self) -> list[BenchmarkGenerator]:
         """
         Get the generator results sorted by name.
         """
-        generators = self.generators
-        generators.sort(key=BenchmarkReport._generator_sort_lambda)
-        return generators
+        if 'generators_sorted' not in self._views:
+            self._views['generators_sorted'] = sorted(self.generators, key=BenchmarkReport._generator_sort_lambda)
+        return self._views['generators_sorted']
 
     @staticmethod
     def _generator_sort_lambda(generator: BenchmarkGenerator):
-        return generator.algorithm, generator.stop_coverage
+        return generator.generator_name.sort_key
 
     @property
     def generators_grouped(self) -> dict[str, list[BenchmarkGenerator]]:
         """
-        Get the generator results grouped by generator name.
+        Get the generator results grouped by series, see group_by_series.
+        """
+        if 'generators_grouped' not in self._views:
+            self._views['generators_grouped'] = group_by_series(self.generators_sorted)
+        return self._views['generators_grouped']
+
+    @property
+    def element_index(self) -> ElementIndex:
+        """
+        Get the index of the model's elements, from the visit maps of the first generator.
         """
-        generators = {}
-        for generator in self.generators_sorted:
-            if generator.algorithm not in generators:
-                generators[generator.algorithm] = []
-            generators[generator.algorithm].append(generator)
-        return generators
+        if 'element_index' not in self._views:
+            generators = list(self["Generators"].values())
+            if generators:
+                self._views['element_index'] = ElementIndex.from_visits(generators[0]["TotalVertexVisitsIndividual"],
+                                                                        generators[0]["TotalEdgeVisitsIndividual"])
+            else:
+                self._views['element_index'] = ElementIndex([], [])
+        return self._views['element_index']
 
     @property
     def model(self) -> Model:
         """
         Get a benchmark's model.
         """
-        return Model(self["Model"])
+        if 'model' not in self._views:
+            self._views['model'] = Model(self["Model"])
+        return self._views['model']
 
     @property
     def name(self) -> str:
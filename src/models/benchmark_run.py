@@ -1,42 +1,212 @@
 import json
+from functools import lru_cache
 from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+from models.element_index import ElementIndex
+from utils.path_reader import intern_path, iter_element_ids
+
+PAYLOAD_CACHE_SIZE = 32
+
+
+@lru_cache(maxsize=PAYLOAD_CACHE_SIZE)
+def _load_payload(file: Path) -> list | dict:
+    """
+    Parse a JSON payload file, keeping the most recently used payloads in memory
+
+    :param file: The file to parse
+    :return: The parsed payload
+    """
+    return json.loads(file.read_text())
 
 
 class BenchmarkRun:
     """
     A single run of a benchmark.
+
+    The path and report of a run can be large, so when they are backed by files they are not kept with the run. Path
+    files are streamed whenever they are read, see element_ids and path_codes. Report files are parsed when accessed,
+    and only the PAYLOAD_CACHE_SIZE most recently used reports of the process stay parsed.
     """
 
-    def __init__(self, path: dict, report: dict, test_results: dict):
+    def __init__(self, path: list[dict] | None, report: dict | None, test_results: dict | None,
+                 path_file: Path | None = None, report_file: Path | None = None,
+                 test_results_file: Path | None = None, iteration: int | None = None):
         """
         Create a benchmark run
 
-        :param path: The path of the run
-        :param report: The report of the run
-        :param test_results: The test results of the run
+        :param path: The path of the run, or None to load it from path_file when accessed
+        :param report: The report of the run, or None to load it from report_file when accessed
+        :param test_results: The test results of the run, or None to load them from test_results_file when accessed
+        :param path_file: The file to load the path from
+        :param report_file: The file to load the report from
+        :param test_results_file: The file to load the test results from
+        :param iteration: The iteration number of the run
         """
-        self.path = path
-        self.report = report
-        self.test_results = test_results
+        self._path = path
+        self._report = report
+        self._test_results = test_results
+        self.path_file = path_file
+        self.report_file = report_file
+        self.test_results_file = test_results_file
+        self.iteration = iteration
 
     @classmethod
-    def from_files(cls, path_file: Path, report_file: Path, test_results_file: Path) -> 'BenchmarkRun':
+    def from_files(cls, path_file: Path, report_file: Path, test_results_file: Path,
+                   iteration: int | None = None) -> 'BenchmarkRun':
         """
         Load a benchmark run from files
 
         :param path_file: The path file
         :param report_file: The report file
         :param test_results_file: The test results file
+        :param iteration: The iteration number of the run
         :return: The benchmark run
         """
-        path = json.loads(path_file.read_text())
-        report = json.loads(report_file.read_text())
         if test_results_file.exists():
             test_results = json.loads(test_results_file.read_text())
         else:
             test_results = {}
 
-        return cls(path, report, test_results)
+        return cls(None, None, test_results, path_file=path_file, report_file=report_file,
+                   test_results_file=test_results_file, iteration=iteration)
+
+    @property
+    def path(self) -> list[dict]:
+        """
+        The path of the run as its steps. If it is backed by a file, the file is read and the list of steps rebuilt on
+        every access, so read paths with element_ids or path_codes instead, which do not hold a dictionary per step.
+
+        :return: The path of the run
+        """
+        if self._path is None:
+            return [{'elementId': element_id} for element_id in self.element_ids()]
+        return self._path
+
+    def element_ids(self) -> Iterator[str]:
+        """
+        Iterate over the element IDs of the path, streamed from the path file if the path is backed by a file
+
+        :return: An iterator of the element IDs, in path order
+        """
+        if self._path is None:
+            return iter_element_ids(self.path_file)
+        return (step['elementId'] for step in self._path)
+
+    def interned_path(self, element_index: dict[str, int], unknown_code: int) -> np.ndarray:
+        """
+        The path as integer codes, so memory is bounded by the number of unique elements rather than the path length
+
+        :param element_index: The code per element ID, not modified
+        :param unknown_code: The code of every element ID that is not in the index
+        :return: The code of every step of the path
+        """
+        if self._path is None:
+            return intern_path(self.path_file, element_index, unknown_code)
+        return np.array([element_index.get(element_id, unknown_code) for element_id in self.element_ids()],
+                        dtype=np.int32)
+
+    @property
+    def report(self) -> dict:
+        """
+        The report of the run. If it is backed by a file, it is parsed again on every access once it is no longer one
+        of the PAYLOAD_CACHE_SIZE most recently used payloads, see BenchmarkRunGroup.metric_values for values read
+        repeatedly.
+
+        :return: The report of the run
+        """
+        if self._report is None:
+            return _load_payload(self.report_file)
+        return self._report
+
+    @property
+    def test_results(self) -> dict:
+        """
+        The test results of the run, parsed on first access if they are backed by a file
+
+        :return: The test results of the run, empty if the run's tests were not executed
+        """
+        if self._test_results is None:
+            if self.test_results_file is None or not self.test_results_file.exists():
+                self._test_results = {}
+            else:
+                self._test_results = json.loads(self.test_results_file.read_text())
+        return self._test_results
+
+    @property
+    def seed(self) -> int:
+        """
+        The seed used to generate the path
+
+        :return: The seed
+        """
+        return self.report['Seed']
+
+    @property
+    def generation_time(self) -> int:
+        """
+        The time it took to generate the path
+
+        :return: The generation time
+        """
+        return self.report['GenerationTime']
+
+    @property
+    def test_suite_size(self) -> int:
+        """
+        The size of the generated test suite
+
+        :return: The test suite size
+        """
+        return self.report['TestSuiteSize']
+
+    @property
+    def vertex_visits(self) -> dict[str, int]:
+        """
+        The visit count per vertex
+
+        :return: The vertex visits
+        """
+        return self.report['VertexVisits']
+
+    @property
+    def edge_visits(self) -> dict[str, int]:
+        """
+        The visit count per edge
+
+        :return: The edge visits
+        """
+        return self.report['EdgeVisits']
+
+    def vertex_visit_vector(self, element_index: ElementIndex) -> np.ndarray:
+        """
+        The visit count per vertex, as a dense vector
+
+        :param element_index: The index of the benchmark's elements
+        :return: The visit count per vertex code
+        """
+        return element_index.vertex_vector(self.vertex_visits, np.int32)
+
+    def edge_visit_vector(self, element_index: ElementIndex) -> np.ndarray:
+        """
+        The visit count per edge, as a dense vector
+
+        :param element_index: The index of the benchmark's elements
+        :return: The visit count per edge code
+        """
+        return element_index.edge_vector(self.edge_visits, np.int32)
+
+    def path_codes(self, element_index: ElementIndex) -> np.ndarray:
+        """
+        The path as element codes. Element IDs that are not in the index, such as elements of an older version of the
+        model, all get the code ElementIndex.unknown_code, past its vertices and edges.
+
+        :param element_index: The index of the benchmark's elements
+        :return: The code of every step of the path
+        """
+        return self.interned_path(element_index.element_codes, element_index.unknown_code)
 
     @property
     def test_duration(self) -> float:
@@ -82,3 +252,12 @@ class BenchmarkRun:
         :return: Whether the run is a failure
         """
         return 'failures' in self.test_results
+
+    @property
+    def has_test_results(self) -> bool:
+        """
+        Whether the run's tests were executed
+
+        :return: Whether the run has test results
+        """
+        return bool(self.test_results)
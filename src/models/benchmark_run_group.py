@@ -1,7 +1,18 @@
 from pathlib import Path
+from typing import Callable, TypeVar
+
+import numpy as np
 
 from models.benchmark_run import BenchmarkRun
-from utils.benchmark_name_parser import *
+from models.element_index import ElementIndex
+from utils.benchmark_name_parser import GeneratorName, parse_generator_name
+
+RUN_METRICS = ['test_duration', 'driver_time_spent_waiting', 'vertex_coverage', 'edge_coverage']
+REPORT_METRICS = ['generation_time', 'test_suite_size']
+
+_STATISTICS = {'mean': np.mean, 'min': np.min, 'max': np.max, 'std': np.std, 'median': np.median}
+
+T = TypeVar('T')
 
 
 class BenchmarkRunGroup:
@@ -22,6 +33,7 @@ class BenchmarkRunGroup:
         self.stop_condition = stop_condition
         self.stop_coverage = stop_coverage
         self.runs = runs
+        self._aggregates = {}
 
     @classmethod
     def from_dir(cls, path: Path) -> 'BenchmarkRunGroup':
@@ -31,10 +43,6 @@ class BenchmarkRunGroup:
         :param path: The path to the directory
         :return: The benchmark run group
         """
-        algorithm = parse_algorithm_from_name(path.name)
-        stop_condition = parse_stop_condition_from_name(path.name)
-        coverage = parse_coverage_from_stop_condition(stop_condition)
-
         runs = []
 
         for file in path.iterdir():
@@ -47,9 +55,71 @@ class BenchmarkRunGroup:
                 path_file = file
                 report_file = path / f"run_{run_iteration}_report.json"
                 test_results_file = path / f"run_{run_iteration}_test_results.json"
-                runs.append(BenchmarkRun.from_files(path_file, report_file, test_results_file))
+                runs.append(BenchmarkRun.from_files(path_file, report_file, test_results_file, run_iteration))
+
+        return cls.from_runs(path.name, runs)
+
+    @classmethod
+    def from_runs(cls, name: str, runs: list[BenchmarkRun]) -> 'BenchmarkRunGroup':
+        """
+        Create a benchmark run group from already loaded runs
+
+        :param name: The generator name, as used for the group's directory
+        :param runs: The runs
+        :return: The benchmark run group
+        """
+        generator_name = parse_generator_name(name)
+        return cls(generator_name.algorithm, generator_name.stop_condition.text, generator_name.stop_coverage, runs)
+
+    @property
+    def name(self) -> str:
+        """
+        The generator name of the group, as used for the group's directory
 
-        return cls(algorithm, stop_condition, coverage, runs)
+        :return: The generator name
+        """
+        return f"{self.algorithm}({self.stop_condition})"
+
+    @property
+    def generator_name(self) -> GeneratorName:
+        """
+        The parsed generator name of the group, with the terms of the stop condition
+
+        :return: The parsed generator name
+        """
+        return parse_generator_name(self.name)
+
+    def invalidate_aggregates(self):
+        """
+        Clear the cached success mask and metric arrays, so they are recomputed on next access.
+        Call this after modifying the runs of the group.
+        """
+        self._aggregates = {}
+
+    def cached(self, key: str, factory: Callable[[], T]) -> T:
+        """
+        Get an aggregate of the runs computed outside the run group, such as a statistic of their paths, computing it
+        on first access. It is kept with the run group's own aggregates, until invalidate_aggregates.
+
+        :param key: The name of the aggregate, distinct from the names of other aggregates
+        :param factory: The function computing the aggregate
+        :return: The aggregate
+        """
+        if key not in self._aggregates:
+            self._aggregates[key] = factory()
+        return self._aggregates[key]
+
+    @property
+    def successful_mask(self) -> np.ndarray:
+        """
+        Mask of the runs in the group whose tests were executed without failures
+
+        :return: A boolean array with one value per run
+        """
+        if 'successful_mask' not in self._aggregates:
+            self._aggregates['successful_mask'] = np.array(
+                [run.has_test_results and not run.is_failure for run in self.runs], dtype=bool)
+        return self._aggregates['successful_mask']
 
     @property
     def successful_runs(self) -> list[BenchmarkRun]:
@@ -58,7 +128,7 @@ class BenchmarkRunGroup:
 
         :return: The successful runs
         """
-        return [run for run in self.runs if not run.is_failure]
+        return [run for run, successful in zip(self.runs, self.successful_mask) if successful]
 
     @property
     def failed_runs(self) -> list[BenchmarkRun]:
@@ -69,6 +139,97 @@ class BenchmarkRunGroup:
         """
         return [run for run in self.runs if run.is_failure]
 
+    @property
+    def has_successful_runs(self) -> bool:
+        """
+        Whether the group has at least one successful run
+
+        :return: Whether the group has successful runs
+        """
+        return bool(self.successful_mask.any())
+
+    def metric_values(self, metric: str) -> np.ndarray:
+        """
+        The values of a metric for the runs in the group. Test execution metrics only cover the successful runs, path
+        generation metrics cover every run.
+
+        :param metric: The metric, one of RUN_METRICS or REPORT_METRICS
+        :return: The values, one per successful run for RUN_METRICS, one per run for REPORT_METRICS
+        """
+        if metric in RUN_METRICS:
+            runs = self.successful_runs
+        elif metric in REPORT_METRICS:
+            runs = self.runs
+        else:
+            raise ValueError(f'Unknown run metric "{metric}"')
+        key = f'metric_{metric}'
+        if key not in self._aggregates:
+            self._aggregates[key] = np.array([getattr(run, metric) for run in runs], dtype=np.float64)
+        return self._aggregates[key]
+
+    def vertex_visit_matrix(self, element_index: ElementIndex) -> np.ndarray:
+        """
+        The vertex visits of the runs in the group
+
+        :param element_index: The index of the benchmark's elements
+        :return: A matrix with a row per run and a column per vertex code
+        """
+        if 'vertex_visits' not in self._aggregates:
+            self._aggregates['vertex_visits'] = np.array(
+                [run.vertex_visit_vector(element_index) for run in self.runs],
+                dtype=np.int32).reshape(len(self.runs), element_index.vertex_count)
+        return self._aggregates['vertex_visits']
+
+    def edge_visit_matrix(self, element_index: ElementIndex) -> np.ndarray:
+        """
+        The edge visits of the runs in the group
+
+        :param element_index: The index of the benchmark's elements
+        :return: A matrix with a row per run and a column per edge code
+        """
+        if 'edge_visits' not in self._aggregates:
+            self._aggregates['edge_visits'] = np.array(
+                [run.edge_visit_vector(element_index) for run in self.runs],
+                dtype=np.int32).reshape(len(self.runs), element_index.edge_count)
+        return self._aggregates['edge_visits']
+
+    def path_codes(self, element_index: ElementIndex) -> list[np.ndarray]:
+        """
+        The paths of the runs in the group as element codes, see BenchmarkRun.path_codes
+
+        :param element_index: The index of the benchmark's elements
+        :return: The path of every run
+        """
+        return [run.path_codes(element_index) for run in self.runs]
+
+    def statistic(self, metric: str, statistic: str) -> float:
+        """
+        A summary statistic of a metric over the runs in the group, see metric_values
+
+        :param metric: The metric, one of RUN_METRICS or REPORT_METRICS
+        :param statistic: The statistic, one of "mean", "min", "max", "std" or "median"
+        :return: The statistic's value
+        """
+        if statistic not in _STATISTICS:
+            raise ValueError(f'Unknown statistic "{statistic}"')
+        values = self.metric_values(metric)
+        if len(values) == 0:
+            raise ValueError(f'Run group "{self.name}" has no values for "{metric}"')
+        return float(_STATISTICS[statistic](values))
+
+    def percentile(self, metric: str, percentile: float | list[float]) -> float | np.ndarray:
+        """
+        Percentile(s) of a metric over the runs in the group, see metric_values
+
+        :param metric: The metric, one of RUN_METRICS or REPORT_METRICS
+        :param percentile: The percentile or percentiles to compute, between 0 and 100
+        :return: The percentile value(s)
+        """
+        values = self.metric_values(metric)
+        if len(values) == 0:
+            raise ValueError(f'Run group "{self.name}" has no values for "{metric}"')
+        return np.percentile(values, percentile)
+
     @property
     def average_test_duration(self) -> float:
         """
@@ -76,7 +237,7 @@ class BenchmarkRunGroup:
 
         :return: The average test duration
         """
-        return sum([run.test_duration for run in self.successful_runs]) / len(self.successful_runs)
+        return self.statistic('test_duration', 'mean')
 
     @property
     def average_driver_time_spent_waiting(self) -> float:
@@ -85,7 +246,7 @@ class BenchmarkRunGroup:
 
         :return: The average driver time spent waiting
         """
-        return sum([run.driver_time_spent_waiting for run in self.successful_runs]) / len(self.successful_runs)
+        return self.statistic('driver_time_spent_waiting', 'mean')
 
     @property
     def average_vertex_coverage(self) -> float:
@@ -94,7 +255,7 @@ class BenchmarkRunGroup:
 
         :return: The average vertex coverage
         """
-        return sum([run.vertex_coverage for run in self.successful_runs]) / len(self.successful_runs)
+        return self.statistic('vertex_coverage', 'mean')
 
     @property
     def average_edge_coverage(self) -> float:
@@ -103,7 +264,7 @@ class BenchmarkRunGroup:
 
         :return: The average edge coverage
         """
-        return sum([run.edge_coverage for run in self.successful_runs]) / len(self.successful_runs)
+        return self.statistic('edge_coverage', 'mean')
 
     @property
     def minimum_test_duration(self) -> float:
@@ -112,7 +273,7 @@ class BenchmarkRunGroup:
 
         :return: The minimum test duration
         """
-        return min([run.test_duration for run in self.successful_runs])
+        return self.statistic('test_duration', 'min')
 
     @property
     def maximum_test_duration(self) -> float:
@@ -121,4 +282,4 @@ class BenchmarkRunGroup:
 
         :return: The maximum test duration
         """
-        return max([run.test_duration for run in self.successful_runs])
+        return self.statistic('test_duration', 'max')
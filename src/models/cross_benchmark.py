@@ -0,0 +1,105 @@
+from models.benchmark import Benchmark
+from models.benchmark_generator import BenchmarkGenerator
+from utils.benchmark_filter import filter_grouped_generators
+from utils.benchmark_name_parser import GeneratorName, group_by_series, mixed_coverage_algorithms
+
+
+class CrossBenchmark:
+    """
+    Several benchmarks of the same generators, run against different models, aligned by series and stop coverage.
+    """
+
+    def __init__(self, benchmarks: list[Benchmark], whitelist: list[str] = None, blacklist: list[str] = None):
+        """
+        Create a cross benchmark
+
+        :param benchmarks: The benchmarks to compare, the first one is the baseline for relative deltas
+        :param whitelist: The whitelist of generators to include
+        :param blacklist: The blacklist of generators to exclude
+        """
+        if len(benchmarks) < 2:
+            raise ValueError('A cross benchmark comparison needs at least two benchmarks.')
+        self.benchmarks = benchmarks
+        self.whitelist = whitelist
+        self.blacklist = blacklist
+
+        self._aligned_keys = None
+        # The series of an algorithm stopping at more than one coverage kind in any benchmark are qualified in all
+        self._mixed_algorithms = mixed_coverage_algorithms(generator.generator_name for benchmark in benchmarks
+                                                           for generator in benchmark.report.generators_sorted)
+
+    @property
+    def names(self) -> list[str]:
+        """
+        Get the benchmark names, in order.
+        """
+        return [benchmark.name for benchmark in self.benchmarks]
+
+    @property
+    def aligned_keys(self) -> list[tuple[str, int]]:
+        """
+        Get the (series, stop coverage) pairs present in every benchmark, sorted, see group_by_series.
+        """
+        if self._aligned_keys is None:
+            keys = None
+            generator_names = {}
+            for benchmark in self.benchmarks:
+                benchmark_keys = set()
+                for series, generators in self._filtered_generators(benchmark).items():
+                    for generator in generators:
+                        key = (series, generator.stop_coverage)
+                        benchmark_keys.add(key)
+                        generator_names.setdefault(key, generator.generator_name)
+                keys = benchmark_keys if keys is None else keys & benchmark_keys
+            self._aligned_keys = sorted(keys, key=lambda key: generator_names[key].sort_key)
+        return self._aligned_keys
+
+    def grouped_generators(self, benchmark: Benchmark) -> dict[str, list[BenchmarkGenerator]]:
+        """
+        Get the aligned generators of a benchmark, grouped by series and sorted by stop coverage
+
+        :param benchmark: One of the compared benchmarks
+        :return: The generators whose series and stop coverage are present in every benchmark
+        """
+        aligned_keys = set(self.aligned_keys)
+        grouped_generators = {}
+        for series, generators in sorted(self._filtered_generators(benchmark).items()):
+            aligned = sorted((generator for generator in generators
+                              if (series, generator.stop_coverage) in aligned_keys),
+                             key=lambda generator: generator.generator_name.sort_key)
+            if aligned:
+                grouped_generators[series] = aligned
+        return grouped_generators
+
+    @staticmethod
+    def model_size(benchmark: Benchmark, generator_name: GeneratorName) -> int:
+        """
+        Get the size of a benchmark's model, counted in the elements a generator's stop coverage is measured in: edges
+        for edge coverage, vertices for vertex coverage, and both otherwise.
+
+        :param benchmark: The benchmark
+        :param generator_name: The generator or run group name
+        :return: The number of model elements
+        """
+        kind = generator_name.stop_condition.coverage_kind
+        model = benchmark.report.model
+        if kind == 'edge_coverage':
+            return model.edges
+        if kind == 'vertex_coverage':
+            return model.vertices
+        return model.vertices + model.edges
+
+    @staticmethod
+    def model_size_unit(generator_name: GeneratorName) -> str:
+        """
+        Get the elements model_size counts for a generator
+
+        :param generator_name: The generator or run group name
+        :return: "edges", "vertices" or "elements"
+        """
+        return {'edge_coverage': 'edges', 'vertex_coverage': 'vertices'}.get(
+            generator_name.stop_condition.coverage_kind, 'elements')
+
+    def _filtered_generators(self, benchmark: Benchmark) -> dict[str, list[BenchmarkGenerator]]:
+        return filter_grouped_generators(group_by_series(benchmark.report.generators_sorted, self._mixed_algorithms),
+                                         self.whitelist, self.blacklist)
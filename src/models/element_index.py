@@ -0,0 +1,125 @@
+import numpy as np
+
+
+class ElementIndex:
+    """
+    Interned elements of a benchmark's model, shared by every generator and run of the benchmark.
+
+    Vertices get the codes 0 to vertex_count - 1 and edges the codes vertex_count to element_count - 1, so paths can be
+    stored as integer arrays and visit maps as dense count vectors.
+    """
+
+    def __init__(self, vertex_names: list[str], edge_names: list[str]):
+        """
+        Create an element index
+
+        :param vertex_names: The vertex names, as used in the visit maps of the reports
+        :param edge_names: The edge names, as used in the visit maps of the reports
+        """
+        self.vertex_names = list(vertex_names)
+        self.edge_names = list(edge_names)
+        self.vertex_codes = {name: code for code, name in enumerate(self.vertex_names)}
+        self.edge_codes = {name: code for code, name in enumerate(self.edge_names)}
+        self.element_codes = {ElementIndex.element_id(name): code
+                              for code, name in enumerate(self.vertex_names + self.edge_names)}
+
+    @classmethod
+    def from_visits(cls, vertex_visits: dict[str, int], edge_visits: dict[str, int]) -> 'ElementIndex':
+        """
+        Create an element index from the visit maps of a report, which list every element of the model
+
+        :param vertex_visits: A vertex visit map
+        :param edge_visits: An edge visit map
+        :return: The element index
+        """
+        return cls(list(vertex_visits), list(edge_visits))
+
+    @staticmethod
+    def element_id(name: str) -> str:
+        """
+        Get the element ID of an element name, as used in the path files
+
+        :param name: The element name, "<name>[<element ID>]"
+        :return: The element ID
+        """
+        start = name.rfind('[')
+        if start == -1 or not name.endswith(']'):
+            return name
+        return name[start + 1:-1]
+
+    @property
+    def vertex_count(self) -> int:
+        """
+        The number of vertices
+        """
+        return len(self.vertex_names)
+
+    @property
+    def edge_count(self) -> int:
+        """
+        The number of edges
+        """
+        return len(self.edge_names)
+
+    @property
+    def element_count(self) -> int:
+        """
+        The number of vertices and edges
+        """
+        return self.vertex_count + self.edge_count
+
+    @property
+    def unknown_code(self) -> int:
+        """
+        The code of the elements of paths that are not in the index, element_count
+        """
+        return self.element_count
+
+    @staticmethod
+    def _visit_vector(codes: dict[str, int], visits: dict[str, int], dtype) -> np.ndarray:
+        vector = np.zeros(len(codes), dtype=dtype)
+        if visits:
+            vector[np.fromiter(map(codes.__getitem__, visits.keys()), dtype=np.intp, count=len(visits))] = \
+                np.fromiter(visits.values(), dtype=dtype, count=len(visits))
+        return vector
+
+    def vertex_vector(self, vertex_visits: dict[str, int], dtype=np.int64) -> np.ndarray:
+        """
+        Convert a vertex visit map to a dense count vector
+
+        :param vertex_visits: The visit count per vertex name, vertices that are absent count as 0 visits
+        :param dtype: The type of the counts
+        :return: The visit count per vertex code
+        """
+        return ElementIndex._visit_vector(self.vertex_codes, vertex_visits, dtype)
+
+    def edge_vector(self, edge_visits: dict[str, int], dtype=np.int64) -> np.ndarray:
+        """
+        Convert an edge visit map to a dense count vector
+
+        :param edge_visits: The visit count per edge name, edges that are absent count as 0 visits
+        :param dtype: The type of the counts
+        :return: The visit count per edge code, starting at 0
+        """
+        return ElementIndex._visit_vector(self.edge_codes, edge_visits, dtype)
+
+    @staticmethod
+    def vector_to_dict(names: list[str], vector: np.ndarray) -> dict[str, int]:
+        """
+        Convert a dense count vector back to a visit map
+
+        :param names: The element names, vertex_names or edge_names
+        :param vector: The visit counts
+        :return: The visit map
+        """
+        return dict(zip(names, vector.tolist()))
+
+    def path_visits(self, path: np.ndarray) -> np.ndarray:
+        """
+        Count the visits of every element of an integer-coded path
+
+        :param path: The element codes of the path, see BenchmarkRun.path_codes
+        :return: The visit count per element code, of length element_count, elements that are not in the index are
+                 left out
+        """
+        return np.bincount(path, minlength=self.unknown_code + 1)[:self.element_count]
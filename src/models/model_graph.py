@@ -0,0 +1,323 @@
+import json
+from pathlib import Path, PurePosixPath, PureWindowsPath
+
+import numpy as np
+
+from models.benchmark_report import BenchmarkReport
+from models.element_index import ElementIndex
+
+# GraphWalker prefixes the element IDs of a model file with the name of their (sub)model, with either separator
+_ELEMENT_ID_SEPARATORS = ['_', '_@_']
+
+
+class ModelGraph:
+    """
+    The graph of a GraphWalker model, as compressed sparse row (CSR) adjacency arrays.
+
+    Vertices and edges are numbered with the codes of the benchmark's ElementIndex: vertex codes are the vertex indices,
+    edge codes minus the vertex count are the edge indices. Vertices with the same shared state are merged, as GraphWalker
+    does when it runs the model.
+    """
+
+    def __init__(self, vertex_count: int, edge_sources: np.ndarray, edge_targets: np.ndarray, start: int = -1):
+        """
+        Create a model graph
+
+        :param vertex_count: The number of vertices
+        :param edge_sources: The source vertex of every edge, -1 for edges that are not in the model
+        :param edge_targets: The target vertex of every edge, -1 for edges that are not in the model
+        :param start: The start vertex, -1 if unknown
+        """
+        self.vertex_count = vertex_count
+        self.edge_sources = np.asarray(edge_sources, dtype=np.int32)
+        self.edge_targets = np.asarray(edge_targets, dtype=np.int32)
+        self.start = start
+
+        known = np.flatnonzero((self.edge_sources >= 0) & (self.edge_targets >= 0))
+        self.edge_codes = known[np.argsort(self.edge_sources[known], kind='stable')].astype(np.int32)
+        self.indices = self.edge_targets[self.edge_codes]
+        self.indptr = np.zeros(vertex_count + 1, dtype=np.int32)
+        np.cumsum(np.bincount(self.edge_sources[known], minlength=vertex_count), out=self.indptr[1:])
+
+        self._distances = None
+        self._bounds = {}
+
+    @classmethod
+    def from_file(cls, file: Path, element_index: ElementIndex) -> 'ModelGraph':
+        """
+        Load a GraphWalker model file, numbering its elements with the codes of an element index
+
+        :param file: The GraphWalker model JSON file
+        :param element_index: The index of the benchmark's elements
+        :return: The model graph
+        """
+        data = json.loads(Path(file).read_text(encoding='utf-8'))
+        codes = element_index.element_codes
+
+        def element_code(model_name: str, element_id: str) -> int | None:
+            for candidate in [f'{model_name}{separator}{element_id}' for separator in _ELEMENT_ID_SEPARATORS] + [
+                    element_id]:
+                if candidate in codes:
+                    return codes[candidate]
+            return None
+
+        # Only one vertex of a shared state is kept, the others are resolved to it once it is known
+        vertex_codes = {}
+        shared_codes = {}
+        shared_vertices = []
+        for model in data['models']:
+            for vertex in model['vertices']:
+                code = element_code(model['name'], vertex['id'])
+                shared_state = vertex.get('sharedState')
+                if shared_state and code is None:
+                    shared_vertices.append(((model['name'], vertex['id']), shared_state))
+                    continue
+                if shared_state:
+                    shared_codes[shared_state] = code
+                vertex_codes[(model['name'], vertex['id'])] = code
+        for key, shared_state in shared_vertices:
+            vertex_codes[key] = shared_codes.get(shared_state)
+
+        vertex_count = element_index.vertex_count
+        edge_sources = np.full(element_index.edge_count, -1, dtype=np.int32)
+        edge_targets = np.full(element_index.edge_count, -1, dtype=np.int32)
+        start = -1
+        for model in data['models']:
+            for edge in model['edges']:
+                code = element_code(model['name'], edge['id'])
+                source = vertex_codes.get((model['name'], edge.get('sourceVertexId')))
+                target = vertex_codes.get((model['name'], edge.get('targetVertexId')))
+                if code is None or code < vertex_count or source is None or target is None:
+                    continue
+                edge_sources[code - vertex_count] = source
+                edge_targets[code - vertex_count] = target
+
+            if model.get('startElementId'):
+                code = element_code(model['name'], model['startElementId'])
+                if code is not None and code < vertex_count:
+                    start = code
+                elif code is not None:
+                    start = int(edge_sources[code - vertex_count])
+
+        return cls(vertex_count, edge_sources, edge_targets, start)
+
+    @staticmethod
+    def find_model_file(report: BenchmarkReport, models_dir: Path) -> Path | None:
+        """
+        Find the GraphWalker model file of a benchmark, by the name of the report's model path, or else the model file
+        sharing the most element IDs with the benchmark
+
+        :param report: The benchmark report
+        :param models_dir: The directory of the GraphWalker model files
+        :return: The model file, or None if no model file matches
+        """
+        models_dir = Path(models_dir)
+        if not models_dir.is_dir():
+            return None
+
+        for name in [PureWindowsPath(report.model_path).name, PurePosixPath(report.model_path).name,
+                     f'{report.model.name}.json']:
+            if name and (models_dir / name).is_file():
+                return models_dir / name
+
+        element_ids = {element_id.rsplit('_', 1)[-1] for element_id in report.element_index.element_codes}
+        best_file, best_overlap = None, 0
+        for file in sorted(models_dir.glob('*.json')):
+            try:
+                data = json.loads(file.read_text(encoding='utf-8'))
+                file_ids = {element['id'] for model in data['models']
+                            for element in model['vertices'] + model['edges']}
+            except (ValueError, KeyError, TypeError):
+                continue
+            overlap = len(element_ids & file_ids)
+            if overlap > best_overlap:
+                best_file, best_overlap = file, overlap
+        return best_file
+
+    def with_path_edges(self, paths: list[np.ndarray]) -> 'ModelGraph':
+        """
+        Complete the graph with the edges that are missing from the model file but traversed by paths, for model files
+        of an older version of the model
+
+        :param paths: Element coded paths, see BenchmarkRun.path_codes
+        :return: The completed graph, or this graph if no edge is missing
+        """
+        edge_sources = self.edge_sources.copy()
+        edge_targets = self.edge_targets.copy()
+        for path in paths:
+            # Paths alternate between vertices and edges, starting with a vertex
+            vertices = path[0::2]
+            sources, edges, targets = vertices[:-1], path[1:len(vertices) * 2 - 1:2] - self.vertex_count, vertices[1:]
+            valid = ((edges >= 0) & (edges < len(edge_sources)) & (sources < self.vertex_count) &
+                     (targets < self.vertex_count))
+            missing = valid.copy()
+            missing[valid] = edge_sources[edges[valid]] < 0
+            edge_sources[edges[missing]] = sources[missing]
+            edge_targets[edges[missing]] = targets[missing]
+
+        if np.array_equal(edge_sources, self.edge_sources):
+            return self
+        return ModelGraph(self.vertex_count, edge_sources, edge_targets, self.start)
+
+    @property
+    def edge_count(self) -> int:
+        """
+        The number of edges in the model
+        """
+        return len(self.edge_codes)
+
+    @property
+    def out_degrees(self) -> np.ndarray:
+        """
+        The number of outgoing edges of every vertex
+        """
+        return np.diff(self.indptr)
+
+    @property
+    def in_degrees(self) -> np.ndarray:
+        """
+        The number of incoming edges of every vertex
+        """
+        return np.bincount(self.indices, minlength=self.vertex_count)
+
+    def neighbours(self, vertex: int) -> np.ndarray:
+        """
+        The target vertices of the outgoing edges of a vertex
+
+        :param vertex: The vertex code
+        :return: The target vertex codes
+        """
+        return self.indices[self.indptr[vertex]:self.indptr[vertex + 1]]
+
+    @property
+    def distances(self) -> np.ndarray:
+        """
+        The number of edges of the shortest walk between every pair of vertices, inf if there is none. Computed once,
+        with a breadth-first search from every vertex at the same time.
+
+        :return: A matrix of distances from row vertex to column vertex
+        """
+        if self._distances is None:
+            n = self.vertex_count
+            adjacency = np.zeros((n, n), dtype=np.float32)
+            adjacency[np.repeat(np.arange(n), self.out_degrees), self.indices] = 1
+
+            distances = np.full((n, n), np.inf)
+            np.fill_diagonal(distances, 0)
+            reached = np.eye(n, dtype=bool)
+            frontier = np.eye(n, dtype=np.float32)
+            for level in range(1, n):
+                new = ((frontier @ adjacency) > 0) & ~reached
+                if not new.any():
+                    break
+                distances[new] = level
+                reached |= new
+                frontier = new.astype(np.float32)
+            self._distances = distances
+        return self._distances
+
+    def covering_walk_lower_bound(self, edge_mask: np.ndarray, start: int = None) -> float:
+        """
+        Lower bound of the number of edges of a walk from the start vertex that traverses every required edge. The
+        required edges are traversed once, plus the cheapest extra walks that balance the in and out degrees so an
+        Euler trail from the start vertex exists (the Chinese postman problem, ignoring connectivity when only some
+        edges are required).
+
+        :param edge_mask: Which edges are required, by edge index
+        :param start: The start vertex, default the model's start vertex
+        :return: The lower bound, inf if the required edges can not be balanced
+        """
+        start = self.start if start is None else start
+        key = (np.packbits(edge_mask).tobytes(), start)
+        if key not in self._bounds:
+            required = np.flatnonzero(edge_mask & (self.edge_sources >= 0))
+            if len(required) == 0:
+                self._bounds[key] = 0.0
+            else:
+                # Extra walks must start where the required edges leave a vertex less often than they enter it
+                balance = (np.bincount(self.edge_targets[required], minlength=self.vertex_count) -
+                           np.bincount(self.edge_sources[required], minlength=self.vertex_count))
+                if start >= 0:
+                    balance[start] += 1
+                self._bounds[key] = len(required) + ModelGraph._balancing_cost(balance, self.distances)
+        return self._bounds[key]
+
+    @property
+    def chinese_postman_bound(self) -> float:
+        """
+        The number of edges of the shortest walk from the start vertex that traverses every edge of the model
+
+        :return: The Chinese postman bound, inf if not every edge can be reached
+        """
+        return self.covering_walk_lower_bound(self.edge_sources >= 0)
+
+    @staticmethod
+    def _balancing_cost(balance: np.ndarray, distances: np.ndarray) -> float:
+        """
+        Minimal total length of the walks from the vertices with a positive balance to the vertices with a negative
+        balance, where one unit of balance may be left over (the end of the covering walk). A transportation problem,
+        solved with successive shortest augmenting paths.
+
+        :param balance: The number of walks to start (positive) or end (negative) at every vertex, summing to 1
+        :param distances: The distance matrix of the graph
+        :return: The minimal total length
+        """
+        sources = np.flatnonzero(balance > 0)
+        sinks = np.flatnonzero(balance < 0)
+        supply = balance[sources].astype(np.int64)
+        # The last column is the left over unit, free to leave at any source
+        demand = np.append(-balance[sinks], balance.sum()).astype(np.int64)
+        cost = np.hstack([distances[np.ix_(sources, sinks)], np.zeros((len(sources), 1))])
+        flow = np.zeros(cost.shape, dtype=np.int64)
+
+        total = 0.0
+        while demand.any():
+            # Bellman-Ford over the residual graph: sources to sinks along cost, back along used flow at -cost
+            source_distance = np.where(supply > 0, 0.0, np.inf)
+            sink_distance = np.full(len(demand), np.inf)
+            source_previous = np.full(len(supply), -1)
+            sink_previous = np.full(len(demand), -1)
+            for _ in range(len(supply) + len(demand)):
+                candidates = source_distance[:, np.newaxis] + cost
+                best = candidates.argmin(axis=0)
+                best_distance = candidates[best, np.arange(len(demand))]
+                improved_sinks = best_distance < sink_distance - 1e-9
+                sink_distance[improved_sinks] = best_distance[improved_sinks]
+                sink_previous[improved_sinks] = best[improved_sinks]
+
+                candidates = np.where(flow > 0, sink_distance[np.newaxis, :] - np.where(flow > 0, cost, 0), np.inf)
+                best = candidates.argmin(axis=1)
+                best_distance = candidates[np.arange(len(supply)), best]
+                improved_sources = best_distance < source_distance - 1e-9
+                source_distance[improved_sources] = best_distance[improved_sources]
+                source_previous[improved_sources] = best[improved_sources]
+
+                if not improved_sinks.any() and not improved_sources.any():
+                    break
+
+            remaining_distance = np.where(demand > 0, sink_distance, np.inf)
+            sink = int(np.argmin(remaining_distance))
+            if not np.isfinite(remaining_distance[sink]):
+                return np.inf
+
+            # Walk the augmenting path back to a source with supply left
+            path = []
+            amount = demand[sink]
+            node = sink
+            while True:
+                source = sink_previous[node]
+                path.append((source, node))
+                if source_previous[source] < 0:
+                    amount = min(amount, supply[source])
+                    break
+                node = source_previous[source]
+                amount = min(amount, flow[source, node])
+
+            for i, (source, node) in enumerate(path):
+                flow[source, node] += amount
+                if i + 1 < len(path):
+                    flow[source, path[i + 1][1]] -= amount
+            supply[path[-1][0]] -= amount
+            demand[sink] -= amount
+            total += amount * sink_distance[sink]
+        return float(total)
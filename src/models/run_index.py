@@ -0,0 +1,268 @@
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+
+from models.benchmark import Benchmark
+from models.benchmark_cache import extract_run_group_rows
+from utils.parallel import parallel_map
+
+RUN_INDEX_FILE_NAME = 'run_index.db'
+RUN_INDEX_VERSION = 1
+RUN_COLUMNS = ['benchmark', 'generator', 'algorithm', 'stop_condition', 'stop_coverage', 'iteration', 'seed',
+               'generation_time', 'test_suite_size', 'test_duration', 'driver_time_spent_waiting', 'vertex_coverage',
+               'edge_coverage', 'has_test_results', 'is_failure']
+
+_TEST_RESULT_COLUMNS = ['test_duration', 'driver_time_spent_waiting', 'vertex_coverage', 'edge_coverage']
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS benchmarks (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    fingerprint TEXT,
+    model TEXT,
+    vertices INTEGER,
+    edges INTEGER
+);
+CREATE TABLE IF NOT EXISTS generators (
+    id INTEGER PRIMARY KEY,
+    benchmark_id INTEGER NOT NULL REFERENCES benchmarks (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    stop_condition TEXT NOT NULL,
+    stop_coverage INTEGER,
+    runs INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    generator_id INTEGER NOT NULL REFERENCES generators (id) ON DELETE CASCADE,
+    iteration INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    generation_time INTEGER NOT NULL,
+    test_suite_size INTEGER NOT NULL,
+    test_duration INTEGER,
+    driver_time_spent_waiting INTEGER,
+    vertex_coverage INTEGER,
+    edge_coverage INTEGER,
+    has_test_results INTEGER NOT NULL,
+    is_failure INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS elements (
+    id INTEGER PRIMARY KEY,
+    benchmark_id INTEGER NOT NULL REFERENCES benchmarks (id) ON DELETE CASCADE,
+    element_id TEXT NOT NULL,
+    kind TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS visits (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    element INTEGER NOT NULL REFERENCES elements (id) ON DELETE CASCADE,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (run_id, element)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS generators_by_algorithm ON generators (algorithm, stop_coverage);
+CREATE INDEX IF NOT EXISTS generators_by_coverage ON generators (stop_coverage);
+CREATE INDEX IF NOT EXISTS generators_by_benchmark ON generators (benchmark_id);
+CREATE INDEX IF NOT EXISTS runs_by_generator ON runs (generator_id, iteration);
+CREATE INDEX IF NOT EXISTS runs_by_seed ON runs (seed);
+CREATE INDEX IF NOT EXISTS elements_by_benchmark ON elements (benchmark_id, element_id);
+CREATE INDEX IF NOT EXISTS visits_by_element ON visits (element, count);
+CREATE VIEW IF NOT EXISTS run_view AS
+    SELECT runs.id AS run_id, benchmarks.name AS benchmark, generators.name AS generator, generators.algorithm,
+           generators.stop_condition, generators.stop_coverage, runs.iteration, runs.seed, runs.generation_time,
+           runs.test_suite_size, runs.test_duration, runs.driver_time_spent_waiting, runs.vertex_coverage,
+           runs.edge_coverage, runs.has_test_results, runs.is_failure
+    FROM runs
+    JOIN generators ON generators.id = runs.generator_id
+    JOIN benchmarks ON benchmarks.id = generators.benchmark_id;
+CREATE VIEW IF NOT EXISTS visit_view AS
+    SELECT visits.run_id, benchmarks.name AS benchmark, elements.element_id, elements.kind, visits.count
+    FROM visits
+    JOIN elements ON elements.id = visits.element
+    JOIN benchmarks ON benchmarks.id = elements.benchmark_id;
+'''
+
+
+def _to_array(values: list) -> np.ndarray:
+    """
+    Convert the values of a result column to an array: integers, floats with NaN for NULL, or strings
+    """
+    present = [value for value in values if value is not None]
+    if all(isinstance(value, int) for value in present) and len(present) == len(values):
+        return np.array(values, dtype=np.int64)
+    if all(isinstance(value, (int, float)) for value in present):
+        return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+    return np.array(['' if value is None else str(value) for value in values], dtype=str)
+
+
+class RunIndex:
+    """
+    An SQLite index of the generators, runs and per-element visits of one or more benchmarks, for ad hoc queries that
+    would otherwise mean loading every benchmark and filtering BenchmarkRunGroup.runs. Generators are indexed by
+    algorithm and stop coverage, runs by generator and seed, visits by element.
+
+    The views run_view and visit_view join the tables, so most questions are a single SELECT:
+
+        index = RunIndex('run_index.db')
+        index.add(Benchmark.from_dir('results/parabank_benchmark_edge_coverage'))
+        runs = index.runs(['seed', 'test_suite_size'], algorithm='QuickRandomPath', stop_coverage=90)
+        seeds = runs['seed'][runs['test_suite_size'] > np.percentile(runs['test_suite_size'], 95)]
+    """
+
+    def __init__(self, file: Path):
+        """
+        Open a run index, created if it does not exist
+
+        :param file: The index file
+        """
+        self.file = Path(file)
+        self.connection = sqlite3.connect(self.file)
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        with self.connection:
+            self.connection.executescript(_SCHEMA)
+            self.connection.execute('INSERT OR IGNORE INTO meta VALUES (?, ?)', ('version', str(RUN_INDEX_VERSION)))
+
+        version = self.connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+        if version != str(RUN_INDEX_VERSION):
+            raise ValueError(f'Unsupported run index version {version} in \"{self.file}\"')
+
+    def close(self):
+        """
+        Close the index
+        """
+        self.connection.close()
+
+    def __enter__(self) -> 'RunIndex':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def benchmarks(self) -> dict[str, str | None]:
+        """
+        The indexed benchmarks
+
+        :return: The fingerprint of every benchmark, by name
+        """
+        return dict(self.connection.execute('SELECT name, fingerprint FROM benchmarks ORDER BY name'))
+
+    def add(self, benchmark: Benchmark, fingerprint: str = None, jobs: int = 1, use_threads: bool = False):
+        """
+        Index a benchmark, replacing the benchmark of the same name
+
+        :param benchmark: The benchmark
+        :param fingerprint: The fingerprint of the benchmark's files, to skip indexing them again while they are
+                            unchanged, see fingerprint_benchmark_dir
+        :param jobs: Number of workers to read the run reports with, 0 or less to use every available CPU
+        :param use_threads: Whether to use a thread pool instead of a process pool
+        """
+        run_groups = benchmark.run_groups_sorted
+        group_rows = parallel_map(extract_run_group_rows, run_groups, jobs, use_threads)
+        model = benchmark.report.model
+
+        with self.connection:
+            self.connection.execute('DELETE FROM benchmarks WHERE name = ?', (benchmark.name,))
+            benchmark_id = self.connection.execute(
+                'INSERT INTO benchmarks (name, fingerprint, model, vertices, edges) VALUES (?, ?, ?, ?, ?)',
+                (benchmark.name, fingerprint, model.name, model.vertices, model.edges)).lastrowid
+
+            element_ids = {}
+            for rows in group_rows:
+                for row in rows:
+                    for kind in ('vertex', 'edge'):
+                        for element_id in row[f'{kind}_visits']:
+                            if (element_id, kind) not in element_ids:
+                                element_ids[element_id, kind] = self.connection.execute(
+                                    'INSERT INTO elements (benchmark_id, element_id, kind) VALUES (?, ?, ?)',
+                                    (benchmark_id, element_id, kind)).lastrowid
+
+            for run_group, rows in zip(run_groups, group_rows):
+                generator_id = self.connection.execute(
+                    'INSERT INTO generators (benchmark_id, name, algorithm, stop_condition, stop_coverage, runs) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (benchmark_id, run_group.name, run_group.algorithm, run_group.stop_condition,
+                     run_group.stop_coverage, len(rows))).lastrowid
+                for row in sorted(rows, key=lambda row: row['iteration']):
+                    test_results = [row[column] if row['has_test_results'] else None
+                                    for column in _TEST_RESULT_COLUMNS]
+                    run_id = self.connection.execute(
+                        'INSERT INTO runs (generator_id, iteration, seed, generation_time, test_suite_size, '
+                        'test_duration, driver_time_spent_waiting, vertex_coverage, edge_coverage, has_test_results, '
+                        'is_failure) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                        (generator_id, row['iteration'], row['seed'], row['generation_time'], row['test_suite_size'],
+                         *test_results, row['has_test_results'], row['is_failure'])).lastrowid
+                    self.connection.executemany(
+                        'INSERT INTO visits VALUES (?, ?, ?)',
+                        [(run_id, element_ids[element_id, kind], count) for kind in ('vertex', 'edge')
+                         for element_id, count in row[f'{kind}_visits'].items()])
+
+    def remove(self, name: str):
+        """
+        Remove a benchmark from the index
+
+        :param name: The name of the benchmark
+        """
+        with self.connection:
+            self.connection.execute('DELETE FROM benchmarks WHERE name = ?', (name,))
+
+    def query(self, sql: str, parameters: tuple | dict = ()) -> dict[str, np.ndarray]:
+        """
+        Run a read-only SQL query, statements that would change the index fail
+
+        :param sql: The query, over the tables benchmarks, generators, runs, elements and visits, or the views run_view
+                    and visit_view
+        :param parameters: The parameters of the query's placeholders
+        :return: The result, as an array per column by name: integers, floats with NaN for NULL, or strings
+        :raises sqlite3.Error: If the query is invalid or would change the index
+        """
+        self.connection.execute('PRAGMA query_only = ON')
+        try:
+            cursor = self.connection.execute(sql, parameters)
+            names = [column[0] for column in cursor.description or []]
+            rows = cursor.fetchall()
+        finally:
+            self.connection.execute('PRAGMA query_only = OFF')
+        return {name: _to_array([row[i] for row in rows]) for i, name in enumerate(names)}
+
+    def runs(self, columns: list[str] = None, benchmark: str = None, algorithm: str = None,
+             stop_coverage: int = None, seed: int = None) -> dict[str, np.ndarray]:
+        """
+        Get the values of the runs matching every given filter, through the indexes
+
+        :param columns: The columns to get, from RUN_COLUMNS. Default every column
+        :param benchmark: The benchmark name
+        :param algorithm: The algorithm
+        :param stop_coverage: The stop coverage
+        :param seed: The seed
+        :return: The result, see query
+        """
+        columns = columns or RUN_COLUMNS
+        for column in columns:
+            if column not in RUN_COLUMNS:
+                raise ValueError(f'Unknown run column \"{column}\", options: {", ".join(RUN_COLUMNS)}')
+
+        filters = {'benchmark': benchmark, 'algorithm': algorithm, 'stop_coverage': stop_coverage, 'seed': seed}
+        filters = {column: value for column, value in filters.items() if value is not None}
+        where = f' WHERE {" AND ".join(f"{column} = :{column}" for column in filters)}' if filters else ''
+        return self.query(f'SELECT {", ".join(columns)} FROM run_view{where} '
+                          f'ORDER BY benchmark, algorithm, stop_coverage, iteration', filters)
+
+    @staticmethod
+    def format_table(result: dict[str, np.ndarray]) -> str:
+        """
+        Format a query result as an aligned text table
+
+        :param result: The result of query
+        :return: The table
+        """
+        names = list(result)
+        cells = [[str(value) for value in result[name]] for name in names]
+        widths = [max([len(name)] + [len(cell) for cell in column]) for name, column in zip(names, cells)]
+        lines = ['  '.join(name.ljust(width) for name, width in zip(names, widths))]
+        for row in zip(*cells):
+            lines.append('  '.join(cell.ljust(width) for cell, width in zip(row, widths)))
+        return '\n'.join(lines)
@@ -0,0 +1,362 @@
+import io
+import json
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path, PurePosixPath
+from typing import IO, Iterator
+
+from models.benchmark_run import BenchmarkRun
+from models.benchmark_run_group import BenchmarkRunGroup
+from utils.benchmark_archive import BenchmarkArchive, is_benchmark_archive
+from utils.parallel import parallel_imap
+
+RUN_STORE_SUFFIX = '.sqlite'
+RUN_STORE_VERSION = 1
+RUN_FILE_KINDS = ('test_results', 'report', 'path')
+
+_RUN_FILE_PATTERN = re.compile(r'run_(\d+)_(path|report|test_results)\.json')
+
+# The small columns come first, SQLite reads the columns of a row in order through its overflow pages
+_SCHEMA = '''
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE runs (
+    generator TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    stop_condition TEXT NOT NULL,
+    stop_coverage INTEGER,
+    iteration INTEGER NOT NULL,
+    test_results TEXT,
+    report TEXT NOT NULL,
+    path TEXT NOT NULL
+);
+CREATE UNIQUE INDEX runs_by_generator ON runs (generator, iteration);
+CREATE INDEX runs_by_coverage ON runs (stop_coverage, algorithm, iteration);
+'''
+
+# The stores opened by every thread, by file and process ID, as SQLite connections are not shared across threads or
+# forked processes
+_open_stores = threading.local()
+
+
+def is_run_store(path: Path) -> bool:
+    """
+    Check whether a path is a run store, by its file name
+
+    :param path: The path to check
+    :return: Whether the path is a file with the RUN_STORE_SUFFIX suffix
+    """
+    return Path(path).is_file() and Path(path).name.lower().endswith(RUN_STORE_SUFFIX)
+
+
+def _read_run_group_rows(folder: Path) -> list[tuple]:
+    """
+    Read the files of the runs of a generator directory as rows of the runs table, by iteration
+    """
+    run_group = BenchmarkRunGroup.from_dir(folder)
+    rows = []
+    for run in sorted(run_group.runs, key=lambda run: run.iteration):
+        test_results = run.test_results_file.read_text() if run.test_results_file.exists() else None
+        rows.append((folder.name, run_group.algorithm, run_group.stop_condition, run_group.stop_coverage,
+                     run.iteration, test_results, run.report_file.read_text(), run.path_file.read_text()))
+    return rows
+
+
+class RunStore:
+    """
+    The runs of a benchmark consolidated in a single SQLite database: the benchmark's report.json, and the path, report
+    and test results of every run, indexed by generator and iteration, and by stop coverage. Loading the runs of a
+    generator is a single range scan of the index, instead of a directory walk and an open call per file.
+
+    Use convert to create a store from a benchmark directory or archive, Benchmark.from_dir loads it like a benchmark
+    directory. Runs still read their path and report only when accessed, see StorePath.
+    """
+
+    def __init__(self, file: Path):
+        """
+        Open a run store, read-only
+
+        :param file: The store file
+        """
+        self.file = Path(file)
+        if not self.file.is_file():
+            raise FileNotFoundError(f'{self.file} does not exist.')
+        self.connection = sqlite3.connect(f'{self.file.absolute().as_uri()}?mode=ro', uri=True)
+
+        version = self._meta('version')
+        if version != str(RUN_STORE_VERSION):
+            raise ValueError(f'Unsupported run store version {version} in \"{self.file}\"')
+
+    @classmethod
+    def open(cls, file: Path) -> 'RunStore':
+        """
+        Get the store of a file, opened once per thread
+
+        :param file: The store file
+        :return: The store
+        """
+        stores = getattr(_open_stores, 'stores', None)
+        if stores is None:
+            stores = _open_stores.stores = {}
+        key = (str(Path(file).absolute()), os.getpid())
+        if key not in stores:
+            stores[key] = cls(file)
+        return stores[key]
+
+    @property
+    def name(self) -> str:
+        """
+        The name of the benchmark, the file name without the RUN_STORE_SUFFIX suffix
+        """
+        return self.file.name[:-len(RUN_STORE_SUFFIX)]
+
+    def _meta(self, key: str) -> str | None:
+        row = self.connection.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def path(self) -> 'StorePath':
+        """
+        Get the benchmark directory of the store
+
+        :return: The path of the directory holding report.json and the runs directory
+        """
+        return StorePath(self.file)
+
+    def report_text(self) -> str:
+        """
+        Get the benchmark's report.json
+
+        :return: The content of report.json
+        """
+        return self._meta('report')
+
+    def generators(self) -> list[str]:
+        """
+        Get the generators of the runs
+
+        :return: The generator names, sorted
+        """
+        return [row[0] for row in self.connection.execute('SELECT DISTINCT generator FROM runs ORDER BY generator')]
+
+    def has_generator(self, generator: str) -> bool:
+        """
+        Check whether the store has runs of a generator
+
+        :param generator: The generator name
+        :return: Whether the generator has runs
+        """
+        return self.connection.execute('SELECT 1 FROM runs WHERE generator = ? LIMIT 1', (generator,)).fetchone() \
+            is not None
+
+    def iterations(self, generator: str) -> list[tuple[int, bool]]:
+        """
+        Get the runs of a generator
+
+        :param generator: The generator name
+        :return: The iteration of every run, and whether it has test results, by iteration
+        """
+        return [(iteration, bool(has_test_results)) for iteration, has_test_results in self.connection.execute(
+            'SELECT iteration, test_results IS NOT NULL FROM runs WHERE generator = ? ORDER BY iteration',
+            (generator,))]
+
+    def read_run_file(self, generator: str, iteration: int, kind: str) -> str | None:
+        """
+        Read a file of a run
+
+        :param generator: The generator name
+        :param iteration: The iteration of the run
+        :param kind: The file, one of RUN_FILE_KINDS
+        :return: The content of the file, or None if the run or file does not exist
+        """
+        if kind not in RUN_FILE_KINDS:
+            raise ValueError(f'Unknown run file \"{kind}\", options: {", ".join(RUN_FILE_KINDS)}')
+        row = self.connection.execute(f'SELECT {kind} FROM runs WHERE generator = ? AND iteration = ?',
+                                      (generator, iteration)).fetchone()
+        return row[0] if row else None
+
+    def has_run_file(self, generator: str, iteration: int, kind: str) -> bool:
+        """
+        Check whether a file of a run exists, without reading it
+
+        :param generator: The generator name
+        :param iteration: The iteration of the run
+        :param kind: The file, one of RUN_FILE_KINDS
+        :return: Whether the run and file exist
+        """
+        if kind not in RUN_FILE_KINDS:
+            raise ValueError(f'Unknown run file \"{kind}\", options: {", ".join(RUN_FILE_KINDS)}')
+        row = self.connection.execute(f'SELECT {kind} IS NOT NULL FROM runs WHERE generator = ? AND iteration = ?',
+                                      (generator, iteration)).fetchone()
+        return bool(row and row[0])
+
+    @staticmethod
+    def load_run_group(path: 'StorePath') -> BenchmarkRunGroup:
+        """
+        Load the runs of a generator with a single range scan. The test results are read at once, as BenchmarkRunGroup
+        does for a directory, the paths and reports are read when accessed.
+
+        :param path: The generator's directory in the store, as listed by the store's runs directory
+        :return: The benchmark run group
+        """
+        store = path.store
+        runs = []
+        for iteration, test_results in store.connection.execute(
+                'SELECT iteration, test_results FROM runs WHERE generator = ? ORDER BY iteration', (path.name,)):
+            runs.append(BenchmarkRun(None, None, json.loads(test_results) if test_results is not None else {},
+                                     path_file=path / f'run_{iteration}_path.json',
+                                     report_file=path / f'run_{iteration}_report.json',
+                                     test_results_file=path / f'run_{iteration}_test_results.json',
+                                     iteration=iteration))
+        return BenchmarkRunGroup.from_runs(path.name, runs)
+
+    @staticmethod
+    def convert(benchmark_path: Path, output_file: Path, jobs: int = 1, use_threads: bool = False) -> Path:
+        """
+        Convert a benchmark directory or archive to a run store. The files are stored as they are, so the store loads
+        the same runs.
+
+        :param benchmark_path: The benchmark directory or archive
+        :param output_file: The store file to write, replaced if it exists
+        :param jobs: Number of workers to read the generator directories with, 0 or less to use every available CPU
+        :param use_threads: Whether to use a thread pool instead of a process pool
+        :return: The store file
+        """
+        benchmark_path = Path(benchmark_path)
+        if is_benchmark_archive(benchmark_path):
+            root = BenchmarkArchive.open(benchmark_path).path()
+            use_threads = True
+        else:
+            root = benchmark_path
+        if not (root / 'report.json').exists():
+            raise FileNotFoundError(f'{root / "report.json"} does not exist.')
+
+        generator_folders = sorted(folder for folder in (root / 'runs').iterdir() if folder.is_dir())
+
+        # Written next to the output, then renamed, so an interrupted conversion never leaves a partial store
+        output_file = Path(output_file)
+        temp_file = output_file.with_name(f'{output_file.name}.tmp')
+        temp_file.unlink(missing_ok=True)
+        connection = sqlite3.connect(temp_file)
+        try:
+            connection.executescript(_SCHEMA)
+            connection.executemany('INSERT INTO meta VALUES (?, ?)',
+                                   [('version', str(RUN_STORE_VERSION)),
+                                    ('report', (root / 'report.json').read_text())])
+            for rows in parallel_imap(_read_run_group_rows, generator_folders, jobs, use_threads):
+                connection.executemany('INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+            connection.commit()
+        finally:
+            connection.close()
+        temp_file.replace(output_file)
+        return output_file
+
+
+class StorePath:
+    """
+    A file or directory of the benchmark directory in a run store, with the part of the pathlib.Path interface the
+    benchmark models use. The store is laid out as the benchmark directory it was converted from: report.json, and
+    runs/<generator>/run_<iteration>_<path|report|test_results>.json.
+
+    Only the store file and member name are stored, so paths can be sent to worker processes, which open the store
+    themselves when a member is read.
+    """
+
+    def __init__(self, store_file: Path, member: str = ''):
+        """
+        Create a store path
+
+        :param store_file: The store file
+        :param member: The path of the file or directory in the benchmark directory, '' for the directory itself
+        """
+        self.store_file = Path(store_file)
+        self.member = member.strip('/')
+
+    @property
+    def store(self) -> RunStore:
+        """
+        The opened store
+        """
+        return RunStore.open(self.store_file)
+
+    @property
+    def name(self) -> str:
+        return PurePosixPath(self.member).name if self.member else self.store.name
+
+    def _run_file(self) -> tuple[str, int, str] | None:
+        """
+        Get the generator, iteration and kind of a run file, or None if this is not a run file
+        """
+        parts = self.member.split('/')
+        match = _RUN_FILE_PATTERN.fullmatch(parts[-1])
+        if len(parts) != 3 or parts[0] != 'runs' or match is None:
+            return None
+        return parts[1], int(match.group(1)), match.group(2)
+
+    def __truediv__(self, other: str) -> 'StorePath':
+        return StorePath(self.store_file, f'{self.member}/{other}' if self.member else str(other))
+
+    def exists(self) -> bool:
+        return self.is_file() or self.is_dir()
+
+    def is_file(self) -> bool:
+        if self.member == 'report.json':
+            return True
+        run_file = self._run_file()
+        return run_file is not None and self.store.has_run_file(*run_file)
+
+    def is_dir(self) -> bool:
+        if self.member in ('', 'runs'):
+            return True
+        parts = self.member.split('/')
+        return len(parts) == 2 and parts[0] == 'runs' and self.store.has_generator(parts[1])
+
+    def iterdir(self) -> Iterator['StorePath']:
+        if not self.is_dir():
+            raise NotADirectoryError(f'{self} is not a directory.')
+        if self.member == '':
+            names = ['report.json', 'runs']
+        elif self.member == 'runs':
+            names = self.store.generators()
+        else:
+            names = [f'run_{iteration}_{kind}.json' for iteration, has_test_results in self.store.iterations(self.name)
+                     for kind in RUN_FILE_KINDS[::-1] if kind != 'test_results' or has_test_results]
+        return (self / name for name in names)
+
+    def read_text(self, encoding: str = 'utf-8') -> str:
+        if self.member == 'report.json':
+            return self.store.report_text()
+        run_file = self._run_file()
+        text = self.store.read_run_file(*run_file) if run_file is not None else None
+        if text is None:
+            raise FileNotFoundError(f'{self} does not exist.')
+        return text
+
+    def read_bytes(self) -> bytes:
+        return self.read_text().encode('utf-8')
+
+    def open(self, mode: str = 'r', encoding: str = 'utf-8') -> IO:
+        if mode not in ('r', 'rb'):
+            raise ValueError(f'Run stores are read-only, cannot open {self} with mode \"{mode}\"')
+        return io.BytesIO(self.read_bytes()) if mode == 'rb' else io.StringIO(self.read_text())
+
+    def relative_to(self, other: 'StorePath') -> PurePosixPath:
+        return PurePosixPath(self.member).relative_to(other.member)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, StorePath) and self.store_file == other.store_file and self.member == other.member
+
+    def __lt__(self, other: 'StorePath') -> bool:
+        return (str(self.store_file), self.member) < (str(other.store_file), other.member)
+
+    def __hash__(self) -> int:
+        return hash((self.store_file, self.member))
+
+    def __str__(self) -> str:
+        return f'{self.store_file}/{self.member}' if self.member else str(self.store_file)
+
+    def __repr__(self) -> str:
+        return f'StorePath({str(self.store_file)!r}, {self.member!r})'
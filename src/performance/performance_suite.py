@@ -0,0 +1,232 @@
+import json
+import platform
+import subprocess
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from shutil import rmtree
+from typing import Callable
+
+import numpy as np
+
+from models.benchmark import Benchmark
+from performance.synthetic_benchmark import SyntheticBenchmark
+from plotters.benchmark_plotter import BenchmarkPlotter
+from report.report_factory import ReportFactory
+from statistics.benchmark_statistics import BenchmarkStatistics
+from utils.profiler import Measurement, memory_source
+
+HISTORY_VERSION = 1
+REPORT_TYPES = ['html', 'raw_data', 'csv', 'pdf']
+
+
+class PerformanceSuite:
+    """
+    Measures the performance of this tool on a synthetic benchmark (see SyntheticBenchmark): loading the benchmark with
+    and without the columnar cache, the statistics, the plots and every report type. Every result is appended to a JSON
+    history, and compared to the previous result of the same parameters, so optimizations can be proven.
+
+    Every stage is measured on a freshly loaded benchmark, so the aggregates cached by an earlier stage do not speed up
+    a later one.
+    """
+
+    def __init__(self, synthetic_benchmark: SyntheticBenchmark, report_types: list[str] = None, repeat: int = 3,
+                 jobs: int = 1, work_dir: Path = None, verbose: bool = False):
+        """
+        Create a performance suite
+
+        :param synthetic_benchmark: The benchmark to measure on
+        :param report_types: The report types to measure, default every type of REPORT_TYPES but pdf
+        :param repeat: The number of times to measure every stage, the minimum and median are reported
+        :param jobs: Number of workers used to load the benchmark and render plots, 0 or less to use every available
+                     CPU
+        :param work_dir: The directory to write the benchmark and reports to, which is kept. Default a temporary
+                         directory, deleted afterwards
+        :param verbose: Whether to print every measurement
+        """
+        report_types = [report_type.lower() for report_type in (report_types or REPORT_TYPES[:-1])]
+        for report_type in report_types:
+            if report_type not in REPORT_TYPES:
+                raise ValueError(f'Unknown report type \"{report_type}\"')
+        if repeat < 1:
+            raise ValueError('The suite must be repeated at least once')
+
+        self.synthetic_benchmark = synthetic_benchmark
+        self.report_types = report_types
+        self.repeat = repeat
+        self.jobs = jobs
+        self.work_dir = work_dir
+        self.verbose = verbose
+
+    @property
+    def parameters(self) -> dict:
+        """
+        The parameters results are compared by: the synthetic benchmark's parameters and the number of jobs
+        """
+        return {**self.synthetic_benchmark.parameters, 'jobs': self.jobs}
+
+    def run(self, label: str = None) -> dict:
+        """
+        Create the synthetic benchmark and measure every stage
+
+        :param label: A name for the result, such as the change being measured
+        :return: The result, as stored in the history
+        """
+        work_dir = self.work_dir or Path(tempfile.mkdtemp(prefix='benchmark_performance_'))
+        try:
+            with Measurement() as generation:
+                benchmark_dir, models_dir = self.synthetic_benchmark.write(work_dir)
+            if self.verbose:
+                print(f'Created \"{benchmark_dir}\" in {generation.seconds:.2f}s')
+
+            measurements: dict[str, list[dict]] = {}
+            for _ in range(self.repeat):
+                for name, values in self._measure_stages(benchmark_dir, models_dir, work_dir / 'reports'):
+                    if self.verbose:
+                        print(f'{name:<20} {values["seconds"]:>10.3f}s {values["peak_memory"] / 2 ** 20:>10.1f} MiB')
+                    measurements.setdefault(name, []).append(values)
+        finally:
+            if self.work_dir is None:
+                rmtree(work_dir, ignore_errors=True)
+
+        return {'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'label': label,
+                'commit': PerformanceSuite.current_commit(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'memory_source': memory_source(),
+                'parameters': self.parameters,
+                'repeat': self.repeat,
+                'generation_seconds': generation.seconds,
+                'results': {name: PerformanceSuite.summarize(values) for name, values in measurements.items()}}
+
+    def _measure_stages(self, benchmark_dir: Path, models_dir: Path, reports_dir: Path):
+        """
+        Measure every stage once
+
+        :return: An iterator of (stage name, measurement, see Measurement.to_dict)
+        """
+        cache_dir = benchmark_dir.parent / 'cache'
+        rmtree(cache_dir, ignore_errors=True)
+
+        def load(use_cache: bool = True) -> Benchmark:
+            return Benchmark.from_dir(str(benchmark_dir), jobs=self.jobs, use_cache=use_cache,
+                                      cache_dir=str(cache_dir))
+
+        yield 'load', self._measure(lambda: load(use_cache=False))
+        yield 'load_cache_store', self._measure(load)
+        yield 'load_cache', self._measure(load)
+
+        benchmark = load()
+        yield 'model_graph', self._measure(lambda: benchmark.load_model_graph(models_dir))
+
+        def fresh() -> Benchmark:
+            # Loaded from the cache without the aggregates of the previous stages
+            benchmark = load()
+            benchmark.load_model_graph(models_dir)
+            return benchmark
+
+        benchmark = fresh()
+        yield 'statistics', self._measure(
+            lambda: BenchmarkStatistics.create_statistics(benchmark, benchmark.report.generators_grouped))
+
+        benchmark = fresh()
+        yield 'plots', self._measure(
+            lambda: BenchmarkPlotter.create_plots(benchmark, benchmark.report.generators_grouped, jobs=self.jobs))
+
+        for report_type in self.report_types:
+            benchmark = fresh()
+            output = reports_dir / report_type
+            rmtree(output, ignore_errors=True)
+            output.mkdir(parents=True)
+            report_factory = ReportFactory(report_type, prompt_delete_temp=False, jobs=self.jobs)
+            yield f'report_{report_type}', self._measure(lambda: report_factory.create_report(benchmark, output))
+
+    @staticmethod
+    def _measure(function: Callable) -> dict:
+        with Measurement() as measurement:
+            function()
+        return measurement.to_dict()
+
+    @staticmethod
+    def summarize(measurements: list[dict]) -> dict:
+        """
+        Summarize the repeated measurements of a stage
+
+        :param measurements: The measurements, see Measurement.to_dict
+        :return: The seconds of every repetition, their minimum and median, and the highest peak memory and increase
+                 of the memory during the stage
+        """
+        seconds = [measurement['seconds'] for measurement in measurements]
+        return {'seconds': seconds, 'min_seconds': min(seconds), 'median_seconds': float(np.median(seconds)),
+                'peak_memory': max(measurement['peak_memory'] for measurement in measurements),
+                'memory_increase': max(measurement['memory_increase'] for measurement in measurements)}
+
+    @staticmethod
+    def current_commit() -> str | None:
+        """
+        Get the git commit of this tool, if it is run from a git repository
+
+        :return: The commit hash, or None
+        """
+        try:
+            return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=Path(__file__).parent, capture_output=True,
+                                  text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    @staticmethod
+    def load_history(file: Path) -> list[dict]:
+        """
+        Load the results of a history file
+
+        :param file: The history file
+        :return: The results, oldest first, or an empty list if the file does not exist
+        """
+        if not file.exists():
+            return []
+        history = json.loads(file.read_text())
+        if history.get('version') != HISTORY_VERSION:
+            raise ValueError(f'Unsupported performance history version {history.get("version")} in \"{file}\"')
+        return history['results']
+
+    @staticmethod
+    def append_history(file: Path, result: dict) -> dict | None:
+        """
+        Append a result to a history file
+
+        :param file: The history file, created if it does not exist
+        :param result: The result of run
+        :return: The previous result with the same parameters, or None
+        """
+        results = PerformanceSuite.load_history(file)
+        previous = next((previous for previous in reversed(results)
+                         if previous['parameters'] == result['parameters']), None)
+        results.append(result)
+        file.write_text(json.dumps({'version': HISTORY_VERSION, 'results': results}, indent=4))
+        return previous
+
+    @staticmethod
+    def format_comparison(result: dict, previous: dict | None) -> str:
+        """
+        Format a result as a table, with the change of the minimum time compared to a previous result
+
+        :param result: The result of run
+        :param previous: The previous result with the same parameters, or None
+        :return: The table
+        """
+        lines = [f'{"Stage":<20} {"Min (s)":>10} {"Median (s)":>12} {"Peak (MiB)":>12} {"Increase (MiB)":>15} '
+                 f'{"Change":>10}']
+        for name, values in result['results'].items():
+            change = ''
+            if previous is not None and name in previous['results']:
+                before = previous['results'][name]['min_seconds']
+                if before > 0:
+                    change = f'{(values["min_seconds"] - before) / before * 100:+.1f}%'
+            lines.append(f'{name:<20} {values["min_seconds"]:>10.3f} {values["median_seconds"]:>12.3f} '
+                         f'{values["peak_memory"] / 2 ** 20:>12.1f} {values["memory_increase"] / 2 ** 20:>15.1f} '
+                         f'{change:>10}')
+        if previous is not None:
+            lines.append(f'Change compared to {previous["label"] or previous["commit"] or "the previous result"} '
+                         f'of {previous["created"]}')
+        return '\n'.join(lines)
@@ -0,0 +1,268 @@
+import json
+import random
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+ALGORITHMS = ['RandomPath', 'QuickRandomPath', 'DirectedChinesePostmanPath', 'WeightedRandomPath', 'ShortestAllPaths']
+STOP_CONDITIONS = ['EdgeCoverage', 'VertexCoverage']
+MODEL_NAME = 'Synthetic'
+
+
+class SyntheticBenchmark:
+    """
+    Creates GraphWalker benchmark directories of any size, with the report.json and runs/ layout of the GraphWalker
+    benchmark command, to measure the performance of this tool on realistic input sizes.
+
+    The runs are random walks over a random model, written with the model file so the path redundancy statistics can
+    be created as well. The content is deterministic for a seed.
+    """
+
+    def __init__(self, generators: int = 3, coverage_values: list[int] = None, runs: int = 30, vertices: int = 75,
+                 edges: int = 144, path_length: int = 500, stop_condition: str = 'EdgeCoverage',
+                 test_results: bool = True, seed: int = 0):
+        """
+        Create a synthetic benchmark
+
+        :param generators: The number of path generator algorithms
+        :param coverage_values: The stop coverages every algorithm is run with. Default 80, 90 and 100
+        :param runs: The number of runs per generator
+        :param vertices: The number of vertices of the model
+        :param edges: The number of edges of the model, at least the number of vertices
+        :param path_length: The average number of elements of the paths at 100% coverage, the paths of lower coverages
+                            are proportionally shorter
+        :param stop_condition: The stop condition of the generators, one of STOP_CONDITIONS
+        :param test_results: Whether to write test results for every run, which adds the test execution plots and
+                             statistics
+        :param seed: The seed of the random model and runs
+        """
+        if stop_condition not in STOP_CONDITIONS:
+            raise ValueError(f'Unknown stop condition \"{stop_condition}\", options: {", ".join(STOP_CONDITIONS)}')
+        if min(generators, runs, vertices, path_length) < 1:
+            raise ValueError('The generators, runs, vertices and path length must be at least 1')
+        if edges < vertices:
+            raise ValueError(f'The model needs at least as many edges as vertices ({vertices}) to be strongly '
+                             f'connected, got {edges}')
+
+        self.generators = generators
+        self.coverage_values = sorted(coverage_values or [80, 90, 100])
+        self.runs = runs
+        self.vertices = vertices
+        self.edges = edges
+        self.path_length = path_length
+        self.stop_condition = stop_condition
+        self.test_results = test_results
+        self.seed = seed
+
+    @property
+    def name(self) -> str:
+        """
+        The name of the benchmark directory, which describes its parameters
+        """
+        return (f'synthetic_benchmark_g{self.generators}_c{len(self.coverage_values)}_r{self.runs}_v{self.vertices}'
+                f'_e{self.edges}_l{self.path_length}')
+
+    @property
+    def parameters(self) -> dict:
+        """
+        The parameters of the benchmark, as given to the constructor
+        """
+        return {'generators': self.generators, 'coverage_values': self.coverage_values, 'runs': self.runs,
+                'vertices': self.vertices, 'edges': self.edges, 'path_length': self.path_length,
+                'stop_condition': self.stop_condition, 'test_results': self.test_results, 'seed': self.seed}
+
+    @property
+    def generator_names(self) -> list[str]:
+        """
+        The names of the generators, "<algorithm>(<stop condition>(<coverage>))"
+        """
+        algorithms = [ALGORITHMS[i % len(ALGORITHMS)] + (str(i // len(ALGORITHMS) + 1) if i >= len(ALGORITHMS) else '')
+                      for i in range(self.generators)]
+        return [f'{algorithm}({self.stop_condition}({coverage}))' for algorithm in algorithms
+                for coverage in self.coverage_values]
+
+    def write(self, output: Path) -> tuple[Path, Path]:
+        """
+        Write the benchmark directory and its model file
+
+        :param output: The directory to write the benchmark directory and the model directory to
+        :return: The benchmark directory, and the directory of its model file
+        """
+        rng = np.random.default_rng(self.seed)
+        ids = random.Random(self.seed)
+        vertex_ids = [str(uuid.UUID(int=ids.getrandbits(128), version=4)) for _ in range(self.vertices)]
+        edge_ids = [str(uuid.UUID(int=ids.getrandbits(128), version=4)) for _ in range(self.edges)]
+
+        # A ring through every vertex keeps the model strongly connected, the other edges are random
+        sources = np.concatenate([np.arange(self.vertices), rng.integers(0, self.vertices, self.edges - self.vertices)])
+        targets = np.concatenate([(np.arange(self.vertices) + 1) % self.vertices,
+                                  rng.integers(0, self.vertices, self.edges - self.vertices)])
+
+        models_dir = output / 'models'
+        models_dir.mkdir(parents=True, exist_ok=True)
+        model_file = models_dir / f'{self.name}.json'
+        model_file.write_text(json.dumps(self._model(vertex_ids, edge_ids, sources, targets), indent=2))
+
+        vertex_names = [f'{MODEL_NAME}_v_Vertex_{i}[{MODEL_NAME}_{vertex_id}]' for i, vertex_id in enumerate(vertex_ids)]
+        edge_names = [f'{MODEL_NAME}_e_Edge_{i}[{MODEL_NAME}_{edge_id}]' for i, edge_id in enumerate(edge_ids)]
+        steps = np.array([f'{{"elementId":"{MODEL_NAME}_{element_id}"}}' for element_id in vertex_ids + edge_ids])
+
+        benchmark_dir = output / self.name
+        runs_dir = benchmark_dir / 'runs'
+        generators = {}
+        for generator_number, name in enumerate(self.generator_names):
+            algorithm_number, coverage_number = divmod(generator_number, len(self.coverage_values))
+            coverage = self.coverage_values[coverage_number]
+            generator_dir = runs_dir / name
+            generator_dir.mkdir(parents=True, exist_ok=True)
+
+            lengths = np.maximum(rng.uniform(0.5, 1.5, self.runs) * self.path_length * coverage / 100, 1).astype(int)
+            paths = self._random_walks(rng, sources, targets, lengths)
+            reports = []
+            for iteration, path in enumerate(paths):
+                visits = np.bincount(path, minlength=self.vertices + self.edges)
+                report = {'Seed': int(rng.integers(0, 2 ** 63)),
+                          'GenerationTime': int(len(path) * rng.uniform(0.1, 1.0) * (algorithm_number + 1)),
+                          'TestSuiteSize': len(path),
+                          'VertexVisits': dict(zip(vertex_names, visits[:self.vertices].tolist())),
+                          'EdgeVisits': dict(zip(edge_names, visits[self.vertices:].tolist()))}
+                reports.append(report)
+
+                (generator_dir / f'run_{iteration}_path.json').write_text(f'[{",".join(steps[path].tolist())}]')
+                (generator_dir / f'run_{iteration}_report.json').write_text(json.dumps(report, indent=2))
+                if self.test_results:
+                    (generator_dir / f'run_{iteration}_test_results.json').write_text(json.dumps(
+                        self._test_results(rng, visits, vertex_ids, edge_ids, len(path)), indent=2))
+
+            generators[name] = self._generator_report(reports, vertex_names, edge_names)
+
+        (benchmark_dir / 'report.json').write_text(json.dumps({
+            'Timestamp': 0,
+            'ModelPath': str(model_file.absolute()),
+            'GeneratorsPath': str((output / f'{self.name}.txt').absolute()),
+            'Output': str(benchmark_dir.absolute()),
+            'Unified': True,
+            'Verbose': False,
+            'BaseSeed': self.seed,
+            'Threads': 1,
+            'Runs': self.runs,
+            'MedianRuns': self.runs,
+            'KillAfter': 0,
+            'Model': {'ModelName': MODEL_NAME, 'ModelId': str(uuid.UUID(int=ids.getrandbits(128), version=4)),
+                      'VerticesCount': self.vertices, 'EdgesCount': self.edges, 'RequirementsCount': 0,
+                      'ActionsCount': 0, 'Properties': '{}'},
+            'Generators': generators}, indent=2))
+
+        return benchmark_dir, models_dir
+
+    def _random_walks(self, rng: np.random.Generator, sources: np.ndarray, targets: np.ndarray,
+                      lengths: np.ndarray) -> list[np.ndarray]:
+        """
+        Walk the model randomly from the first vertex, all walks at once
+
+        :param rng: The random generator
+        :param sources: The source vertex of every edge
+        :param targets: The target vertex of every edge
+        :param lengths: The number of elements of every walk
+        :return: The element codes of every walk, vertices are 0 to vertices - 1 and edges follow, alternating between
+                 vertices and edges
+        """
+        order = np.argsort(sources, kind='stable')
+        out_degrees = np.bincount(sources, minlength=self.vertices)
+        offsets = np.concatenate([[0], np.cumsum(out_degrees)[:-1]])
+
+        steps = int(lengths.max() + 1) // 2
+        vertices = np.zeros((len(lengths), steps), dtype=np.int64)
+        edges = np.zeros((len(lengths), max(steps - 1, 0)), dtype=np.int64)
+        current = vertices[:, 0]
+        for step in range(1, steps):
+            edge = order[offsets[current] + (rng.random(len(lengths)) * out_degrees[current]).astype(np.int64)]
+            edges[:, step - 1] = edge
+            current = targets[edge]
+            vertices[:, step] = current
+
+        walks = np.empty((len(lengths), steps * 2 - 1), dtype=np.int64)
+        walks[:, 0::2] = vertices
+        walks[:, 1::2] = edges + self.vertices
+        return [walk[:length] for walk, length in zip(walks, lengths)]
+
+    @staticmethod
+    def _test_results(rng: np.random.Generator, visits: np.ndarray, vertex_ids: list[str], edge_ids: list[str],
+                      length: int) -> dict:
+        """
+        Create the test results of a run, as written by GraphWalker's test execution
+        """
+        vertex_visits, edge_visits = visits[:len(vertex_ids)], visits[len(vertex_ids):]
+        visited_vertices, visited_edges = int(np.count_nonzero(vertex_visits)), int(np.count_nonzero(edge_visits))
+        test_duration = int(length * rng.uniform(50, 100))
+        return {'totalFailedNumberOfModels': 0,
+                'totalNotExecutedNumberOfModels': 0,
+                'totalNumberOfUnvisitedVertices': len(vertex_ids) - visited_vertices,
+                'verticesNotVisited': [{'modelName': 'UnifiedModel', 'vertexName': f'v_Vertex_{i}',
+                                        'vertexId': f'{MODEL_NAME}_{vertex_ids[i]}'}
+                                       for i in np.flatnonzero(vertex_visits == 0)],
+                'totalNumberOfModels': 1,
+                'totalCompletedNumberOfModels': 1,
+                'totalNumberOfVisitedEdges': visited_edges,
+                'totalIncompleteNumberOfModels': 0,
+                'edgesNotVisited': [{'modelName': 'UnifiedModel', 'edgeId': f'{MODEL_NAME}_{edge_ids[i]}',
+                                     'edgeName': f'e_Edge_{i}'} for i in np.flatnonzero(edge_visits == 0)],
+                'vertexCoverage': visited_vertices * 100 // len(vertex_ids),
+                'totalNumberOfEdges': len(edge_ids),
+                'totalNumberOfVisitedVertices': visited_vertices,
+                'edgeCoverage': visited_edges * 100 // len(edge_ids),
+                'totalNumberOfVertices': len(vertex_ids),
+                'totalNumberOfUnvisitedEdges': len(edge_ids) - visited_edges,
+                'testDuration': test_duration,
+                'driverTimeSpentWaiting': int(test_duration * rng.uniform(0.2, 0.6))}
+
+    @staticmethod
+    def _generator_report(reports: list[dict], vertex_names: list[str], edge_names: list[str]) -> dict:
+        """
+        Create the report of a generator from the reports of its runs, averages are rounded down as GraphWalker does
+        """
+        runs = len(reports)
+        generation_times = [report['GenerationTime'] for report in reports]
+        test_suite_sizes = [report['TestSuiteSize'] for report in reports]
+        vertex_visits = np.array([list(report['VertexVisits'].values()) for report in reports])
+        edge_visits = np.array([list(report['EdgeVisits'].values()) for report in reports])
+        unvisited_vertices = int(np.sum(vertex_visits == 0))
+        unvisited_edges = int(np.sum(edge_visits == 0))
+        return {'TotalGenerationTime': sum(generation_times),
+                'TotalTestSuiteSize': sum(test_suite_sizes),
+                'AverageGenerationTime': sum(generation_times) // runs,
+                'AverageTestSuiteSize': sum(test_suite_sizes) // runs,
+                'MinGenerationTime': min(generation_times),
+                'MaxGenerationTime': max(generation_times),
+                'MinTestSuiteSize': min(test_suite_sizes),
+                'MaxTestSuiteSize': max(test_suite_sizes),
+                'TotalVertexVisits': int(vertex_visits.sum()),
+                'TotalEdgeVisits': int(edge_visits.sum()),
+                'AverageVertexVisits': int(vertex_visits.sum()) // runs,
+                'AverageEdgeVisits': int(edge_visits.sum()) // runs,
+                'TotalUnvisitedVertices': unvisited_vertices,
+                'TotalUnvisitedEdges': unvisited_edges,
+                'AverageUnvisitedVertices': unvisited_vertices // runs,
+                'AverageUnvisitedEdges': unvisited_edges // runs,
+                'TotalVertexVisitsIndividual': dict(zip(vertex_names, vertex_visits.sum(axis=0).tolist())),
+                'TotalEdgeVisitsIndividual': dict(zip(edge_names, edge_visits.sum(axis=0).tolist())),
+                'AverageVertexVisitsIndividual': dict(zip(vertex_names, (vertex_visits.sum(axis=0) // runs).tolist())),
+                'AverageEdgeVisitsIndividual': dict(zip(edge_names, (edge_visits.sum(axis=0) // runs).tolist()))}
+
+    def _model(self, vertex_ids: list[str], edge_ids: list[str], sources: np.ndarray, targets: np.ndarray) -> dict:
+        """
+        Create the GraphWalker model file of the benchmark's model
+        """
+        return {'models': [{'name': MODEL_NAME,
+                            'id': MODEL_NAME,
+                            'generator': f'random({self.stop_condition.replace("Coverage", "_coverage").lower()}(100))',
+                            'startElementId': vertex_ids[0],
+                            'vertices': [{'id': vertex_id, 'name': f'v_Vertex_{i}'}
+                                         for i, vertex_id in enumerate(vertex_ids)],
+                            'edges': [{'id': edge_id, 'name': f'e_Edge_{i}', 'sourceVertexId': vertex_ids[source],
+                                       'targetVertexId': vertex_ids[target]}
+                                      for i, (edge_id, source, target) in
+                                      enumerate(zip(edge_ids, sources.tolist(), targets.tolist()))]}],
+                'selectedModelIndex': 0,
+                'selectedElementId': vertex_ids[0]}
@@ -1,11 +1,17 @@
 from io import BytesIO
-from typing import Callable
+from typing import Callable, Iterator
 
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
 
 from models.benchmark import Benchmark
 from models.benchmark_generator import BenchmarkGenerator
+from statistics.coverage_curves import CoverageCurves
+from utils.benchmark_name_parser import group_like, series_of
+from utils.parallel import parallel_imap
+from utils.profiler import Measurement, Profiler, measure
 
 
 class BenchmarkPlotter:
@@ -13,9 +19,10 @@ class BenchmarkPlotter:
     A class used to plot the benchmark results
     """
     benchmark: Benchmark
+    grouped_generators: dict[str, list[BenchmarkGenerator]]
 
     @staticmethod
-    def get_plot_functions() -> dict[str, Callable[[dict[str, list[BenchmarkGenerator]]], None]]:
+    def get_plot_functions() -> dict[str, Callable[[dict[str, list[BenchmarkGenerator]]], Figure]]:
         """
         Get the available plot functions
 
@@ -35,7 +42,7 @@ class BenchmarkPlotter:
                 'Average vs Minimum Size': BenchmarkPlotter.plot_average_vs_minimum_size}
 
     @staticmethod
-    def get_per_coverage_plot_functions() -> dict[str, Callable[[dict[str, list[BenchmarkGenerator]], int], None]]:
+    def get_per_coverage_plot_functions() -> dict[str, Callable[[dict[str, list[BenchmarkGenerator]], int], Figure]]:
         """
         Get the available plot functions that are run per coverage value
 
@@ -48,7 +55,7 @@ class BenchmarkPlotter:
 
     @staticmethod
     def get_test_execution_plot_functions() -> dict[
-        str, Callable[[Benchmark, dict[str, list[BenchmarkGenerator]]], None]]:
+        str, Callable[[Benchmark, dict[str, list[BenchmarkGenerator]]], Figure]]:
         """
         Get the available plot functions that are run per coverage value
 
@@ -59,38 +66,40 @@ class BenchmarkPlotter:
                 'Maximum Test Execution Time': BenchmarkPlotter.plot_maximum_test_execution_time}
 
     @staticmethod
-    def create_plots(benchmark: Benchmark, grouped_generators: dict[str, list[BenchmarkGenerator]],
-                     show: bool = False) -> dict[str, BytesIO]:
+    def get_per_coverage_path_plot_functions() -> dict[
+        str, Callable[[Benchmark, dict[str, list[BenchmarkGenerator]], int], Figure]]:
         """
-        Plot the benchmark results
+        Get the available plot functions that are run per coverage value on the paths of the runs
+
+        :return: a dictionary with the available plot functions
+        """
+        return {'Vertex Coverage over Steps': BenchmarkPlotter.plot_vertex_coverage_curves,
+                'Edge Coverage over Steps': BenchmarkPlotter.plot_edge_coverage_curves}
+
+    @staticmethod
+    def get_plot_tasks(benchmark: Benchmark, grouped_generators: dict[str, list[BenchmarkGenerator]]) -> list[
+        tuple[str, Callable, bool, tuple]]:
+        """
+        Get every plot to create for a benchmark, in output order
 
         :param benchmark: The benchmark to plot
         :param grouped_generators: The generator benchmarks to plot, grouped by generator name
-        :param show: bool: Whether to show the plots
+        :return: A list of (plot name, plot function, whether the function takes the benchmark, extra arguments)
         """
-        BenchmarkPlotter.benchmark = benchmark
-        plt.close()
-        plots: dict[str, BytesIO] = {}
+        tasks = []
 
         # General bar plots
         for plot_function_name, plot_function in BenchmarkPlotter.get_plot_functions().items():
-            plt.close()
-            plot_function(grouped_generators)
-            if show:
-                plt.show()
-            plots[plot_function_name] = BenchmarkPlotter.save_plot_bytesio()
+            tasks.append((plot_function_name, plot_function, False, ()))
 
         # Test execution bar plots
-        if all([run_group.successful_runs for run_group in benchmark.run_groups]):
+        if all(run_group.has_successful_runs for run_group in benchmark.run_groups):
             for plot_function_name, plot_function in BenchmarkPlotter.get_test_execution_plot_functions().items():
-                plt.close()
-                plot_function(benchmark, grouped_generators)
-                if show:
-                    plt.show()
-                plots[plot_function_name] = BenchmarkPlotter.save_plot_bytesio()
+                tasks.append((plot_function_name, plot_function, True, ()))
 
         # Prepare coverage values
         coverage_values = []
+        grouped_generators = BenchmarkPlotter._coverage_generators(grouped_generators)
         for generator_group in grouped_generators:
             for generator in grouped_generators[generator_group]:
                 if generator.stop_coverage not in coverage_values:
@@ -101,19 +110,147 @@ class BenchmarkPlotter:
         # Per coverage plots
         for plot_function_name, plot_function in BenchmarkPlotter.get_per_coverage_plot_functions().items():
             for coverage_value in coverage_values:
-                plt.close()
-                plot_function(grouped_generators, coverage_value)
-                if show:
-                    plt.show()
-                plots[f'{plot_function_name} - {coverage_value}%'] = BenchmarkPlotter.save_plot_bytesio()
+                tasks.append((f'{plot_function_name} - {coverage_value}%', plot_function, False, (coverage_value,)))
+
+        # Per coverage plots of the runs' paths
+        for plot_function_name, plot_function in BenchmarkPlotter.get_per_coverage_path_plot_functions().items():
+            for coverage_value in coverage_values:
+                tasks.append((f'{plot_function_name} - {coverage_value}%', plot_function, True, (coverage_value,)))
+
+        return tasks
+
+    @staticmethod
+    def create_plots(benchmark: Benchmark, grouped_generators: dict[str, list[BenchmarkGenerator]],
+                     show: bool = False, jobs: int = 1) -> dict[str, BytesIO]:
+        """
+        Plot the benchmark results
+
+        :param benchmark: The benchmark to plot
+        :param grouped_generators: The generator benchmarks to plot, grouped by generator name
+        :param show: bool: Whether to show the plots, which renders them serially
+        :param jobs: Number of worker processes to render the plots in, 0 or less to use every available CPU
+        """
+        return {name: BytesIO(png) for name, png in
+                BenchmarkPlotter.iter_plots(benchmark, grouped_generators, show=show, jobs=jobs)}
+
+    @staticmethod
+    def iter_plots(benchmark: Benchmark, grouped_generators: dict[str, list[BenchmarkGenerator]],
+                   show: bool = False, jobs: int = 1,
+                   tasks: list[tuple[str, Callable, bool, tuple]] = None,
+                   profiler: Profiler = None) -> Iterator[tuple[str, bytes]]:
+        """
+        Plot the benchmark results, yielding every plot as soon as it is rendered so it does not need to be kept in
+        memory
+
+        :param benchmark: The benchmark to plot
+        :param grouped_generators: The generator benchmarks to plot, grouped by generator name
+        :param show: bool: Whether to show the plots, which renders them serially
+        :param jobs: Number of worker processes to render the plots in, 0 or less to use every available CPU
+        :param tasks: The plot tasks to render, default every task of get_plot_tasks
+        :param profiler: The profiler to record the time of every plot function and PNG encoding in, measured by the
+                         worker that rendered the plot, or None to not profile
+        :return: An iterator of (plot name, PNG bytes), in the order of the tasks
+        """
+        grouped_generators = BenchmarkPlotter._coverage_generators(grouped_generators)
+        if tasks is None:
+            tasks = BenchmarkPlotter.get_plot_tasks(benchmark, grouped_generators)
+
+        if show:
+            BenchmarkPlotter._initialize_worker(benchmark, grouped_generators)
+            for task in tasks:
+                fig = BenchmarkPlotter._create_task_figure(task)
+                BenchmarkPlotter._show_figure(fig)
+                yield task[0], BenchmarkPlotter.save_plot_bytesio(fig).getvalue()
+            return
+
+        if profiler is not None:
+            rendered = parallel_imap(BenchmarkPlotter._render_task_profiled, tasks, jobs,
+                                     initializer=BenchmarkPlotter._initialize_worker,
+                                     initargs=(benchmark, grouped_generators))
+            for task, (png, timings) in zip(tasks, rendered):
+                profiler.record(task[0], timings['total'], function=task[1])
+                profiler.record('figure', timings['figure'], parent=task[0])
+                profiler.record('png', timings['png'], parent=task[0])
+                yield task[0], png
+            return
+
+        rendered = parallel_imap(BenchmarkPlotter._render_task, tasks, jobs,
+                                 initializer=BenchmarkPlotter._initialize_worker,
+                                 initargs=(benchmark, grouped_generators))
+        for task, png in zip(tasks, rendered):
+            yield task[0], png
+
+    @staticmethod
+    def _coverage_generators(grouped_generators: dict[str, list[BenchmarkGenerator]]) \
+            -> dict[str, list[BenchmarkGenerator]]:
+        """
+        Leave out the generators whose stop condition has no coverage, as the plots are drawn over the stop coverage
+        """
+        grouped_generators = {algorithm: [generator for generator in generators if generator.stop_coverage is not None]
+                              for algorithm, generators in grouped_generators.items()}
+        return {algorithm: generators for algorithm, generators in grouped_generators.items() if generators}
+
+    @staticmethod
+    def _initialize_worker(benchmark: Benchmark, grouped_generators: dict[str, list[BenchmarkGenerator]]):
+        """
+        Set the benchmark and generators the plot tasks of this process are created for
+        """
+        BenchmarkPlotter.benchmark = benchmark
+        BenchmarkPlotter.grouped_generators = grouped_generators
+
+    @staticmethod
+    def _create_task_figure(task: tuple[str, Callable, bool, tuple]) -> Figure:
+        """
+        Create the figure of a plot task, see get_plot_tasks
+        """
+        _, plot_function, takes_benchmark, arguments = task
+        if takes_benchmark:
+            return plot_function(BenchmarkPlotter.benchmark, BenchmarkPlotter.grouped_generators, *arguments)
+        return plot_function(BenchmarkPlotter.grouped_generators, *arguments)
+
+    @staticmethod
+    def _render_task(task: tuple[str, Callable, bool, tuple]) -> bytes:
+        """
+        Create the figure of a plot task and render it to PNG
+        """
+        return BenchmarkPlotter.save_plot_bytesio(BenchmarkPlotter._create_task_figure(task)).getvalue()
+
+    @staticmethod
+    def _render_task_profiled(task: tuple[str, Callable, bool, tuple]) -> tuple[bytes, dict[str, dict]]:
+        """
+        Create the figure of a plot task and render it to PNG, measuring both steps
+
+        :return: The PNG bytes, and the "figure", "png" and "total" measurements, see Measurement.to_dict
+        """
+        with Measurement() as total:
+            fig, figure_timings = measure(BenchmarkPlotter._create_task_figure, task)
+            png, png_timings = measure(BenchmarkPlotter.save_plot_bytesio, fig)
+        return png.getvalue(), {'figure': figure_timings, 'png': png_timings, 'total': total.to_dict()}
+
+    @staticmethod
+    def _create_figure() -> tuple[Figure, Axes]:
+        """
+        Create a figure with a single axis, independent of pyplot's global state
+        """
+        fig = Figure()
+        ax = fig.subplots()
+        return fig, ax
 
-        return plots
+    @staticmethod
+    def _show_figure(fig: Figure):
+        """
+        Show a figure in an interactive pyplot window
+        """
+        manager = plt.figure().canvas.manager
+        manager.canvas.figure = fig
+        fig.set_canvas(manager.canvas)
+        plt.show()
 
     @staticmethod
     def _post_process_plot(fig, ax):
         ax.legend()
-        plt.xticks(rotation=45)
-        plt.tight_layout()
+        ax.tick_params(axis='x', labelrotation=45)
+        fig.tight_layout()
 
     @staticmethod
     def _plot_bars(fig, ax, grouped_generators: dict[str, list[BenchmarkGenerator]],
@@ -156,20 +293,16 @@ class BenchmarkPlotter:
         group_count = len(grouped_generators)
         bar_width = 6 / group_count
 
-        grouped_run_groups = {}
-        for run_group in benchmark.run_groups_sorted:
-            if run_group.algorithm not in grouped_generators.keys():
-                continue    # Skip algorithms that are not in the grouped_generators
-            if run_group.algorithm not in grouped_run_groups:
-                grouped_run_groups[run_group.algorithm] = []
-            grouped_run_groups[run_group.algorithm].append(run_group)
+        # Skip the run groups whose generators are not in the grouped_generators
+        grouped_run_groups = group_like((run_group for run_group in benchmark.run_groups_sorted
+                                         if run_group.stop_coverage is not None), grouped_generators)
 
-        for i, algorithm in enumerate(grouped_run_groups):
+        for i, series in enumerate(grouped_run_groups):
             coverage_values = [run_group.stop_coverage + i * bar_width for run_group in
-                               grouped_run_groups[algorithm]]
-            property_values = [value_lambda(run_group) for run_group in grouped_run_groups[algorithm]]
+                               grouped_run_groups[series]]
+            property_values = [value_lambda(run_group) for run_group in grouped_run_groups[series]]
 
-            ax.bar(coverage_values, property_values, label=algorithm, width=bar_width, align='center')
+            ax.bar(coverage_values, property_values, label=series, width=bar_width, align='center')
 
             if add_trend_line:
                 coefficients = np.polyfit(coverage_values, property_values, 3)
@@ -204,13 +337,13 @@ class BenchmarkPlotter:
         BenchmarkPlotter._post_process_plot(fig, ax)
 
     @staticmethod
-    def plot_total_time(grouped_generators: dict[str, list[BenchmarkGenerator]]):
+    def plot_total_time(grouped_generators: dict[str, list[BenchmarkGenerator]]) -> Figure:
         """
         Plot the total time taken for each generator in the benchmark
 
         :param grouped_generators: The generator benchmarks to plot, grouped by generator name
         """
-        fig, ax = plt.subplots()
+        fig, ax = BenchmarkPlotter._create_figure()
 
         ax.set_title('Total generation time per generator by coverage value')
         ax.set_xlabel('Coverage (%)')
@@ -218,14 +351,16 @@ class BenchmarkPlotter:
 
         BenchmarkPlotter._plot_bars(fig, ax, grouped_generators, lambda generator: generator.total_generation_time)
 
+        return fig
+
     @staticmethod
-    def plot_total_size(grouped_generators: dict[str, list[BenchmarkGenerator]]):
+    def plot_total_size(grouped_generators: dict[str, list[BenchmarkGenerator]]) -> Figure:
         """
         Plot the total size of each generator's path in the benchmark
 
         :param grouped_generators: The generator benchmarks to plot, grouped by generator name
         """
-        fig, ax = plt.subplots()
+        fig, ax = BenchmarkPlotter._create_figure()
 
         ax.set_title('Total test suite size per generator by coverage value')
         ax.set_xlabel('Coverage (%)')
@@ -233,14 +368,16 @@ class BenchmarkPlotter:
 
         BenchmarkPlotter._plot_bars(fig, ax, grouped_generators, lambda generator: generator.total_test_suite_size)
 
+        return fig
+
     @staticmethod
-    def plot_average_time(grouped_generators: dict[str, list[BenchmarkGenerator]]):
+    def plot_average_time(grouped_generators: dict[str, list[BenchmarkGenerator]]) -> Figure:
         """
         Plot the average time taken for each generator in the benchmark
 
         :param grouped_generators: The generator benchmarks to plot, grouped by generator name
         """
-        fig, ax = plt.subplots()
+        fig, ax = BenchmarkPlotter._create_figure()
 
         ax.set_title('Average generation time per generator by coverage value')
         ax.set_xlabel('Coverage (%)')
@@ -248,14 +385,16 @@ class BenchmarkPlotter:
 
         BenchmarkPlotter._plot_bars(fig, ax, grouped_generators, lambda generator: generator.average_generation_time)
 
+        return fig
+
     @staticmethod
-    def plot_average_size(grouped_generators: dict[str, list[BenchmarkGenerator]]):
+    def plot_average_size(grouped_generators: dict[str, list[BenchmarkGenerator]]) -> Figure:
         """
         Plot the average size of each generator's path in the benchmark
 
         :param grouped_generators: The generator benchmarks to plot, grouped by generator name
         """
-        fig, ax = plt.subplots()
+        fig, ax = BenchmarkPlotter._create_figure()
 
         ax.set_title('Average test suite size per generator by coverage value')
         ax.set_xlabel('Coverage (%)')
@@ -263,14 +402,16 @@ class BenchmarkPlotter:
 
         BenchmarkPlotter._plot_bars(fig, ax, grouped_generators, lambda generator: generator.average_test_suite_size)
 
+        return fig
+
     @staticmethod
-    def plot_minimum_time(grouped_generators: dict[str, list[BenchmarkGenerator]]):
+    def plot_minimum_time(grouped_generators: dict[str, list[BenchmarkGenerator]]) -> Figure:
         """
         Plot the minimum time taken for each generator in the benchmark
 
         :param grouped_generators: The generator benchmarks to plot, grouped by generator name
         """
-        fig, ax = plt.subplots()
+        fig, ax = BenchmarkPlotter._create_figure()
 
         ax.set_title('Minimum generation time per generator by coverage value')
         ax.set_xlabel('Coverage (%)')
@@ -278,14 +419,16 @@ class BenchmarkPlotter:
 
         BenchmarkPlotter._plot_bars(fig, ax, grouped_generators, lambda generator: generator.min_generation_time)
 
+        return fig
+
     @staticmethod
-    def plot_maximum_time(grouped_generators: dict[str, list[BenchmarkGenerator]]):
+    def plot_maximum_time(grouped_generators: dict[str, list[BenchmarkGenerator]]) -> Figure:
         """
         Plot the maximum time taken for each generator in the benchmark
 
         :param grouped_generators: The generator benchmarks to plot, grouped by generator name
         """
-        fig, ax = plt.subplots()
+        fig, ax = BenchmarkPlotter._create_figure()
 
         ax.set_title('Maximum generation time per generator by coverage value')
         ax.set_xlabel('Coverage (%)')
@@ -293,14 +436,16 @@ class BenchmarkPlotter:
 
         BenchmarkPlotter._plot_bars(fig, ax, grouped_generators, lambda generator: generator.max_generation_time)
 
+        return fig
+
     @staticmethod
-    def plot_minimum_size(grouped_generators: dict[str, list[BenchmarkGenerator]]):
+    def plot_minimum_size(grouped_generators: dict[str, list[BenchmarkGenerator]]) -> Figure:
         """
         Plot the minimum size of each generator's path in the benchmark
 
         :param grouped_generators: The generator benchmarks to plot, grouped by generator name
         """
-        fig, ax = plt.subplots()
+        fig, ax = BenchmarkPlotter._create_figure()
 
         ax.set_title('Minimum test suite size per generator by coverage value')
         ax.set_xlabel('Coverage (%)')
@@ -308,14 +453,16 @@ class BenchmarkPlotter:
 
         BenchmarkPlotter._plot_bars(fig, ax, grouped_generators, lambda generator: generator.min_test_suite_size)
 
+        return fig
+
     @staticmethod
-    def plot_maximum_size(grouped_generators: dict[str, list[BenchmarkGenerator]]):
+    def plot_maximum_size(grouped_generators: dict[str, list[BenchmarkGenerator]]) -> Figure:
         """
         Plot the maximum size of each generator's path in the benchmark
 
         :param grouped_generators: The generator benchmarks to plot, grouped by generator name
         """
-        fig, ax = plt.subplots()
+        fig, ax = BenchmarkPlotter._create_figure()
 
         ax.set_title('Maximum test suite size per generator by coverage value')
         ax.set_xlabel('Coverage (%)')
@@ -323,14 +470,16 @@ class BenchmarkPlotter:
 
         BenchmarkPlotter._plot_bars(fig, ax, grouped_generators, lambda generator: generator.max_test_suite_size)
 
+        return fig
+
     @staticmethod
-    def plot_max_minus_min_size(grouped_generators: dict[str, list[BenchmarkGenerator]]):
+    def plot_max_minus_min_size(grouped_generators: dict[str, list[BenchmarkGenerator]]) -> Figure:
         """
         Plot the difference between the maximum and minimum size of each generator's path in the benchmark
 
         :param grouped_generators: The generator benchmarks to plot, grouped by generator name
         """
-        fig, ax = plt.subplots()
+        fig, ax = BenchmarkPlotter._create_figure()
 
         ax.set_title('Difference between maximum and minimum test suite size\nper generator by coverage value')
         ax.set_xlabel('Coverage (%)')
@@ -339,14 +488,16 @@ class BenchmarkPlotter:
         BenchmarkPlotter._plot_bars(fig, ax, grouped_generators,
                                     lambda generator: generator.max_test_suite_size - generator.min_test_suite_size)
 
+        return fig
+
     @staticmethod
-    def plot_max_minus_min_time(grouped_generators: dict[str, list[BenchmarkGenerator]]):
+    def plot_max_minus_min_time(grouped_generators: dict[str, list[BenchmarkGenerator]]) -> Figure:
         """
         Plot the difference between the maximum and minimum time of each generator's path in the benchmark
 
         :param grouped_generators: The generator benchmarks to plot, grouped by generator name
         """
-        fig, ax = plt.subplots()
+        fig, ax = BenchmarkPlotter._create_figure()
 
         ax.set_title('Difference between maximum and minimum generation time\nper generator by coverage value')
         ax.set_xlabel('Coverage (%)')
@@ -355,14 +506,16 @@ class BenchmarkPlotter:
         BenchmarkPlotter._plot_bars(fig, ax, grouped_generators,
                                     lambda generator: generator.max_generation_time - generator.min_generation_time)
 
+        return fig
+
     @staticmethod
-    def plot_coverage_vs_time(grouped_generators: dict[str, list[BenchmarkGenerator]]):
+    def plot_coverage_vs_time(grouped_generators: dict[str, list[BenchmarkGenerator]]) -> Figure:
         """
         Plot the coverage vs time for each generator in the benchmark
 
         :param grouped_generators: The generator benchmarks to plot, grouped by generator name
         """
-        fig, ax = plt.subplots()
+        fig, ax = BenchmarkPlotter._create_figure()
 
         ax.set_title('Coverage vs Generation time per generator')
         ax.set_xlabel('Coverage (%)')
@@ -370,8 +523,11 @@ class BenchmarkPlotter:
 
         BenchmarkPlotter._plot_lines(fig, ax, grouped_generators, lambda generator: generator.total_generation_time)
 
+        return fig
+
     @staticmethod
-    def plot_average_size_divided_by_average_time(grouped_generators: dict[str, list[BenchmarkGenerator]]):
+    def plot_average_size_divided_by_average_time(
+            grouped_generators: dict[str, list[BenchmarkGenerator]]) -> Figure:
         """
         Plot the average size of each generator's path divided by the average time taken for each generator in the benchmark
 
@@ -379,7 +535,7 @@ class BenchmarkPlotter:
 
         :param grouped_generators: The generator benchmarks to plot, grouped by generator name
         """
-        fig, ax = plt.subplots()
+        fig, ax = BenchmarkPlotter._create_figure()
 
         ax.set_title('Average test suite size divided by\naverage generation time per generator by coverage value')
         ax.set_xlabel('Coverage (%)')
@@ -388,121 +544,136 @@ class BenchmarkPlotter:
         BenchmarkPlotter._plot_bars(fig, ax, grouped_generators, lambda
             generator: generator.average_test_suite_size / generator.average_generation_time)
 
+        return fig
+
     @staticmethod
     def _plot_histogram(fig, ax, grouped_generators: dict[str, list[BenchmarkGenerator]],
-                        property_lambda: Callable[[BenchmarkGenerator], dict], coverage_value):
+                        property_lambda: Callable[[BenchmarkGenerator], np.ndarray], coverage_value):
         """
         Plot the histogram of a property for each generator in the benchmark, for a specific coverage value
 
         :param fig: The figure to plot on
         :param ax: The axis to plot on
         :param grouped_generators: The generator benchmarks to plot, grouped by generator name
-        :param property_lambda: The lambda function to get the property to use
+        :param property_lambda: The lambda function to get the visit vector to use, see BenchmarkGenerator
         :param coverage_value: The coverage value to plot the histogram for
         """
+        # The elements are ordered by the visits of the first generator plotted, from most to least visited
+        positions = None
         for generator_group in grouped_generators:
             for i, generator in enumerate(grouped_generators[generator_group]):
                 if generator.stop_coverage != coverage_value:
                     continue
 
-                items = [item[0] for item in
-                         sorted(property_lambda(generator).items(), key=lambda x: x[1], reverse=True)]
-                item_visits = [int(item[1]) for item in
-                               sorted(property_lambda(generator).items(), key=lambda x: x[1], reverse=True)]
-                ax.hist(items, weights=item_visits, bins=len(items), label=generator_group, alpha=0.5)
+                item_visits = property_lambda(generator)
+                if positions is None:
+                    positions = np.empty(len(item_visits), dtype=np.intp)
+                    positions[np.argsort(-item_visits, kind='stable')] = np.arange(len(item_visits))
+                ax.hist(positions, weights=item_visits, bins=len(item_visits), label=generator_group, alpha=0.5)
 
         ax.set_xticks([])
         BenchmarkPlotter._post_process_plot(fig, ax)
 
     @staticmethod
-    def plot_histogram_total_visited_vertices(grouped_generators: dict[str, list[BenchmarkGenerator]], coverage_value):
+    def plot_histogram_total_visited_vertices(grouped_generators: dict[str, list[BenchmarkGenerator]],
+                                              coverage_value) -> Figure:
         """
         Plot the histogram of visited vertices for each generator in the benchmark, for a specific coverage value (since this would otherwise be hard to read)
 
         :param grouped_generators: The generator benchmarks to plot, grouped by generator name
         :param coverage_value: The coverage value to plot the histogram for
         """
-        fig, ax = plt.subplots()
+        fig, ax = BenchmarkPlotter._create_figure()
 
         ax.set_title(f'Vertex total visit count histogram for\ncoverage value {coverage_value}%')
         ax.set_xlabel(f"Vertex")
         ax.set_ylabel('Visit Count')
 
         BenchmarkPlotter._plot_histogram(fig, ax, grouped_generators,
-                                         lambda generator: generator.total_vertex_visits_individual, coverage_value)
+                                         lambda generator: generator.total_vertex_visits_vector, coverage_value)
+
+        return fig
 
     @staticmethod
-    def plot_histogram_total_visited_edges(grouped_generators: dict[str, list[BenchmarkGenerator]], coverage_value):
+    def plot_histogram_total_visited_edges(grouped_generators: dict[str, list[BenchmarkGenerator]],
+                                           coverage_value) -> Figure:
         """
         Plot the histogram of visited edges for each generator in the benchmark, for a specific coverage value (since this would otherwise be hard to read)
 
         :param grouped_generators: The generator benchmarks to plot, grouped by generator name
         :param coverage_value: The coverage value to plot the histogram for
         """
-        fig, ax = plt.subplots()
+        fig, ax = BenchmarkPlotter._create_figure()
 
         ax.set_title(f'Edge total visit count histogram for\ncoverage value {coverage_value}%')
         ax.set_xlabel(f"Edge")
         ax.set_ylabel('Visit Count')
 
         BenchmarkPlotter._plot_histogram(fig, ax, grouped_generators,
-                                         lambda generator: generator.total_edge_visits_individual, coverage_value)
+                                         lambda generator: generator.total_edge_visits_vector, coverage_value)
+
+        return fig
 
     @staticmethod
     def plot_histogram_average_visited_vertices(grouped_generators: dict[str, list[BenchmarkGenerator]],
-                                                coverage_value):
+                                                coverage_value) -> Figure:
         """
         Plot the histogram of visited vertices for each generator in the benchmark, for a specific coverage value (since this would otherwise be hard to read)
 
         :param grouped_generators: The generator benchmarks to plot, grouped by generator name
         :param coverage_value: The coverage value to plot the histogram for
         """
-        fig, ax = plt.subplots()
+        fig, ax = BenchmarkPlotter._create_figure()
 
         ax.set_title(f'Vertex average visit count histogram for\ncoverage value {coverage_value}%')
         ax.set_xlabel(f"Vertex")
         ax.set_ylabel('Visit Count')
 
         BenchmarkPlotter._plot_histogram(fig, ax, grouped_generators,
-                                         lambda generator: generator.average_vertex_visits_individual, coverage_value)
+                                         lambda generator: generator.average_vertex_visits_vector, coverage_value)
+
+        return fig
 
     @staticmethod
-    def plot_histogram_average_visited_edges(grouped_generators: dict[str, list[BenchmarkGenerator]], coverage_value):
+    def plot_histogram_average_visited_edges(grouped_generators: dict[str, list[BenchmarkGenerator]],
+                                             coverage_value) -> Figure:
         """
         Plot the histogram of visited edges for each generator in the benchmark, for a specific coverage value (since this would otherwise be hard to read)
 
         :param grouped_generators: The generator benchmarks to plot, grouped by generator name
         :param coverage_value: The coverage value to plot the histogram for
         """
-        fig, ax = plt.subplots()
+        fig, ax = BenchmarkPlotter._create_figure()
 
         ax.set_title(f'Edge average visit count histogram for\ncoverage value {coverage_value}%')
         ax.set_xlabel(f"Edge")
         ax.set_ylabel('Visit Count')
 
         BenchmarkPlotter._plot_histogram(fig, ax, grouped_generators,
-                                         lambda generator: generator.average_edge_visits_individual, coverage_value)
+                                         lambda generator: generator.average_edge_visits_vector, coverage_value)
+
+        return fig
 
     @staticmethod
-    def plot_average_vertex_percentage_total_visits(grouped_generators: dict[str, list[BenchmarkGenerator]]):
+    def plot_average_vertex_percentage_total_visits(grouped_generators: dict[str, list[BenchmarkGenerator]]) -> Figure:
         """
         Plot the percentage of unique vertex visits in an average traversal (e.g. 78% of vertices visited)
 
         :param grouped_generators: The generator benchmarks to plot, grouped by generator name
         """
-        fig, ax = plt.subplots()
+        fig, ax = BenchmarkPlotter._create_figure()
 
         ax.set_title('Percentage of unique vertices visited\nin an average traversal')
         ax.set_xlabel('Coverage (%)')
         ax.set_ylabel('Average Percentage (%)')
 
-        BenchmarkPlotter._plot_bars(fig, ax, grouped_generators, lambda generator: [1 for vertex_visits in
-                                                                                    generator.average_vertex_visits_individual.values()
-                                                                                    if vertex_visits != 0].count(
-            1) / BenchmarkPlotter.benchmark.report.model.vertices * 100)
+        BenchmarkPlotter._plot_bars(fig, ax, grouped_generators, lambda generator: np.count_nonzero(
+            generator.average_vertex_visits_vector) / BenchmarkPlotter.benchmark.report.model.vertices * 100)
+
+        return fig
 
     @staticmethod
-    def plot_average_edge_percentage_total_visits(grouped_generators: dict[str, list[BenchmarkGenerator]]):
+    def plot_average_edge_percentage_total_visits(grouped_generators: dict[str, list[BenchmarkGenerator]]) -> Figure:
         """
         Plot the percentage of unique edge visits in an average traversal (e.g. 78% of edges visited)
 
@@ -510,25 +681,25 @@ class BenchmarkPlotter:
 
         :remark: This will not reach the proper coverage percentage, as some edges' average visit count is < 0.5, and rounded to a long by the generator
         """
-        fig, ax = plt.subplots()
+        fig, ax = BenchmarkPlotter._create_figure()
 
         ax.set_title('Percentage of unique edges visited\nin an average traversal')
         ax.set_xlabel('Coverage (%)')
         ax.set_ylabel('Average Percentage (%)')
-        BenchmarkPlotter._plot_bars(fig, ax, grouped_generators, lambda generator: [1 for edge_visits in
-                                                                                    generator.average_edge_visits_individual.values()
-                                                                                    if edge_visits != 0].count(
-            1) / BenchmarkPlotter.benchmark.report.model.edges * 100)
+        BenchmarkPlotter._plot_bars(fig, ax, grouped_generators, lambda generator: np.count_nonzero(
+            generator.average_edge_visits_vector) / BenchmarkPlotter.benchmark.report.model.edges * 100)
+
+        return fig
 
     @staticmethod
-    def plot_average_vs_minimum_time(grouped_generators: dict[str, list[BenchmarkGenerator]]):
+    def plot_average_vs_minimum_time(grouped_generators: dict[str, list[BenchmarkGenerator]]) -> Figure:
         """
         Plot the difference between the average and minimum time of each generator's path in the benchmark,
         to give an indication of how optimistic a minimum time is
 
         :param grouped_generators: The generator benchmarks to plot, grouped by generator name
         """
-        fig, ax = plt.subplots()
+        fig, ax = BenchmarkPlotter._create_figure()
 
         ax.set_title('Average generation time compared to minimum generation time\nper generator by coverage value')
         ax.set_xlabel('Coverage (%)')
@@ -537,15 +708,17 @@ class BenchmarkPlotter:
         BenchmarkPlotter._plot_bars(fig, ax, grouped_generators,
                                     lambda generator: generator.average_generation_time - generator.min_generation_time)
 
+        return fig
+
     @staticmethod
-    def plot_average_vs_minimum_size(grouped_generators: dict[str, list[BenchmarkGenerator]]):
+    def plot_average_vs_minimum_size(grouped_generators: dict[str, list[BenchmarkGenerator]]) -> Figure:
         """
         Plot the difference between the average and minimum size of each generator's path in the benchmark,
         to give an indication of how optimistic a minimum size is
 
         :param grouped_generators: The generator benchmarks to plot, grouped by generator name
         """
-        fig, ax = plt.subplots()
+        fig, ax = BenchmarkPlotter._create_figure()
 
         ax.set_title('Average test suite size compared to minimum test suite size\nper generator by coverage value')
         ax.set_xlabel('Coverage (%)')
@@ -554,15 +727,18 @@ class BenchmarkPlotter:
         BenchmarkPlotter._plot_bars(fig, ax, grouped_generators,
                                     lambda generator: generator.average_test_suite_size - generator.min_test_suite_size)
 
+        return fig
+
     @staticmethod
-    def plot_average_test_execution_time(benchmark: Benchmark, grouped_generators: dict[str, list[BenchmarkGenerator]]):
+    def plot_average_test_execution_time(benchmark: Benchmark,
+                                         grouped_generators: dict[str, list[BenchmarkGenerator]]) -> Figure:
         """
         Plot the average time taken to execute a test suite
 
         :param benchmark: The benchmark object to get run information from
         :param grouped_generators: The generator benchmarks to plot, grouped by generator name, to use for filtering
         """
-        fig, ax = plt.subplots()
+        fig, ax = BenchmarkPlotter._create_figure()
 
         ax.set_title('Average test execution time per generator by coverage value')
         ax.set_xlabel('Coverage (%)')
@@ -571,15 +747,18 @@ class BenchmarkPlotter:
         BenchmarkPlotter._plot_bars_tests(fig, ax, benchmark, grouped_generators,
                                           lambda run_group: run_group.average_test_duration)
 
+        return fig
+
     @staticmethod
-    def plot_minimum_test_execution_time(benchmark: Benchmark, grouped_generators: dict[str, list[BenchmarkGenerator]]):
+    def plot_minimum_test_execution_time(benchmark: Benchmark,
+                                         grouped_generators: dict[str, list[BenchmarkGenerator]]) -> Figure:
         """
         Plot the minimum time taken to execute a test suite
 
         :param benchmark: The benchmark object to get run information from
         :param grouped_generators: The generator benchmarks to plot, grouped by generator name, to use for filtering
         """
-        fig, ax = plt.subplots()
+        fig, ax = BenchmarkPlotter._create_figure()
 
         ax.set_title('Minimum test execution time per generator by coverage value')
         ax.set_xlabel('Coverage (%)')
@@ -588,15 +767,18 @@ class BenchmarkPlotter:
         BenchmarkPlotter._plot_bars_tests(fig, ax, benchmark, grouped_generators,
                                           lambda run_group: run_group.minimum_test_duration)
 
+        return fig
+
     @staticmethod
-    def plot_maximum_test_execution_time(benchmark: Benchmark, grouped_generators: dict[str, list[BenchmarkGenerator]]):
+    def plot_maximum_test_execution_time(benchmark: Benchmark,
+                                         grouped_generators: dict[str, list[BenchmarkGenerator]]) -> Figure:
         """
         Plot the maximum time taken to execute a test suite
 
         :param benchmark: The benchmark object to get run information from
         :param grouped_generators: The generator benchmarks to plot, grouped by generator name, to use for filtering
         """
-        fig, ax = plt.subplots()
+        fig, ax = BenchmarkPlotter._create_figure()
 
         ax.set_title('Maximum test execution time per generator by coverage value')
         ax.set_xlabel('Coverage (%)')
@@ -605,20 +787,97 @@ class BenchmarkPlotter:
         BenchmarkPlotter._plot_bars_tests(fig, ax, benchmark, grouped_generators,
                                           lambda run_group: run_group.maximum_test_duration)
 
+        return fig
+
     @staticmethod
-    def save_plot(output: str):
+    def save_plot(fig: Figure, output: str):
         """
         Save the plot to a file
 
+        :param fig: Figure: The plot to save
         :param output: str: The path to save the plot
         """
-        plt.savefig(output)
+        fig.savefig(output)
 
     @staticmethod
-    def save_plot_bytesio() -> BytesIO:
+    def save_plot_bytesio(fig: Figure) -> BytesIO:
         """
         Save the plot to a BytesIO object
+
+        :param fig: Figure: The plot to save
         """
         bytesio = BytesIO()
-        plt.savefig(bytesio, format='png', dpi=300)
+        fig.savefig(bytesio, format='png', dpi=300)
         return bytesio
+
+    @staticmethod
+    def _plot_coverage_curves(fig, ax, benchmark: Benchmark, grouped_generators: dict[str, list[BenchmarkGenerator]],
+                              coverage_value: int, kind: str):
+        """
+        Plot the median coverage after every path step of each generator, with a band from the 10th to the 90th
+        percentile of the runs, for a specific coverage value
+
+        :param fig: The figure to plot on
+        :param ax: The axis to plot on
+        :param benchmark: The benchmark object to get the runs' paths from
+        :param grouped_generators: The generator benchmarks to plot, grouped by generator name, to use for filtering
+        :param coverage_value: The coverage value to plot the curves for
+        :param kind: The coverage to plot, "vertex" or "edge"
+        """
+        series_by_name = series_of(grouped_generators)
+        for run_group in benchmark.run_groups_sorted:
+            series = series_by_name.get(run_group.generator_name.name)
+            if series is None or run_group.stop_coverage != coverage_value:
+                continue
+
+            curves = CoverageCurves.aggregate(
+                CoverageCurves.run_group_curves(run_group, benchmark.element_index)[kind])
+            steps = np.arange(1, len(curves['median']) + 1)
+            line, = ax.plot(steps, curves['median'], label=series, linewidth=1)
+            ax.fill_between(steps, curves['p10'], curves['p90'], color=line.get_color(), alpha=0.2)
+
+        # Path lengths differ by orders of magnitude between generators
+        ax.set_xscale('log')
+        ax.set_ylim(0, 100)
+        ax.yaxis.grid(True)
+        BenchmarkPlotter._post_process_plot(fig, ax)
+
+    @staticmethod
+    def plot_vertex_coverage_curves(benchmark: Benchmark, grouped_generators: dict[str, list[BenchmarkGenerator]],
+                                    coverage_value: int) -> Figure:
+        """
+        Plot the vertex coverage reached after every step of the paths, for a specific coverage value
+
+        :param benchmark: The benchmark object to get the runs' paths from
+        :param grouped_generators: The generator benchmarks to plot, grouped by generator name, to use for filtering
+        :param coverage_value: The coverage value to plot the curves for
+        """
+        fig, ax = BenchmarkPlotter._create_figure()
+
+        ax.set_title(f'Vertex coverage over path steps (median, p10-p90)\nfor coverage value {coverage_value}%')
+        ax.set_xlabel('Step (log scale)')
+        ax.set_ylabel('Vertex Coverage (%)')
+
+        BenchmarkPlotter._plot_coverage_curves(fig, ax, benchmark, grouped_generators, coverage_value, 'vertex')
+
+        return fig
+
+    @staticmethod
+    def plot_edge_coverage_curves(benchmark: Benchmark, grouped_generators: dict[str, list[BenchmarkGenerator]],
+                                  coverage_value: int) -> Figure:
+        """
+        Plot the edge coverage reached after every step of the paths, for a specific coverage value
+
+        :param benchmark: The benchmark object to get the runs' paths from
+        :param grouped_generators: The generator benchmarks to plot, grouped by generator name, to use for filtering
+        :param coverage_value: The coverage value to plot the curves for
+        """
+        fig, ax = BenchmarkPlotter._create_figure()
+
+        ax.set_title(f'Edge coverage over path steps (median, p10-p90)\nfor coverage value {coverage_value}%')
+        ax.set_xlabel('Step (log scale)')
+        ax.set_ylabel('Edge Coverage (%)')
+
+        BenchmarkPlotter._plot_coverage_curves(fig, ax, benchmark, grouped_generators, coverage_value, 'edge')
+
+        return fig
@@ -0,0 +1,145 @@
+from typing import Callable, Iterator
+
+from matplotlib.figure import Figure
+
+from plotters.benchmark_plotter import BenchmarkPlotter
+from utils.parallel import parallel_imap
+
+
+class CrossBenchmarkPlotter:
+    """
+    A class used to plot the comparison of benchmarks of different models, see CrossBenchmarkStatistics
+    """
+
+    @staticmethod
+    def get_metric_labels() -> dict[str, tuple[str, str]]:
+        """
+        Get the title and axis label of every cross benchmark metric
+
+        :return: a dictionary with the (title, y-axis label) per metric name
+        """
+        return {'generation_time_per_element': ('Average generation time per model element', 'Time (μs) / element'),
+                'test_suite_size_per_element': ('Average test suite size per model element', 'Size / element'),
+                'test_execution_time_per_element': ('Average test execution time per model element',
+                                                    'Time (μs) / element')}
+
+    @staticmethod
+    def get_plot_tasks(statistics: dict[str, dict], names: list[str]) -> list[tuple[str, Callable, tuple]]:
+        """
+        Get every plot to create for a cross benchmark comparison, in output order
+
+        :param statistics: The statistics of CrossBenchmarkStatistics.create_statistics
+        :param names: The benchmark names, the first one being the baseline
+        :return: A list of (plot name, plot function, arguments)
+        """
+        tasks = []
+        for metric_name, (title, _) in CrossBenchmarkPlotter.get_metric_labels().items():
+            if metric_name not in statistics:
+                continue
+
+            for algorithm, coverage_values in statistics[metric_name].items():
+                if all(coverage is None for coverage in coverage_values):
+                    continue    # Plotted over the stop coverage, generators without a coverage are left out
+                tasks.append((f'{title} - {algorithm}', CrossBenchmarkPlotter.plot_metric,
+                              (statistics, metric_name, algorithm)))
+
+            for name in names[1:]:
+                tasks.append((f'{title} - {name} vs {names[0]}', CrossBenchmarkPlotter.plot_metric_delta,
+                              (statistics, metric_name, name, names[0])))
+        return tasks
+
+    @staticmethod
+    def iter_plots(statistics: dict[str, dict], names: list[str], jobs: int = 1) -> Iterator[tuple[str, bytes]]:
+        """
+        Plot the cross benchmark comparison, yielding every plot as soon as it is rendered
+
+        :param statistics: The statistics of CrossBenchmarkStatistics.create_statistics
+        :param names: The benchmark names, the first one being the baseline
+        :param jobs: Number of worker processes to render the plots in, 0 or less to use every available CPU
+        :return: An iterator of (plot name, PNG bytes), in the order of get_plot_tasks
+        """
+        tasks = CrossBenchmarkPlotter.get_plot_tasks(statistics, names)
+        rendered = parallel_imap(CrossBenchmarkPlotter._render_task, tasks, jobs)
+        for task, png in zip(tasks, rendered):
+            yield task[0], png
+
+    @staticmethod
+    def _render_task(task: tuple[str, Callable, tuple]) -> bytes:
+        """
+        Create the figure of a plot task and render it to PNG
+        """
+        _, plot_function, arguments = task
+        return BenchmarkPlotter.save_plot_bytesio(plot_function(*arguments)).getvalue()
+
+    @staticmethod
+    def _plot_grouped_bars(fig, ax, series: dict[str, dict[int, float]]):
+        """
+        Plot one bar per series at every coverage value
+
+        :param fig: The figure to plot on
+        :param ax: The axis to plot on
+        :param series: The values to plot by coverage value, per series label
+        """
+        # Plotted over the stop coverage, generators without a coverage are left out
+        series = {label: {coverage: value for coverage, value in values.items() if coverage is not None}
+                  for label, values in series.items()}
+        bar_width = 6 / max(len(series), 1)
+        coverage_values = sorted({coverage for values in series.values() for coverage in values})
+
+        for i, (label, values) in enumerate(series.items()):
+            coverages = sorted(values)
+            ax.bar([coverage + i * bar_width for coverage in coverages], [values[coverage] for coverage in coverages],
+                   label=label, width=bar_width, align='center')
+
+        ax.set_xticks(coverage_values)
+        ax.yaxis.grid(True)
+
+        BenchmarkPlotter._post_process_plot(fig, ax)
+
+    @staticmethod
+    def plot_metric(statistics: dict[str, dict], metric_name: str, algorithm: str) -> Figure:
+        """
+        Plot a normalized metric of an algorithm in every benchmark
+
+        :param statistics: The statistics of CrossBenchmarkStatistics.create_statistics
+        :param metric_name: The metric to plot
+        :param algorithm: The algorithm to plot
+        """
+        fig, ax = BenchmarkPlotter._create_figure()
+
+        title, y_label = CrossBenchmarkPlotter.get_metric_labels()[metric_name]
+        ax.set_title(f'{title}\n{algorithm} per benchmark by coverage value')
+        ax.set_xlabel('Coverage (%)')
+        ax.set_ylabel(y_label)
+
+        series = {}
+        for coverage, values in statistics[metric_name][algorithm].items():
+            for name, value in values.items():
+                series.setdefault(name, {})[coverage] = value
+        CrossBenchmarkPlotter._plot_grouped_bars(fig, ax, series)
+
+        return fig
+
+    @staticmethod
+    def plot_metric_delta(statistics: dict[str, dict], metric_name: str, name: str, baseline_name: str) -> Figure:
+        """
+        Plot the relative difference of a normalized metric of a benchmark to the baseline benchmark, per algorithm
+
+        :param statistics: The statistics of CrossBenchmarkStatistics.create_statistics
+        :param metric_name: The metric to plot
+        :param name: The benchmark to compare
+        :param baseline_name: The baseline benchmark
+        """
+        fig, ax = BenchmarkPlotter._create_figure()
+
+        title, _ = CrossBenchmarkPlotter.get_metric_labels()[metric_name]
+        ax.set_title(f'{title}\n{name}\ncompared to {baseline_name}')
+        ax.set_xlabel('Coverage (%)')
+        ax.set_ylabel('Difference (%)')
+        ax.axhline(0, color='black', linewidth=0.8)
+
+        series = {algorithm: {coverage: values[name] for coverage, values in coverage_values.items()}
+                  for algorithm, coverage_values in statistics[f'{metric_name}_delta'].items()}
+        CrossBenchmarkPlotter._plot_grouped_bars(fig, ax, series)
+
+        return fig
@@ -0,0 +1,196 @@
+import html
+import os
+import traceback
+from pathlib import Path
+from shutil import rmtree
+from time import perf_counter
+
+from models.benchmark import Benchmark
+from report.report_factory import ReportFactory
+from utils.benchmark_filter import compile_generator_filter
+from utils.parallel import parallel_imap
+from utils.profiler import TIMINGS_FILE_NAME, Profiler, profile_stage
+
+REPORT_FILES = {'html': 'index.html', 'pdf': 'report.pdf', 'raw_data': 'statistics.json', 'csv': 'statistics.csv'}
+
+
+class BatchReport:
+    """
+    Creates the reports of many benchmarks at once.
+
+    Every benchmark is loaded and reported by a worker of a single shared pool, so the imports and matplotlib backend of
+    a worker are set up once and reused for every benchmark it handles. PDF reports are exported afterwards with one
+    browser. A summary index links every report.
+    """
+
+    def __init__(self, report_type: str = 'html', jobs: int = 1, use_threads: bool = False, use_cache: bool = True,
+                 cache_dir: str = None, incremental: bool = False, output_suffix: str = None, models_dir: str = None,
+                 profile: bool = False, verbose: bool = False):
+        """
+        Create a batch report
+
+        :param report_type: The type of report to create for every benchmark
+        :param jobs: Number of benchmarks to process concurrently, 0 or less to use every available CPU
+        :param use_threads: Whether to use a thread pool instead of a process pool
+        :param use_cache: Whether to load the runs from, and store them in, the benchmarks' columnar caches
+        :param cache_dir: Directory to store the columnar caches in, with a subdirectory per benchmark. Default
+                          "<benchmark>/.benchmark_cache"
+        :param incremental: Whether to only recreate the artifacts whose inputs changed since the previous reports
+        :param output_suffix: Suffix to append to the output directory name of every benchmark
+        :param models_dir: Directory of the GraphWalker model files, to add the path redundancy statistics of the
+                           benchmarks whose model file is found there
+        :param profile: Whether to write the timings of every stage of every report to its output directory, see
+                        Profiler. The PDF export, done for every report at once, is not included
+        :param verbose: Whether to print progress
+        """
+        if report_type.lower() not in REPORT_FILES:
+            raise ValueError(f'Unknown report type \"{report_type}\"')
+        self.report_type = report_type.lower()
+        self.jobs = jobs
+        self.use_threads = use_threads
+        self.use_cache = use_cache
+        self.cache_dir = cache_dir
+        self.incremental = incremental
+        self.output_suffix = output_suffix
+        self.models_dir = models_dir
+        self.profile = profile
+        self.verbose = verbose
+
+    def create_reports(self, benchmark_dirs: list[Path], output: Path, whitelist: list[str] = None,
+                       blacklist: list[str] = None) -> list[dict]:
+        """
+        Create the report of every benchmark, and a summary index linking them
+
+        :param benchmark_dirs: The benchmark directories
+        :param output: The output directory, every report is written to a subdirectory named after its benchmark
+        :param whitelist: The whitelist of generators to include in the reports
+        :param blacklist: The blacklist of generators to exclude from the reports
+        :return: A summary per benchmark, in the order of the benchmark directories
+        """
+        output.mkdir(parents=True, exist_ok=True)
+        tasks = [(self, benchmark_dir, output, whitelist, blacklist) for benchmark_dir in benchmark_dirs]
+
+        summaries = []
+        for summary in parallel_imap(BatchReport._create_benchmark_report, tasks, self.jobs, self.use_threads):
+            if summary['error']:
+                print(f'Error: Could not create the report of \"{summary["path"]}\":\n{summary["error"]}')
+            elif self.verbose:
+                print(f'Created the report of \"{summary["name"]}\" in {summary["seconds"]:.2f}s')
+            summaries.append(summary)
+
+        if self.report_type == 'pdf':
+            self._export_pdf_reports(summaries)
+
+        self.write_index(summaries, output)
+        return summaries
+
+    @staticmethod
+    def _create_benchmark_report(task: tuple['BatchReport', Path, Path, list[str], list[str]]) -> dict:
+        """
+        Load a benchmark and create its report, in a worker of the shared pool. PDF reports are only rendered to HTML,
+        they are exported by the main process.
+
+        :return: The summary of the benchmark
+        """
+        self, benchmark_dir, output, whitelist, blacklist = task
+        summary = {'name': benchmark_dir.name, 'path': str(benchmark_dir), 'output': None, 'report': None,
+                   'temp_dir': None, 'model': None, 'vertices': None, 'edges': None, 'generators': None,
+                   'seconds': None, 'error': None}
+        start = perf_counter()
+        profiler = Profiler() if self.profile else None
+        try:
+            cache_dir = str(Path(self.cache_dir) / benchmark_dir.name) if self.cache_dir else None
+            with profile_stage(profiler, 'load'):
+                benchmark = Benchmark.from_dir(str(benchmark_dir.absolute()), use_cache=self.use_cache,
+                                               cache_dir=cache_dir, generator_filter=compile_generator_filter(
+                                                   tuple(whitelist or []), tuple(blacklist or [])))
+            if self.models_dir:
+                with profile_stage(profiler, 'model_graph'):
+                    benchmark.load_model_graph(self.models_dir)
+
+            benchmark_output = output / f'{benchmark.name}{self.output_suffix or ""}'
+            benchmark_output.mkdir(parents=True, exist_ok=True)
+
+            with profile_stage(profiler, 'report'):
+                if self.report_type == 'pdf':
+                    summary['temp_dir'] = str(ReportFactory.create_pdf_html(benchmark, benchmark_output, whitelist,
+                                                                            blacklist, profiler=profiler))
+                else:
+                    ReportFactory(self.report_type, incremental=self.incremental, profiler=profiler).create_report(
+                        benchmark, benchmark_output, whitelist, blacklist)
+
+            if profiler is not None:
+                profiler.write(benchmark_output / TIMINGS_FILE_NAME, benchmark=benchmark.name,
+                               report_type=self.report_type, jobs=1, cache=self.use_cache,
+                               incremental=self.incremental)
+
+            summary.update({'name': benchmark.name, 'output': str(benchmark_output),
+                            'report': str(benchmark_output / REPORT_FILES[self.report_type]),
+                            'model': benchmark.report.model.name, 'vertices': benchmark.report.model.vertices,
+                            'edges': benchmark.report.model.edges,
+                            'generators': len(benchmark.report.generators)})
+        except Exception:
+            summary['error'] = traceback.format_exc()
+        summary['seconds'] = perf_counter() - start
+        return summary
+
+    def _export_pdf_reports(self, summaries: list[dict]):
+        """
+        Export the HTML reports rendered by the workers to PDF with a single browser, then delete them
+        """
+        reports = [(Path(summary['temp_dir']), Path(summary['output'])) for summary in summaries
+                   if not summary['error']]
+        if not reports:
+            return
+
+        start = perf_counter()
+        ReportFactory.export_pdf_reports(reports, self.jobs)
+        for temp_dir, _ in reports:
+            rmtree(temp_dir)
+        if self.verbose:
+            print(f'Exported {len(reports)} PDF reports in {perf_counter() - start:.2f}s')
+
+    @staticmethod
+    def write_index(summaries: list[dict], output: Path):
+        """
+        Write a summary index linking the report of every benchmark
+
+        :param summaries: The summaries of the benchmarks, see create_reports
+        :param output: The output directory to write index.html to
+        """
+        with open(output / 'index.html', 'w') as f:
+            f.write('<html>\n')
+            f.write('<head>\n')
+            f.write(f"<title>GraphWalker Benchmark Reports</title>\n")
+            f.write('</head>\n')
+            f.write('<body>\n')
+
+            f.write(f"<h1>GraphWalker Benchmark Reports</h1>\n")
+
+            f.write('<table border="1">\n')
+            f.write('<tr>\n')
+            f.write('<th>Benchmark</th>\n')
+            f.write('<th>Model</th>\n')
+            f.write('<th>Model Size</th>\n')
+            f.write('<th>Generators</th>\n')
+            f.write('<th>Time (s)</th>\n')
+            f.write('</tr>\n')
+
+            for summary in summaries:
+                f.write('<tr>\n')
+                if summary['error']:
+                    f.write(f'<td>{html.escape(summary["name"])}</td>\n')
+                    f.write(f'<td colspan="3"><pre>{html.escape(summary["error"])}</pre></td>\n')
+                else:
+                    link = Path(os.path.relpath(summary['report'], output)).as_posix()
+                    f.write(f'<td><a href="{html.escape(link)}">{html.escape(summary["name"])}</a></td>\n')
+                    f.write(f'<td>{html.escape(summary["model"])}</td>\n')
+                    f.write(f'<td>{summary["vertices"]} vertices, {summary["edges"]} edges</td>\n')
+                    f.write(f'<td>{summary["generators"]}</td>\n')
+                f.write(f'<td>{round(summary["seconds"], 2)}</td>\n')
+                f.write('</tr>\n')
+
+            f.write('</table>\n')
+
+            f.write('</body>\n')
+            f.write('</html>\n')
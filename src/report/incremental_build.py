@@ -0,0 +1,265 @@
+import hashlib
+import inspect
+import json
+import sys
+from types import ModuleType
+from pathlib import Path
+from typing import Callable
+
+from models.benchmark import Benchmark
+from models.benchmark_generator import BenchmarkGenerator
+from models.benchmark_run_group import BenchmarkRunGroup
+from plotters.benchmark_plotter import BenchmarkPlotter
+from statistics.benchmark_statistics import BenchmarkStatistics
+from utils.benchmark_name_parser import series_of
+
+MANIFEST_VERSION = 1
+MANIFEST_NAME = '.build_manifest.json'
+# The files of a run, see IncrementalBuild._run_files
+RUN_FILES = ('report', 'path', 'test_results')
+SOURCE_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _package_source_files(module: ModuleType) -> set[str]:
+    """
+    Get the source files of a module and of every module of this package it uses, directly or through other modules
+
+    :param module: The module
+    :return: The source files
+    """
+    source_files = set()
+    pending = [module]
+    while pending:
+        module = pending.pop()
+        source_file = getattr(module, '__file__', None)
+        if source_file is None or source_file in source_files or \
+                not Path(source_file).resolve().is_relative_to(SOURCE_ROOT):
+            continue
+        source_files.add(source_file)
+        for value in vars(module).values():
+            used_module = value if isinstance(value, ModuleType) else sys.modules.get(getattr(value, '__module__', ''))
+            if used_module is not None:
+                pending.append(used_module)
+    return source_files
+
+
+class IncrementalBuild:
+    """
+    Tracks the inputs of every artifact of a report, so that artifacts whose inputs did not change since the previous
+    build can be skipped.
+
+    The manifest maps each artifact (a plot, a statistics table or an output file) to a fingerprint of its inputs: the
+    function that creates it, the generators and coverage level it covers, and the run data it reads.
+    """
+
+    def __init__(self, output: Path, artifacts: dict[str, dict] = None):
+        """
+        Create an incremental build
+
+        :param output: The output directory of the report
+        :param artifacts: The artifacts of the previous build, by name
+        """
+        self.output = output
+        self.previous = artifacts or {}
+        self.artifacts: dict[str, dict] = {}
+        self._source_digests: dict[str, str] = {}
+        self._generator_digests: dict[str, str] = {}
+        self._run_group_digests: dict[tuple[str, tuple[str, ...]], str] = {}
+
+    @property
+    def manifest_path(self) -> Path:
+        """
+        The build manifest file
+        """
+        return self.output / MANIFEST_NAME
+
+    @classmethod
+    def load(cls, output: Path) -> 'IncrementalBuild':
+        """
+        Load the manifest of the previous build in an output directory
+
+        :param output: The output directory of the report
+        :return: The incremental build, empty if there is no (compatible) previous build
+        """
+        manifest_path = output / MANIFEST_NAME
+        if not manifest_path.exists():
+            return cls(output)
+
+        try:
+            manifest = json.loads(manifest_path.read_text())
+        except json.JSONDecodeError:
+            return cls(output)
+        if manifest.get('version') != MANIFEST_VERSION:
+            return cls(output)
+        return cls(output, manifest.get('artifacts', {}))
+
+    def save(self):
+        """
+        Save the manifest of this build, keeping the entries of previous artifacts that were not rebuilt
+        """
+        artifacts = {**self.previous, **self.artifacts}
+        self.manifest_path.write_text(json.dumps({'version': MANIFEST_VERSION, 'artifacts': artifacts}, indent=4))
+
+    def is_current(self, artifact: str, fingerprint: str, file: Path = None) -> bool:
+        """
+        Check whether an artifact of the previous build can be reused, recording it for this build if so
+
+        :param artifact: The artifact name
+        :param fingerprint: The fingerprint of the artifact's current inputs
+        :param file: The file the artifact was written to, which must still exist
+        :return: Whether the artifact is unchanged
+        """
+        entry = self.previous.get(artifact)
+        if entry is None or entry['fingerprint'] != fingerprint or (file is not None and not file.exists()):
+            return False
+        self.artifacts[artifact] = entry
+        return True
+
+    def record(self, artifact: str, fingerprint: str, value=None):
+        """
+        Record a (re)built artifact
+
+        :param artifact: The artifact name
+        :param fingerprint: The fingerprint of the artifact's inputs
+        :param value: A JSON serializable value to keep with the artifact, returned by cached_value on the next build
+        """
+        self.artifacts[artifact] = {'fingerprint': fingerprint, 'value': value}
+
+    def remove_stale(self, directory: str, artifacts: set[str]):
+        """
+        Delete the files of the previous build in a directory of the output that are no longer artifacts of this build,
+        and forget them
+
+        :param directory: The directory, relative to the output directory
+        :param artifacts: The artifacts of this build in the directory
+        """
+        for artifact in [artifact for artifact in self.previous
+                         if artifact.startswith(f'{directory}/') and artifact not in artifacts]:
+            (self.output / artifact).unlink(missing_ok=True)
+            del self.previous[artifact]
+
+    def cached_value(self, artifact: str):
+        """
+        Get the value stored with a reused artifact
+        """
+        return self.artifacts[artifact]['value']
+
+    def fingerprint_task(self, benchmark: Benchmark, grouped_generators: dict[str, list[BenchmarkGenerator]],
+                         task: tuple[str, Callable, bool, tuple]) -> str:
+        """
+        Fingerprint the inputs of a plot or statistics task
+
+        :param benchmark: The benchmark the task runs on
+        :param grouped_generators: The generator benchmarks the task runs on, grouped by generator name
+        :param task: The task, as (name, function, whether the function takes the benchmark, extra arguments)
+        :return: The fingerprint
+        """
+        name, function, takes_benchmark, extra_args = task
+        digest = hashlib.sha1(f'{name}\n{function.__qualname__}\n{self._source_digest(function)}\n'
+                              f'{json.dumps(extra_args)}\n'.encode())
+        # Per coverage tasks only read the generators and runs at their coverage level
+        coverage = extra_args[0] if extra_args else None
+
+        if not takes_benchmark:
+            for series, generators in sorted(grouped_generators.items()):
+                for generator in generators:
+                    if coverage is None or generator.stop_coverage == coverage:
+                        digest.update(f'{series}:{generator.name}:{self._generator_digest(generator)}\n'.encode())
+
+            model = benchmark.report.model
+            digest.update(f'model:{model.vertices}:{model.edges}\n'.encode())
+        else:
+            # Tasks taking the benchmark read its run files, using the generators only to filter and group the runs
+            run_files = self._run_files(function)
+            series_by_name = series_of(grouped_generators)
+            for run_group in benchmark.run_groups_sorted:
+                series = series_by_name.get(run_group.generator_name.name)
+                if series is None or (coverage is not None and run_group.stop_coverage != coverage):
+                    continue
+                digest.update(f'{series}:{run_group.name}:{self._run_group_digest(run_group, run_files)}\n'.encode())
+
+            graph = benchmark.model_graph
+            if graph is not None and 'path' in run_files:
+                digest.update(graph.edge_sources.tobytes() + graph.edge_targets.tobytes())
+
+        return digest.hexdigest()
+
+    def write_if_changed(self, file: Path, content: str, newline: str = None) -> bool:
+        """
+        Write a text file, unless the previous build wrote the same content to it
+
+        :param file: The file to write
+        :param content: The content of the file
+        :param newline: How to translate newlines, as for open()
+        :return: Whether the file was written
+        """
+        artifact = file.relative_to(self.output).as_posix()
+        fingerprint = hashlib.sha1(content.encode()).hexdigest()
+        if self.is_current(artifact, fingerprint, file):
+            return False
+
+        with open(file, 'w', newline=newline) as f:
+            f.write(content)
+        self.record(artifact, fingerprint)
+        return True
+
+    def _source_digest(self, function: Callable) -> str:
+        """
+        Hash the sources of the module defining a function and of the modules of this package it uses, directly or
+        through other modules, so changes to the plotting or statistics code or its helpers invalidate its artifacts
+        """
+        module = inspect.getmodule(function)
+        if module.__name__ not in self._source_digests:
+            digest = hashlib.sha1()
+            for source_file in sorted(_package_source_files(module)):
+                digest.update(f'{Path(source_file).relative_to(SOURCE_ROOT).as_posix()}\n'.encode())
+                digest.update(Path(source_file).read_bytes())
+            self._source_digests[module.__name__] = digest.hexdigest()
+        return self._source_digests[module.__name__]
+
+    @staticmethod
+    def _run_files(function: Callable) -> tuple[str, ...]:
+        """
+        Get the run files a task function taking the benchmark reads, of RUN_FILES: the test results for test execution
+        tasks, the reports for distribution statistics, the paths for path plots and redundancy statistics, and every
+        run file for other tasks
+        """
+        if function in BenchmarkPlotter.get_test_execution_plot_functions().values() or \
+                function in BenchmarkStatistics.get_statistics_functions_test_execution().values():
+            return 'test_results',
+        if function is BenchmarkStatistics.distribution_statistic:
+            return 'report',
+        if function in BenchmarkPlotter.get_per_coverage_path_plot_functions().values() or \
+                function is BenchmarkStatistics.redundancy_statistic:
+            return 'path',
+        return RUN_FILES
+
+    def _run_group_digest(self, run_group: BenchmarkRunGroup, run_files: tuple[str, ...] = RUN_FILES) -> str:
+        """
+        Hash some of the files of the runs of a run group, of RUN_FILES, as stored, without parsing them, or the loaded
+        values of runs that were not read from files
+        """
+        key = (run_group.name, run_files)
+        if key not in self._run_group_digests:
+            digest = hashlib.sha1()
+            for run in run_group.runs:
+                files = {'report': (run.report_file, lambda: run.report),
+                         'path': (run.path_file, lambda: list(run.element_ids())),
+                         'test_results': (run.test_results_file, lambda: run.test_results)}
+                for file, load in (files[run_file] for run_file in run_files):
+                    if file is not None and file.exists():
+                        digest.update(file.read_bytes())
+                    else:
+                        digest.update(json.dumps(load(), sort_keys=True).encode())
+                    digest.update(b'\0')
+            self._run_group_digests[key] = digest.hexdigest()
+        return self._run_group_digests[key]
+
+    def _generator_digest(self, generator: BenchmarkGenerator) -> str:
+        """
+        Hash the report values of a generator
+        """
+        if generator.name not in self._generator_digests:
+            self._generator_digests[generator.name] = hashlib.sha1(
+                json.dumps(generator, sort_keys=True).encode()).hexdigest()
+        return self._generator_digests[generator.name]
@@ -0,0 +1,104 @@
+import asyncio
+from pathlib import Path
+
+from playwright.async_api import async_playwright
+
+
+class PdfExporter:
+    """
+    Exports HTML files to PDF with a headless Chromium browser.
+
+    The browser and a pool of pages are started once and reused for every export, so exporting many reports only pays
+    the browser startup once. Exports run concurrently, one per page in the pool.
+
+    Use as a context manager, or call start() and close():
+
+        with PdfExporter(pages=4) as exporter:
+            exporter.export_many([(html_file, pdf_file), ...])
+    """
+
+    def __init__(self, pages: int = 1):
+        """
+        Create a PDF exporter
+
+        :param pages: Number of browser pages to render with concurrently
+        """
+        self.page_count = max(pages, 1)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._playwright = None
+        self._browser = None
+        self._pages: asyncio.Queue | None = None
+
+    @property
+    def started(self) -> bool:
+        """
+        Whether the browser is running
+        """
+        return self._browser is not None
+
+    def start(self):
+        """
+        Start the browser and open the page pool, if not started yet
+        """
+        if self.started:
+            return
+        self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(self._start())
+
+    async def _start(self):
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch()
+        self._pages = asyncio.Queue()
+        for _ in range(self.page_count):
+            self._pages.put_nowait(await self._browser.new_page())
+
+    def close(self):
+        """
+        Close the browser, if started
+        """
+        if not self.started:
+            return
+        self._loop.run_until_complete(self._close())
+        self._loop.close()
+        self._loop = None
+
+    async def _close(self):
+        await self._browser.close()
+        await self._playwright.stop()
+        self._browser = None
+        self._playwright = None
+        self._pages = None
+
+    def __enter__(self) -> 'PdfExporter':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def export(self, html_file: Path, pdf_file: Path):
+        """
+        Export an HTML file to PDF
+
+        :param html_file: The HTML file to render
+        :param pdf_file: The PDF file to write
+        """
+        self.export_many([(html_file, pdf_file)])
+
+    def export_many(self, files: list[tuple[Path, Path]]):
+        """
+        Export HTML files to PDF concurrently, starting the browser if needed
+
+        :param files: The (HTML file, PDF file) pairs to export
+        """
+        self.start()
+        self._loop.run_until_complete(asyncio.gather(*(self._export(html_file, pdf_file)
+                                                       for html_file, pdf_file in files)))
+
+    async def _export(self, html_file: Path, pdf_file: Path):
+        page = await self._pages.get()
+        try:
+            await page.goto(f'file://{Path(html_file).absolute()}')
+            await page.pdf(path=pdf_file)
+        finally:
+            self._pages.put_nowait(page)
@@ -1,28 +1,63 @@
 import json
 import csv
+import math
+from io import StringIO
 from pathlib import Path
 from shutil import rmtree
 from time import time
+from typing import Iterable
 
-from playwright.sync_api import sync_playwright
 from seedir import seedir
 
 from models.benchmark import Benchmark
+from models.benchmark_generator import BenchmarkGenerator
+from models.cross_benchmark import CrossBenchmark
 from plotters.benchmark_plotter import BenchmarkPlotter
+from plotters.cross_benchmark_plotter import CrossBenchmarkPlotter
+from report.incremental_build import IncrementalBuild
+from report.pdf_exporter import PdfExporter
 from statistics.benchmark_statistics import BenchmarkStatistics
+from statistics.cross_benchmark_statistics import CrossBenchmarkStatistics
 from utils.benchmark_filter import filter_grouped_generators
+from utils.benchmark_name_parser import parse_number
+from utils.parallel import resolve_jobs
+from utils.profiler import Profiler, profile_stage
+
+
+def _finite_or_none(value):
+    """
+    Replace the floats of nested dictionaries and lists that are not finite with None
+    """
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite_or_none(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite_or_none(item) for item in value]
+    return value
 
 
 class ReportFactory:
-    def __init__(self, report_type: str = 'html', prompt_delete_temp: bool = True):
+    def __init__(self, report_type: str = 'html', prompt_delete_temp: bool = True, jobs: int = 1,
+                 incremental: bool = False, pdf_exporter: PdfExporter = None, profiler: Profiler = None):
         """
         Create a report factory
 
         :param report_type: The type of report to create
         :param prompt_delete_temp: Whether to prompt the user to delete temporary files
+        :param jobs: Number of worker processes to render plots in, 0 or less to use every available CPU
+        :param incremental: Whether to skip plots, statistics and files whose inputs did not change since the previous
+                            report in the same output directory
+        :param pdf_exporter: The PDF exporter to reuse for PDF reports, by default a browser is started per call
+        :param profiler: The profiler to record the time and memory of every stage of the reports in, or None to not
+                         profile
         """
         self.report_type = report_type
         self.prompt_delete_temp = prompt_delete_temp
+        self.jobs = jobs
+        self.incremental = incremental
+        self.pdf_exporter = pdf_exporter
+        self.profiler = profiler
         self.report = None
 
     def create_report(self, benchmark: Benchmark, output: Path, whitelist: list[str] = None,
@@ -35,56 +70,196 @@ class ReportFactory:
         :param whitelist: The whitelist of generators to include in the report
         :param blacklist: The blacklist of generators to exclude from the report
         """
+        build = IncrementalBuild.load(output) if self.incremental else None
+
         if self.report_type.lower() == 'html':
-            return self.create_html_report(benchmark, output, whitelist, blacklist)
+            self.create_html_report(benchmark, output, whitelist, blacklist, self.jobs, build, self.profiler)
         elif self.report_type.lower() == 'pdf':
-            return self.create_pdf_report(benchmark, output, whitelist, blacklist, self.prompt_delete_temp)
+            return self.create_pdf_report(benchmark, output, whitelist, blacklist, self.prompt_delete_temp, self.jobs,
+                                          self.pdf_exporter, self.profiler)
         elif self.report_type.lower() == 'raw_data':
-            return self.create_raw_report(benchmark, output, whitelist, blacklist)
+            self.create_raw_report(benchmark, output, whitelist, blacklist, self.jobs, build, self.profiler)
         elif self.report_type.lower() == 'csv':
-            return self.create_csv_report(benchmark, output, whitelist, blacklist)
+            self.create_csv_report(benchmark, output, whitelist, blacklist, build, self.profiler)
         else:
             raise ValueError(f'Unknown report type \"{self.report_type}\"')
 
+        if build is not None:
+            build.save()
+
+    def create_reports(self, reports: list[tuple[Benchmark, Path]], whitelist: list[str] = None,
+                       blacklist: list[str] = None):
+        """
+        Create the reports of several benchmarks. PDF reports are exported concurrently with a single browser.
+
+        :param reports: The benchmarks to create a report for, with their output paths
+        :param whitelist: The whitelist of generators to include in the reports
+        :param blacklist: The blacklist of generators to exclude from the reports
+        """
+        if self.report_type.lower() == 'pdf':
+            return self.create_pdf_reports(reports, whitelist, blacklist, self.prompt_delete_temp, self.jobs,
+                                           self.pdf_exporter, self.profiler)
+
+        for benchmark, output in reports:
+            self.create_report(benchmark, output, whitelist, blacklist)
+
     @staticmethod
-    def create_raw_report(benchmark: Benchmark, output: Path, whitelist: list[str] = None, blacklist: list[str] = None):
+    def create_raw_report(benchmark: Benchmark, output: Path, whitelist: list[str] = None, blacklist: list[str] = None,
+                          jobs: int = 1, build: IncrementalBuild = None, profiler: Profiler = None):
         """
         Create a raw report
         """
         grouped_generators = filter_grouped_generators(benchmark.report.generators_grouped, whitelist, blacklist)
-        statistics = BenchmarkStatistics.create_statistics(benchmark, grouped_generators)
-        plots = BenchmarkPlotter.create_plots(benchmark, grouped_generators)
+        statistics = ReportFactory.create_statistics(benchmark, grouped_generators, build, profiler)
 
-        with open(output / 'benchmarks.json', 'w') as f:
-            f.write(json.dumps(benchmark.report, indent=4))
+        with profile_stage(profiler, 'json'):
+            ReportFactory.write_text(output / 'benchmarks.json', json.dumps(benchmark.report, indent=4), build)
+            ReportFactory.write_text(output / 'statistics.json', ReportFactory.to_json(statistics), build)
 
-        with open(output / 'statistics.json', 'w') as f:
-            f.write(json.dumps(statistics, indent=4))
+        ReportFactory.create_plots(benchmark, grouped_generators, output / 'images', jobs, build, profiler)
+
+    @staticmethod
+    def write_text(file: Path, content: str, build: IncrementalBuild = None, newline: str = None):
+        """
+        Write a text file, skipping it if an incremental build already wrote the same content to it
+
+        :param file: The file to write
+        :param content: The content of the file
+        :param build: The incremental build, or None to always write the file
+        :param newline: How to translate newlines, as for open()
+        """
+        if build is not None:
+            build.write_if_changed(file, content, newline)
+            return
+        with open(file, 'w', newline=newline) as f:
+            f.write(content)
+
+    @staticmethod
+    def to_json(value) -> str:
+        """
+        Serialize statistics to JSON. Values that are not finite, such as a ratio to a zero value or the mean of no
+        runs, are written as null, as JSON has no NaN or Infinity.
+
+        :param value: The statistics, nested dictionaries and lists of numbers and strings
+        :return: The JSON text
+        """
+        return json.dumps(_finite_or_none(value), indent=4, allow_nan=False)
+
+    @staticmethod
+    def create_statistics(benchmark: Benchmark, grouped_generators: dict[str, list[BenchmarkGenerator]],
+                          build: IncrementalBuild = None, profiler: Profiler = None) -> dict[str, dict]:
+        """
+        Create the statistics for a benchmark, reusing the tables of an incremental build whose inputs did not change
+
+        :param benchmark: The benchmark to analyse
+        :param grouped_generators: The generator benchmarks to analyse, grouped by generator name
+        :param build: The incremental build, or None to create every statistic
+        :param profiler: The profiler to record the time of every statistics function in, or None to not profile. The
+                         statistics are then created function by function rather than in a single vectorized pass, so
+                         every function can be measured
+        :return: A dictionary with the statistics
+        """
+        with profile_stage(profiler, 'statistics'):
+            if build is None and profiler is None:
+                return BenchmarkStatistics.create_statistics(benchmark, grouped_generators)
+
+            statistics: dict[str, dict] = {}
+            for task in BenchmarkStatistics.get_statistics_tasks(benchmark, grouped_generators):
+                function_name, statistics_function, takes_benchmark, extra_args = task
+                artifact = f'statistics/{function_name}'
+                fingerprint = build.fingerprint_task(benchmark, grouped_generators, task) if build else None
+                if build is not None and build.is_current(artifact, fingerprint):
+                    # JSON object keys are strings, the stop coverages are restored to numbers, or None ("null")
+                    statistics[function_name] = {generator_name: {None if stop_coverage == 'null'
+                                                                  else parse_number(stop_coverage): value
+                                                                  for stop_coverage, value in values.items()}
+                                                 for generator_name, values in build.cached_value(artifact).items()}
+                    continue
+
+                with profile_stage(profiler, function_name, statistics_function):
+                    if takes_benchmark:
+                        statistics[function_name] = statistics_function(benchmark, grouped_generators, *extra_args)
+                    else:
+                        statistics[function_name] = statistics_function(grouped_generators, *extra_args)
+                if build is not None:
+                    build.record(artifact, fingerprint, statistics[function_name])
+
+            return statistics
+
+    @staticmethod
+    def create_plots(benchmark: Benchmark, grouped_generators: dict[str, list[BenchmarkGenerator]], images_dir: Path,
+                     jobs: int = 1, build: IncrementalBuild = None, profiler: Profiler = None) -> list[str]:
+        """
+        Render the plots of a benchmark to PNG files, skipping the plots of an incremental build whose inputs did not
+        change
+
+        :param benchmark: The benchmark to plot
+        :param grouped_generators: The generator benchmarks to plot, grouped by generator name
+        :param images_dir: The directory to write the plots to
+        :param jobs: Number of worker processes to render plots in, 0 or less to use every available CPU
+        :param build: The incremental build, or None to render every plot
+        :param profiler: The profiler to record the time of every plot in, or None to not profile
+        :return: The names of the plots, in order
+        """
+        with profile_stage(profiler, 'plots'):
+            if build is None:
+                return ReportFactory.write_plots(
+                    BenchmarkPlotter.iter_plots(benchmark, grouped_generators, jobs=jobs, profiler=profiler),
+                    images_dir)
+
+            tasks = BenchmarkPlotter.get_plot_tasks(benchmark, grouped_generators)
+            fingerprints = {}
+            stale_tasks = []
+            for task in tasks:
+                fingerprint = build.fingerprint_task(benchmark, grouped_generators, task)
+                if not build.is_current(f'images/{task[0]}.png', fingerprint, images_dir / f'{task[0]}.png'):
+                    fingerprints[task[0]] = fingerprint
+                    stale_tasks.append(task)
+
+            # Plots of generators or coverage values that are no longer in the benchmark would stay in the report
+            build.remove_stale('images', {f'images/{task[0]}.png' for task in tasks})
+
+            images_dir.mkdir(parents=True, exist_ok=True)
+            for name, png in BenchmarkPlotter.iter_plots(benchmark, grouped_generators, jobs=jobs, tasks=stale_tasks,
+                                                         profiler=profiler):
+                with open(images_dir / f'{name}.png', 'wb') as f:
+                    f.write(png)
+                build.record(f'images/{name}.png', fingerprints[name])
+
+            return [task[0] for task in tasks]
+
+    @staticmethod
+    def write_plots(plots: Iterable[tuple[str, bytes]], images_dir: Path) -> list[str]:
+        """
+        Write plots to PNG files as they are produced
 
-        images_dir = output / 'images'
+        :param plots: The plots, as (name, PNG bytes)
+        :param images_dir: The directory to write the plots to
+        :return: The names of the written plots, in order
+        """
         images_dir.mkdir(parents=True, exist_ok=True)
-        for name, bytesIO in plots.items():
+        names = []
+        for name, png in plots:
             with open(images_dir / f'{name}.png', 'wb') as f:
-                f.write(bytesIO.getvalue())
+                f.write(png)
+            names.append(name)
+        return names
 
     @staticmethod
     def create_html_report(benchmark: Benchmark, output: Path, whitelist: list[str] = None,
-                           blacklist: list[str] = None):
+                           blacklist: list[str] = None, jobs: int = 1, build: IncrementalBuild = None,
+                           profiler: Profiler = None):
         """"
         Create an HTML report
         """
         grouped_generators = filter_grouped_generators(benchmark.report.generators_grouped, whitelist, blacklist)
-        plots = BenchmarkPlotter.create_plots(benchmark, grouped_generators)
-        statistics = BenchmarkStatistics.create_statistics(benchmark, grouped_generators)
+        plot_names = ReportFactory.create_plots(benchmark, grouped_generators, output / 'images', jobs, build,
+                                                profiler)
+        statistics = ReportFactory.create_statistics(benchmark, grouped_generators, build, profiler)
 
         html_file = output / 'index.html'
-        images_dir = output / 'images'
-        images_dir.mkdir(parents=True, exist_ok=True)
-        for name, bytesIO in plots.items():
-            with open(images_dir / f'{name}.png', 'wb') as f:
-                f.write(bytesIO.getvalue())
 
-        with open(html_file, 'w') as f:
+        with profile_stage(profiler, 'html'), StringIO() as f:
             f.write('<html>\n')
             f.write('<head>\n')
             f.write(f"<title>GraphWalker Benchmark Report</title>\n")
@@ -164,32 +339,84 @@ class ReportFactory:
                 # f.write('<div style="page-break-after: always;"></div>')
 
             f.write('<h2>Plots</h2>\n')
-            for name in plots.keys():
+            for name in plot_names:
                 f.write(f'<img src="images/{name}.png" alt="{name}" width="800">')
 
             f.write('</body>\n')
             f.write('</html>\n')
 
+            ReportFactory.write_text(html_file, f.getvalue(), build)
+
     @staticmethod
     def create_pdf_report(benchmark: Benchmark, output: Path, whitelist: list[str] = None, blacklist: list[str] = None,
-                          prompt_delete_temp: bool = True):
+                          prompt_delete_temp: bool = True, jobs: int = 1, pdf_exporter: PdfExporter = None,
+                          profiler: Profiler = None):
         """
         Create a PDF report
         """
+        ReportFactory.create_pdf_reports([(benchmark, output)], whitelist, blacklist, prompt_delete_temp, jobs,
+                                         pdf_exporter, profiler)
+
+    @staticmethod
+    def create_pdf_reports(reports: list[tuple[Benchmark, Path]], whitelist: list[str] = None,
+                           blacklist: list[str] = None, prompt_delete_temp: bool = True, jobs: int = 1,
+                           pdf_exporter: PdfExporter = None, profiler: Profiler = None):
+        """
+        Create PDF reports, exporting them concurrently
+
+        :param reports: The benchmarks to create a report for, with their output paths
+        :param whitelist: The whitelist of generators to include in the reports
+        :param blacklist: The blacklist of generators to exclude from the reports
+        :param prompt_delete_temp: Whether to prompt the user to delete temporary files
+        :param jobs: Number of worker processes to render plots in, and browser pages to export with when no exporter
+                     is given
+        :param pdf_exporter: The PDF exporter to reuse, by default a browser is started for these reports only
+        :param profiler: The profiler to record the time and memory of every stage of the reports in, or None to not
+                         profile
+        """
+        temp_dirs = [ReportFactory.create_pdf_html(benchmark, output, whitelist, blacklist, jobs, profiler)
+                     for benchmark, output in reports]
+        with profile_stage(profiler, 'pdf'):
+            ReportFactory.export_pdf_reports(
+                [(temp_dir, output) for temp_dir, (_, output) in zip(temp_dirs, reports)], jobs, pdf_exporter)
+
+        for temp_dir, (_, output) in zip(temp_dirs, reports):
+            ReportFactory.clean_pdf_temp(temp_dir, output, prompt_delete_temp)
+
+    @staticmethod
+    def create_pdf_html(benchmark: Benchmark, output: Path, whitelist: list[str] = None, blacklist: list[str] = None,
+                        jobs: int = 1, profiler: Profiler = None) -> Path:
+        """
+        Create the HTML report a PDF report is exported from, in a temporary directory of the output
+
+        :return: The temporary directory
+        """
         temp_dir = output / f"temp_{time()}"
         temp_dir.mkdir(parents=True, exist_ok=False)
+        ReportFactory.create_html_report(benchmark, temp_dir, whitelist, blacklist, jobs, profiler=profiler)
+        return temp_dir
 
-        ReportFactory.create_html_report(benchmark, temp_dir, whitelist, blacklist)
+    @staticmethod
+    def export_pdf_reports(reports: list[tuple[Path, Path]], jobs: int = 1, pdf_exporter: PdfExporter = None):
+        """
+        Export the HTML reports of create_pdf_html to PDF, concurrently
 
-        playwright_instance = sync_playwright().start()
-        chromium = playwright_instance.chromium
-        browser = chromium.launch()
-        page = browser.new_page()
-        page.goto(f'file://{temp_dir.absolute()}/index.html')
-        page.pdf(path=output / 'report.pdf')
-        browser.close()
-        playwright_instance.stop()
+        :param reports: The temporary directories of the HTML reports, with their output paths
+        :param jobs: Number of browser pages to export with when no exporter is given
+        :param pdf_exporter: The PDF exporter to reuse, by default a browser is started for these reports only
+        """
+        files = [(temp_dir / 'index.html', output / 'report.pdf') for temp_dir, output in reports]
+        if pdf_exporter is not None:
+            pdf_exporter.export_many(files)
+        else:
+            with PdfExporter(pages=min(resolve_jobs(jobs), len(files))) as exporter:
+                exporter.export_many(files)
 
+    @staticmethod
+    def clean_pdf_temp(temp_dir: Path, output: Path, prompt_delete_temp: bool = True):
+        """
+        Delete the temporary files of an exported PDF report, optionally prompting the user first
+        """
         # List files in temp directory, and give prompt to delete
         print(f'PDF report created at \"{output / "report.pdf"}\"')
         if prompt_delete_temp:
@@ -208,15 +435,16 @@ class ReportFactory:
             print('Temporary files deleted.')
 
     @staticmethod
-    def create_csv_report(benchmark: Benchmark, output: Path, whitelist: list[str] = None, blacklist: list[str] = None):
+    def create_csv_report(benchmark: Benchmark, output: Path, whitelist: list[str] = None, blacklist: list[str] = None,
+                          build: IncrementalBuild = None, profiler: Profiler = None):
         """
         Create a CSV report, does not generate plots
         """
         grouped_generators = filter_grouped_generators(benchmark.report.generators_grouped, whitelist, blacklist)
-        statistics = BenchmarkStatistics.create_statistics(benchmark, grouped_generators)
+        statistics = ReportFactory.create_statistics(benchmark, grouped_generators, build, profiler)
 
         csv_file = output / 'statistics.csv'
-        with open(csv_file, 'w', newline='') as f:
+        with profile_stage(profiler, 'csv'), StringIO(newline='') as f:
             writer = csv.writer(f)
             for statistic_name, statistics in statistics.items():
                 writer.writerow(['Statistic:', statistic_name])
@@ -225,3 +453,121 @@ class ReportFactory:
                     for stop_coverage, value in generator_statistics.items():
                         writer.writerow([generator_name, stop_coverage, value])
                 writer.writerow([])
+
+            ReportFactory.write_text(csv_file, f.getvalue(), build, newline='')
+
+    @staticmethod
+    def create_cross_report(cross_benchmark: CrossBenchmark, output: Path, jobs: int = 1):
+        """
+        Create a report comparing benchmarks of different models: an HTML page with the combined statistics table and
+        plots, and the statistics as JSON and CSV
+
+        :param cross_benchmark: The benchmarks to compare
+        :param output: The output path
+        :param jobs: Number of worker processes to render plots in, 0 or less to use every available CPU
+        """
+        statistics = CrossBenchmarkStatistics.create_statistics(cross_benchmark)
+        names = cross_benchmark.names
+
+        with open(output / 'statistics.json', 'w') as f:
+            f.write(ReportFactory.to_json(statistics))
+
+        with open(output / 'statistics.csv', 'w', newline='') as f:
+            writer = csv.writer(f)
+            for statistic_name, statistic in statistics.items():
+                writer.writerow(['Statistic:', statistic_name])
+                writer.writerow(['Generator', 'Stop Coverage'] + names)
+                for algorithm, coverage_values in statistic.items():
+                    for stop_coverage, values in coverage_values.items():
+                        writer.writerow([algorithm, stop_coverage] + [values.get(name, '') for name in names])
+                writer.writerow([])
+
+        plot_names = ReportFactory.write_plots(CrossBenchmarkPlotter.iter_plots(statistics, names, jobs),
+                                               output / 'images')
+
+        with open(output / 'index.html', 'w') as f:
+            f.write('<html>\n')
+            f.write('<head>\n')
+            f.write(f"<title>GraphWalker Cross Benchmark Report</title>\n")
+            f.write('</head>\n')
+            f.write('<body>\n')
+
+            f.write(f"<h1>GraphWalker Cross Benchmark Report: {' vs '.join(names)}</h1>\n")
+
+            f.write(f"<h2>Benchmarks</h2>\n")
+            f.write('<table border="1">\n')
+            f.write('<tr>\n')
+            f.write('<th>Benchmark</th>\n')
+            f.write('<th>Model Name</th>\n')
+            f.write('<th>Model Size</th>\n')
+            f.write('<th>Normalized By</th>\n')
+            f.write('</tr>\n')
+
+            for benchmark in cross_benchmark.benchmarks:
+                f.write('<tr>\n')
+                f.write(f'<td>{benchmark.name}</td>\n')
+                f.write(f'<td>{benchmark.report.model.name}</td>\n')
+                f.write(f'<td>{benchmark.report.model.vertices} vertices, {benchmark.report.model.edges} edges</td>\n')
+                model_sizes = {f'{CrossBenchmark.model_size(benchmark, generator.generator_name)} '
+                               f'{CrossBenchmark.model_size_unit(generator.generator_name)}': None
+                               for generators in cross_benchmark.grouped_generators(benchmark).values()
+                               for generator in generators}
+                f.write(f"<td>{', '.join(model_sizes)}</td>\n")
+                f.write('</tr>\n')
+
+            f.write('</table>\n')
+
+            f.write('<div style="page-break-after: always;"></div>')
+
+            f.write('<h2>Statistics</h2>\n')
+
+            for statistic_name, statistic in statistics.items():
+                f.write(f"<h3>{statistic_name}</h3>\n")
+                f.write('<table>\n')
+                f.write('<tr>\n')
+                f.write('<th>Generator</th>\n')
+                f.write('<th>Stop Coverage</th>\n')
+                for name in names[1:] if statistic_name.endswith('_delta') else names:
+                    f.write(f'<th>{name}</th>\n')
+                f.write('</tr>\n')
+
+                for algorithm, coverage_values in statistic.items():
+                    for stop_coverage, values in coverage_values.items():
+                        f.write('<tr>\n')
+                        f.write(f'<td>{algorithm}</td>\n')
+                        f.write(f'<td>{stop_coverage}</td>\n')
+                        for value in values.values():
+                            f.write(f'<td>{round(value, 2)}</td>\n')
+                        f.write('</tr>\n')
+
+                f.write('</table>\n')
+
+                f.write('<div style="page-break-after: always;"></div>')
+
+            f.write('<h2>Plots</h2>\n')
+            for name in plot_names:
+                f.write(f'<img src="images/{name}.png" alt="{name}" width="800">')
+
+            f.write('</body>\n')
+            f.write('</html>\n')
+
+    @staticmethod
+    def create_comparison_report(results: list[dict], output: Path):
+        """
+        Create a report of a regression comparison, as JSON and CSV
+
+        :param results: The results of RegressionDetector.compare
+        :param output: The output path
+        """
+        with open(output / 'comparison.json', 'w') as f:
+            f.write(ReportFactory.to_json(results))
+
+        with open(output / 'comparison.csv', 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Generator', 'Metric', 'Baseline Runs', 'Candidate Runs', 'Baseline Median',
+                             'Candidate Median', 'Change (%)', 'P-Value', 'CI Low (%)', 'CI High (%)', 'Status'])
+            for result in results:
+                writer.writerow([result['generator'], result['metric'], result['baseline_runs'],
+                                 result['candidate_runs'], result['baseline_median'], result['candidate_median'],
+                                 result['change'], result['p_value'], result['ci_low'], result['ci_high'],
+                                 result['status']])
@@ -2,6 +2,12 @@ from typing import Callable
 
 from models.benchmark import Benchmark
 from models.benchmark_generator import BenchmarkGenerator
+from models.benchmark_run_group import BenchmarkRunGroup
+from statistics.distribution_statistics import DISTRIBUTION_METRICS, DISTRIBUTION_STATISTICS, \
+    DistributionStatistics
+from statistics.redundancy_statistics import REDUNDANCY_METRICS, RedundancyStatistics
+from statistics.statistics_engine import StatisticsEngine
+from utils.benchmark_name_parser import group_like
 
 
 class BenchmarkStatistics:
@@ -37,6 +43,33 @@ class BenchmarkStatistics:
                 'min_test_execution_time_comparison': BenchmarkStatistics.min_test_execution_time_comparison,
                 'max_test_execution_time_comparison': BenchmarkStatistics.max_test_execution_time_comparison}
 
+    @staticmethod
+    def get_comparison_metrics() -> dict[str, Callable[[BenchmarkGenerator], int]]:
+        """
+        Get the generator values compared by the statistics functions
+
+        :return: a dictionary with the value to compare per statistics function name
+        """
+        return {'total_test_suite_size_comparison': lambda generator: generator.total_test_suite_size,
+                'total_generation_time_comparison': lambda generator: generator.total_generation_time,
+                'average_test_suite_size_comparison': lambda generator: generator.average_test_suite_size,
+                'average_generation_time_comparison': lambda generator: generator.average_generation_time,
+                'min_test_suite_size_comparison': lambda generator: generator.min_test_suite_size,
+                'min_generation_time_comparison': lambda generator: generator.min_generation_time,
+                'max_test_suite_size_comparison': lambda generator: generator.max_test_suite_size,
+                'max_generation_time_comparison': lambda generator: generator.max_generation_time}
+
+    @staticmethod
+    def get_test_execution_comparison_metrics() -> dict[str, Callable[[BenchmarkRunGroup], float]]:
+        """
+        Get the run group values compared by the test execution statistics functions
+
+        :return: a dictionary with the value to compare per statistics function name
+        """
+        return {'average_test_execution_time_comparison': lambda group: group.average_test_duration,
+                'min_test_execution_time_comparison': lambda group: group.minimum_test_duration,
+                'max_test_execution_time_comparison': lambda group: group.maximum_test_duration}
+
     @staticmethod
     def create_statistics(benchmark: Benchmark, grouped_generators: dict[str, list[BenchmarkGenerator]]) -> dict[
         str, dict]:
@@ -47,16 +80,72 @@ class BenchmarkStatistics:
         :param grouped_generators: The generator benchmarks to analyse, grouped by generator name
         :return: A dictionary with the statistics
         """
-        statistics: dict[str, dict] = {}
+        return BenchmarkStatistics.create_statistics_batch([(benchmark, grouped_generators)])[0]
+
+    @staticmethod
+    def create_statistics_batch(benchmarks: list[tuple[Benchmark, dict[str, list[BenchmarkGenerator]]]]) -> list[
+        dict[str, dict]]:
+        """
+        Create the statistics for several benchmarks at once, computing every comparison of every benchmark in a single
+        vectorized pass
+
+        :param benchmarks: The benchmarks to analyse, with their generator benchmarks grouped by generator name
+        :return: A dictionary with the statistics per benchmark, in the order of the benchmarks
+        """
+        generator_engine = StatisticsEngine.from_grouped([grouped for _, grouped in benchmarks],
+                                                         BenchmarkStatistics.get_comparison_metrics())
+        statistics = generator_engine.percentual_comparison_dicts()
+
+        test_execution_benchmarks = [i for i, (benchmark, _) in enumerate(benchmarks) if
+                                     all(run_group.has_successful_runs for run_group in benchmark.run_groups)]
+        if test_execution_benchmarks:
+            run_group_engine = StatisticsEngine.from_grouped(
+                [BenchmarkStatistics.group_run_groups(*benchmarks[i]) for i in test_execution_benchmarks],
+                BenchmarkStatistics.get_test_execution_comparison_metrics())
+            for i, test_execution_statistics in zip(test_execution_benchmarks,
+                                                    run_group_engine.percentual_comparison_dicts()):
+                statistics[i].update(test_execution_statistics)
+
+        for benchmark_statistics, (benchmark, grouped_generators) in zip(statistics, benchmarks):
+            benchmark_statistics.update(DistributionStatistics.create_statistics(
+                BenchmarkStatistics.group_run_groups(benchmark, grouped_generators)))
+            if benchmark.model_graph is not None:
+                benchmark_statistics.update(RedundancyStatistics.create_statistics(
+                    benchmark.model_graph, benchmark.element_index,
+                    BenchmarkStatistics.group_run_groups(benchmark, grouped_generators)))
+
+        return statistics
+
+    @staticmethod
+    def get_statistics_tasks(benchmark: Benchmark, grouped_generators: dict[str, list[BenchmarkGenerator]]) -> list[
+        tuple[str, Callable, bool, tuple]]:
+        """
+        Get every statistic to create for a benchmark, in output order
+
+        :param benchmark: The benchmark to analyse
+        :param grouped_generators: The generator benchmarks to analyse, grouped by generator name
+        :return: A list of (statistic name, statistics function, whether the function takes the benchmark, extra
+                 arguments), in the same form as BenchmarkPlotter.get_plot_tasks
+        """
+        tasks = []
 
         for function_name, statistics_function in BenchmarkStatistics.get_statistics_functions().items():
-            statistics[function_name] = statistics_function(grouped_generators)
+            tasks.append((function_name, statistics_function, False, ()))
 
-        if all([run_group.successful_runs for run_group in benchmark.run_groups]):
+        if all(run_group.has_successful_runs for run_group in benchmark.run_groups):
             for function_name, statistics_function in BenchmarkStatistics.get_statistics_functions_test_execution().items():
-                statistics[function_name] = statistics_function(benchmark, grouped_generators)
+                tasks.append((function_name, statistics_function, True, ()))
 
-        return statistics
+        for metric in DISTRIBUTION_METRICS:
+            for statistic in DISTRIBUTION_STATISTICS:
+                tasks.append((f'{metric}_{statistic}', BenchmarkStatistics.distribution_statistic, True,
+                              (metric, statistic)))
+
+        if benchmark.model_graph is not None:
+            for metric in REDUNDANCY_METRICS:
+                tasks.append((f'average_{metric}', BenchmarkStatistics.redundancy_statistic, True, (metric,)))
+
+        return tasks
 
     @staticmethod
     def percentual_comparison(grouped_generators: dict[str, list[BenchmarkGenerator]],
@@ -68,23 +157,8 @@ class BenchmarkStatistics:
         :param value_lambda: The lambda function to get the value to compare
         :return: A dictionary with the percentual comparison
         """
-        percentual_comparison: dict[str, dict[int, float]] = {}
-
-        value_lowest: dict[int, int] = {}
-        for generator_name, generators in grouped_generators.items():
-            for generator in generators:
-                value = value_lambda(generator)
-                if generator.stop_coverage not in value_lowest or value < value_lowest[generator.stop_coverage]:
-                    value_lowest[generator.stop_coverage] = value
-
-        for generator_name, generators in grouped_generators.items():
-            percentual_comparison[generator_name] = {}
-            for generator in generators:
-                value = value_lambda(generator)
-                percentual_comparison[generator_name][generator.stop_coverage] = value / value_lowest[
-                    generator.stop_coverage] * 100
-
-        return percentual_comparison
+        engine = StatisticsEngine.from_grouped([grouped_generators], {'value': value_lambda})
+        return engine.percentual_comparison_dicts()[0]['value']
 
     @staticmethod
     def total_test_suite_size_comparison(grouped_generators: dict[str, list[BenchmarkGenerator]]) -> dict:
@@ -185,15 +259,21 @@ class BenchmarkStatistics:
         :param value_lambda: The lambda function to get the value to compare
         :return: A dictionary with the statistics
         """
-        grouped_run_groups = {}
-        for run_group in benchmark.run_groups_sorted:
-            if run_group.algorithm not in grouped_generators.keys():
-                continue  # Skip algorithms that are not in the grouped_generators
-            if run_group.algorithm not in grouped_run_groups:
-                grouped_run_groups[run_group.algorithm] = []
-            grouped_run_groups[run_group.algorithm].append(run_group)
+        return BenchmarkStatistics.percentual_comparison(
+            BenchmarkStatistics.group_run_groups(benchmark, grouped_generators), value_lambda)
 
-        return BenchmarkStatistics.percentual_comparison(grouped_run_groups, value_lambda)
+    @staticmethod
+    def group_run_groups(benchmark: Benchmark, grouped_generators: dict[str, list[BenchmarkGenerator]]) -> dict[
+        str, list[BenchmarkRunGroup]]:
+        """
+        Group the run groups of a benchmark in the series of their generators, see group_like
+
+        :param benchmark: The benchmark to get the run groups from
+        :param grouped_generators: The generator benchmarks, grouped by series, to use as whitelist
+        :return: The run groups, grouped by series, sorted by stop coverage
+        """
+        # Skip the run groups whose generators are not in the grouped_generators
+        return group_like(benchmark.run_groups_sorted, grouped_generators)
 
     @staticmethod
     def average_test_execution_time_comparison(benchmark: Benchmark,
@@ -234,3 +314,33 @@ class BenchmarkStatistics:
         """
         return BenchmarkStatistics.create_statistics_test_execution(benchmark, grouped_generators,
                                                                     lambda group: group.maximum_test_duration)
+
+    @staticmethod
+    def distribution_statistic(benchmark: Benchmark, grouped_generators: dict[str, list[BenchmarkGenerator]],
+                               metric: str, statistic: str) -> dict:
+        """
+        Calculate a distribution statistic of the per-run samples of a metric, see DistributionStatistics
+
+        :param benchmark: The benchmark to analyse
+        :param grouped_generators: The generator benchmarks, grouped by generator name, to use as whitelist
+        :param metric: The metric, one of DISTRIBUTION_METRICS
+        :param statistic: The statistic, one of DISTRIBUTION_STATISTICS
+        :return: A dictionary with the statistic per generator and stop coverage
+        """
+        return DistributionStatistics.distribution_statistic(
+            BenchmarkStatistics.group_run_groups(benchmark, grouped_generators), metric, statistic)
+
+    @staticmethod
+    def redundancy_statistic(benchmark: Benchmark, grouped_generators: dict[str, list[BenchmarkGenerator]],
+                             metric: str) -> dict:
+        """
+        Calculate the average of a path redundancy metric against the benchmark's model graph, see RedundancyStatistics
+
+        :param benchmark: The benchmark to analyse, with its model graph loaded
+        :param grouped_generators: The generator benchmarks, grouped by generator name, to use as whitelist
+        :param metric: The metric, one of REDUNDANCY_METRICS
+        :return: A dictionary with the average per generator and stop coverage
+        """
+        return RedundancyStatistics.create_statistics(
+            benchmark.model_graph, benchmark.element_index,
+            BenchmarkStatistics.group_run_groups(benchmark, grouped_generators), [metric])[f'average_{metric}']
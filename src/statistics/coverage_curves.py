@@ -0,0 +1,82 @@
+import numpy as np
+
+from models.benchmark_run_group import BenchmarkRunGroup
+from models.element_index import ElementIndex
+
+COVERAGE_CURVE_PERCENTILES = {'p10': 10, 'median': 50, 'p90': 90}
+
+
+class CoverageCurves:
+    """
+    A class used to compute the coverage reached after every step of the generated paths, from the integer coded paths
+    of the runs (see BenchmarkRun.path_codes)
+    """
+
+    @staticmethod
+    def cumulative_coverage(paths: list[np.ndarray], element_index: ElementIndex) -> dict[str, np.ndarray]:
+        """
+        Compute the vertex and edge coverage after every step of several paths at once. The paths are concatenated
+        with a distinct key per run and element, so the first visit of every element in every run is found with a
+        single sort, and counted with a single cumulative sum.
+
+        :param paths: The element coded paths
+        :param element_index: The index of the benchmark's elements
+        :return: The "vertex" and "edge" coverage in percentage, as matrices with a row per path and a column per step.
+                 Shorter paths keep their final coverage until the end of the longest path.
+        """
+        lengths = np.array([len(path) for path in paths], dtype=np.int64)
+        max_length = int(lengths.max()) if len(paths) else 0
+        if max_length == 0:
+            return {'vertex': np.zeros((len(paths), 0)), 'edge': np.zeros((len(paths), 0))}
+
+        codes = np.concatenate(paths).astype(np.int64)
+        runs = np.repeat(np.arange(len(paths)), lengths)
+        starts = np.cumsum(lengths) - lengths
+        steps = np.arange(len(codes)) - np.repeat(starts, lengths)
+
+        first_visits = np.zeros(len(codes), dtype=bool)
+        first_visits[np.unique(runs * (int(codes.max()) + 1) + codes, return_index=True)[1]] = True
+
+        non_empty = np.flatnonzero(lengths)
+        padding = np.arange(max_length)[np.newaxis, :] >= lengths[:, np.newaxis]
+
+        curves = {}
+        for kind, low, high in [('vertex', 0, element_index.vertex_count),
+                                ('edge', element_index.vertex_count, element_index.element_count)]:
+            new_elements = np.cumsum(first_visits & (codes >= low) & (codes < high))
+            # Counts before the start of every run, subtracted to restart the count per run
+            previous = np.concatenate([[0], new_elements])[starts]
+            counts = new_elements - np.repeat(previous, lengths)
+
+            curve = np.zeros((len(paths), max_length))
+            curve[runs, steps] = counts / max(high - low, 1) * 100
+            final = np.zeros(len(paths))
+            final[non_empty] = curve[non_empty, lengths[non_empty] - 1]
+            curves[kind] = np.where(padding, final[:, np.newaxis], curve)
+        return curves
+
+    @staticmethod
+    def run_group_curves(run_group: BenchmarkRunGroup, element_index: ElementIndex) -> dict[str, np.ndarray]:
+        """
+        Compute the coverage after every step of the runs of a run group, see cumulative_coverage. The curves are kept
+        with the run group's other aggregates.
+
+        :param run_group: The run group
+        :param element_index: The index of the benchmark's elements
+        :return: The "vertex" and "edge" coverage in percentage, with a row per run and a column per step
+        """
+        return run_group.cached('coverage_curves', lambda: CoverageCurves.cumulative_coverage(
+            run_group.path_codes(element_index), element_index))
+
+    @staticmethod
+    def aggregate(curves: np.ndarray) -> dict[str, np.ndarray]:
+        """
+        Aggregate the coverage curves of several runs per step
+
+        :param curves: The coverage curves, with a row per run and a column per step
+        :return: The curve of every percentile of COVERAGE_CURVE_PERCENTILES, by name
+        """
+        if curves.size == 0:
+            return {name: np.zeros(curves.shape[1]) for name in COVERAGE_CURVE_PERCENTILES}
+        values = np.percentile(curves, list(COVERAGE_CURVE_PERCENTILES.values()), axis=0)
+        return dict(zip(COVERAGE_CURVE_PERCENTILES, values))
@@ -0,0 +1,116 @@
+from typing import Callable
+
+import numpy as np
+
+from models.benchmark_generator import BenchmarkGenerator
+from models.benchmark_run_group import BenchmarkRunGroup
+from models.cross_benchmark import CrossBenchmark
+from statistics.benchmark_statistics import BenchmarkStatistics
+from statistics.statistics_engine import StatisticsEngine
+
+
+class CrossBenchmarkStatistics:
+    """
+    A class used to compare the results of the same generators across benchmarks of different models
+    """
+
+    @staticmethod
+    def get_metrics() -> dict[str, Callable[[BenchmarkGenerator], int]]:
+        """
+        Get the generator values to compare, before normalization by model size
+
+        :return: a dictionary with the value to compare per metric name
+        """
+        return {'generation_time_per_element': lambda generator: generator.average_generation_time,
+                'test_suite_size_per_element': lambda generator: generator.average_test_suite_size}
+
+    @staticmethod
+    def get_test_execution_metrics() -> dict[str, Callable[[BenchmarkRunGroup], float]]:
+        """
+        Get the run group values to compare, before normalization by model size
+
+        :return: a dictionary with the value to compare per metric name
+        """
+        return {'test_execution_time_per_element': lambda group: group.average_test_duration}
+
+    @staticmethod
+    def create_statistics(cross_benchmark: CrossBenchmark) -> dict[str, dict[str, dict[int, dict[str, float]]]]:
+        """
+        Create the statistics comparing the benchmarks. Every metric is divided by the size of the benchmark's model, in
+        the elements the generator's stop coverage is measured in (see CrossBenchmark.model_size). For every metric, a
+        "<metric>_delta" statistic holds the relative difference of each benchmark to the first one, in percentage.
+
+        :param cross_benchmark: The benchmarks to compare
+        :return: A dictionary of {statistic name: {series: {stop coverage: {benchmark name: value}}}}
+        """
+        benchmarks = cross_benchmark.benchmarks
+        grouped_generators = [cross_benchmark.grouped_generators(benchmark) for benchmark in benchmarks]
+
+        statistics = CrossBenchmarkStatistics._compare(
+            cross_benchmark, StatisticsEngine.from_grouped(grouped_generators, CrossBenchmarkStatistics.get_metrics()),
+            grouped_generators)
+
+        if all(run_group.has_successful_runs for benchmark in benchmarks for run_group in benchmark.run_groups):
+            aligned_keys = set(cross_benchmark.aligned_keys)
+            grouped_run_groups = []
+            for benchmark, grouped in zip(benchmarks, grouped_generators):
+                grouped_run_groups.append({series: [run_group for run_group in run_groups
+                                                    if (series, run_group.stop_coverage) in aligned_keys]
+                                           for series, run_groups in
+                                           BenchmarkStatistics.group_run_groups(benchmark, grouped).items()})
+            statistics.update(CrossBenchmarkStatistics._compare(
+                cross_benchmark, StatisticsEngine.from_grouped(grouped_run_groups,
+                                                               CrossBenchmarkStatistics.get_test_execution_metrics()),
+                grouped_run_groups))
+
+        return statistics
+
+    @staticmethod
+    def _compare(cross_benchmark: CrossBenchmark, engine: StatisticsEngine,
+                 grouped_items: list[dict[str, list]]) -> dict[str, dict[str, dict[int, dict[str, float]]]]:
+        """
+        Normalize the metrics of an engine loaded with one entry per benchmark, and compute their deltas to the first
+        benchmark
+        """
+        values = np.where(engine.present[..., np.newaxis], engine.values, np.nan)
+        normalized = values / CrossBenchmarkStatistics._model_sizes(cross_benchmark, engine, grouped_items)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            delta = (normalized / normalized[0] - 1) * 100
+
+        names = cross_benchmark.names
+        normalized = normalized.tolist()
+        delta = delta.tolist()
+        statistics = {}
+        for m, metric_name in enumerate(engine.metric_names):
+            statistics[metric_name] = {}
+            statistics[f'{metric_name}_delta'] = {}
+            for g, algorithm in enumerate(engine.generator_names):
+                statistics[metric_name][algorithm] = {}
+                statistics[f'{metric_name}_delta'][algorithm] = {}
+                # Generators without a stop coverage last
+                for c, coverage in sorted(enumerate(engine.coverages),
+                                          key=lambda item: (item[1] is None, item[1] or 0)):
+                    if not engine.present[:, g, c].all():
+                        continue
+                    statistics[metric_name][algorithm][coverage] = {
+                        name: normalized[b][g][c][m] for b, name in enumerate(names)}
+                    statistics[f'{metric_name}_delta'][algorithm][coverage] = {
+                        name: delta[b][g][c][m] for b, name in enumerate(names) if b > 0}
+        return statistics
+
+    @staticmethod
+    def _model_sizes(cross_benchmark: CrossBenchmark, engine: StatisticsEngine,
+                     grouped_items: list[dict[str, list]]) -> np.ndarray:
+        """
+        Get the model size every value of an engine is normalized by, shaped to divide its values, see
+        CrossBenchmark.model_size
+        """
+        generator_index = {series: g for g, series in enumerate(engine.generator_names)}
+        coverage_index = {coverage: c for c, coverage in enumerate(engine.coverages)}
+        sizes = np.ones(engine.present.shape)
+        for b, (benchmark, grouped) in enumerate(zip(cross_benchmark.benchmarks, grouped_items)):
+            for series, items in grouped.items():
+                for item in items:
+                    sizes[b, generator_index[series], coverage_index[item.stop_coverage]] = \
+                        CrossBenchmark.model_size(benchmark, item.generator_name)
+        return sizes[..., np.newaxis]
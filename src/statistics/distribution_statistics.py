@@ -0,0 +1,83 @@
+import numpy as np
+
+from models.benchmark_run_group import BenchmarkRunGroup
+
+DISTRIBUTION_METRICS = ['generation_time', 'test_suite_size']
+DISTRIBUTION_STATISTICS = ['median', 'p90', 'p99', 'std', 'iqr', 'cv']
+
+
+class DistributionStatistics:
+    """
+    A class used to describe the distribution of the per-run samples of every generator, from the individual run
+    reports rather than the aggregates of the benchmark report
+    """
+
+    @staticmethod
+    def sample_matrix(run_groups: list[BenchmarkRunGroup], metric: str) -> np.ndarray:
+        """
+        Collect the samples of a metric of several run groups in a single matrix
+
+        :param run_groups: The run groups
+        :param metric: The metric, see BenchmarkRunGroup.metric_values
+        :return: A matrix with a row per run group and a column per run, padded with NaN
+        """
+        samples = [run_group.metric_values(metric) for run_group in run_groups]
+        matrix = np.full((len(samples), max((len(values) for values in samples), default=0)), np.nan)
+        for row, values in enumerate(samples):
+            matrix[row, :len(values)] = values
+        return matrix
+
+    @staticmethod
+    def describe(samples: np.ndarray) -> dict[str, np.ndarray]:
+        """
+        Compute every distribution statistic of every row of a sample matrix at once
+
+        :param samples: The samples, a row per distribution, padded with NaN
+        :return: The value of every row, per statistic of DISTRIBUTION_STATISTICS
+        """
+        if samples.shape[1] == 0:
+            return {statistic: np.full(samples.shape[0], np.nan) for statistic in DISTRIBUTION_STATISTICS}
+
+        p25, median, p75, p90, p99 = np.nanpercentile(samples, [25, 50, 75, 90, 99], axis=1)
+        mean = np.nanmean(samples, axis=1)
+        std = np.nanstd(samples, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cv = std / mean
+        return {'median': median, 'p90': p90, 'p99': p99, 'std': std, 'iqr': p75 - p25, 'cv': cv}
+
+    @staticmethod
+    def create_statistics(grouped_run_groups: dict[str, list[BenchmarkRunGroup]],
+                          metrics: list[str] = None) -> dict[str, dict[str, dict[int, float]]]:
+        """
+        Create the distribution statistics of run groups
+
+        :param grouped_run_groups: The run groups, grouped by algorithm
+        :param metrics: The metrics to describe, default DISTRIBUTION_METRICS
+        :return: A dictionary of {"<metric>_<statistic>": {algorithm: {stop coverage: value}}}
+        """
+        run_groups = [run_group for groups in grouped_run_groups.values() for run_group in groups]
+
+        statistics = {}
+        for metric in metrics or DISTRIBUTION_METRICS:
+            described = DistributionStatistics.describe(DistributionStatistics.sample_matrix(run_groups, metric))
+            for statistic in DISTRIBUTION_STATISTICS:
+                values = iter(described[statistic].tolist())
+                statistics[f'{metric}_{statistic}'] = {
+                    algorithm: {run_group.stop_coverage: next(values) for run_group in groups}
+                    for algorithm, groups in grouped_run_groups.items()}
+        return statistics
+
+    @staticmethod
+    def distribution_statistic(grouped_run_groups: dict[str, list[BenchmarkRunGroup]], metric: str,
+                               statistic: str) -> dict[str, dict[int, float]]:
+        """
+        Create a single distribution statistic of run groups
+
+        :param grouped_run_groups: The run groups, grouped by algorithm
+        :param metric: The metric to describe, one of DISTRIBUTION_METRICS
+        :param statistic: The statistic, one of DISTRIBUTION_STATISTICS
+        :return: A dictionary of {algorithm: {stop coverage: value}}
+        """
+        if statistic not in DISTRIBUTION_STATISTICS:
+            raise ValueError(f'Unknown distribution statistic "{statistic}"')
+        return DistributionStatistics.create_statistics(grouped_run_groups, [metric])[f'{metric}_{statistic}']
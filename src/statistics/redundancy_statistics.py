@@ -0,0 +1,97 @@
+import numpy as np
+
+from models.benchmark_run_group import BenchmarkRunGroup
+from models.element_index import ElementIndex
+from models.model_graph import ModelGraph
+
+REDUNDANCY_METRICS = ['vertex_revisits', 'edge_revisits', 'excess_steps', 'walk_efficiency', 'chinese_postman_ratio']
+
+
+class RedundancyStatistics:
+    """
+    A class used to measure how much of every generated path is redundant, against the graph of the benchmark's model
+    (see ModelGraph). Steps are counted in edges traversed.
+    """
+
+    @staticmethod
+    def run_metrics(graph: ModelGraph, path: np.ndarray, vertex_coverage: bool = False) -> dict[str, float]:
+        """
+        Measure the redundancy of a single path
+
+        :param graph: The model graph
+        :param path: The element coded path, see BenchmarkRun.path_codes
+        :param vertex_coverage: Whether the path only had to cover vertices, so the shortest walk covering the same
+                                vertices is the baseline rather than the shortest walk covering the same edges
+        :return: The value of every metric of REDUNDANCY_METRICS:
+                 vertex_revisits and edge_revisits, the visits of already visited elements;
+                 excess_steps, the steps beyond the lower bound of the shortest walk covering the same elements;
+                 walk_efficiency, that lower bound as a percentage of the steps;
+                 chinese_postman_ratio, the steps as a percentage of the shortest walk covering the whole model
+        """
+        vertex_count = graph.vertex_count
+        edge_count = len(graph.edge_sources)
+        vertex_visits = np.bincount(path[path < vertex_count], minlength=vertex_count)
+        # Elements that are not in the model, see ElementIndex.unknown_code, are left out
+        edges = path[(path >= vertex_count) & (path < vertex_count + edge_count)] - vertex_count
+        edge_visits = np.bincount(edges, minlength=edge_count)
+        steps = int(edge_visits.sum())
+        start = int(path[0]) if len(path) and path[0] < vertex_count else graph.start
+
+        if vertex_coverage:
+            bound = max(np.count_nonzero(vertex_visits) - 1, 0)
+        else:
+            bound = graph.covering_walk_lower_bound(edge_visits > 0, start)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return {'vertex_revisits': float(vertex_visits.sum() - np.count_nonzero(vertex_visits)),
+                    'edge_revisits': float(steps - np.count_nonzero(edge_visits)),
+                    'excess_steps': float(steps - bound),
+                    'walk_efficiency': float(np.float64(bound) / steps * 100),
+                    'chinese_postman_ratio': float(steps / np.float64(graph.chinese_postman_bound) * 100)}
+
+    @staticmethod
+    def run_group_metrics(graph: ModelGraph, element_index: ElementIndex,
+                          run_group: BenchmarkRunGroup) -> dict[str, np.ndarray]:
+        """
+        Measure the redundancy of every path of a run group, see run_metrics. The values are kept with the run group's
+        other aggregates.
+
+        :param graph: The model graph
+        :param element_index: The index of the benchmark's elements
+        :param run_group: The run group
+        :return: The values of every run, per metric of REDUNDANCY_METRICS
+        """
+        def compute() -> dict[str, np.ndarray]:
+            vertex_coverage = run_group.generator_name.stop_condition.coverage_kind == 'vertex_coverage'
+            values = [RedundancyStatistics.run_metrics(graph, path, vertex_coverage)
+                      for path in run_group.path_codes(element_index)]
+            return {metric: np.array([run_values[metric] for run_values in values], dtype=np.float64)
+                    for metric in REDUNDANCY_METRICS}
+
+        return run_group.cached('redundancy', compute)
+
+    @staticmethod
+    def create_statistics(graph: ModelGraph, element_index: ElementIndex,
+                          grouped_run_groups: dict[str, list[BenchmarkRunGroup]],
+                          metrics: list[str] = None) -> dict[str, dict[str, dict[int, float]]]:
+        """
+        Create the average redundancy statistics of run groups
+
+        :param graph: The model graph
+        :param element_index: The index of the benchmark's elements
+        :param grouped_run_groups: The run groups, grouped by algorithm
+        :param metrics: The metrics to average, default REDUNDANCY_METRICS
+        :return: A dictionary of {"average_<metric>": {algorithm: {stop coverage: value}}}
+        """
+        statistics = {}
+        for metric in metrics or REDUNDANCY_METRICS:
+            statistics[f'average_{metric}'] = {
+                algorithm: {run_group.stop_coverage: RedundancyStatistics._mean(
+                    RedundancyStatistics.run_group_metrics(graph, element_index, run_group)[metric])
+                    for run_group in run_groups}
+                for algorithm, run_groups in grouped_run_groups.items()}
+        return statistics
+
+    @staticmethod
+    def _mean(values: np.ndarray) -> float:
+        return float(np.mean(values)) if len(values) else float('nan')
@@ -0,0 +1,176 @@
+from math import erfc, sqrt
+
+import numpy as np
+
+from models.benchmark import Benchmark
+from models.benchmark_run_group import BenchmarkRunGroup
+from utils.benchmark_filter import filter_grouped_generators
+
+COMPARED_METRICS = {'generation_time': 'GenerationTime', 'test_suite_size': 'TestSuiteSize',
+                    'test_duration': 'testDuration'}
+METHODS = ['mann_whitney', 'bootstrap']
+
+
+def rank_with_ties(values: np.ndarray) -> np.ndarray:
+    """
+    Rank values from 1 to n, giving tied values the average of their ranks
+
+    :param values: The values to rank
+    :return: The ranks, in the order of the values
+    """
+    unique, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    average_ranks = np.cumsum(counts) - (counts - 1) / 2
+    return average_ranks[inverse]
+
+
+def mann_whitney_u(baseline: np.ndarray, candidate: np.ndarray) -> tuple[float, float]:
+    """
+    One-sided Mann-Whitney U test of whether the candidate samples tend to be larger than the baseline samples, using
+    the normal approximation with tie and continuity correction
+
+    :param baseline: The baseline samples
+    :param candidate: The candidate samples
+    :return: The U statistic of the candidate, and the p-value
+    """
+    n_candidate, n_baseline = len(candidate), len(baseline)
+    n = n_candidate + n_baseline
+    combined = np.concatenate([candidate, baseline])
+    u = rank_with_ties(combined)[:n_candidate].sum() - n_candidate * (n_candidate + 1) / 2
+
+    _, counts = np.unique(combined, return_counts=True)
+    tie_correction = (counts ** 3 - counts).sum() / (n * (n - 1))
+    variance = n_candidate * n_baseline / 12 * ((n + 1) - tie_correction)
+    if variance <= 0:
+        return float(u), 1.0
+
+    z = (u - n_candidate * n_baseline / 2 - 0.5) / sqrt(variance)
+    return float(u), 0.5 * erfc(z / sqrt(2))
+
+
+def bootstrap_median_ratio(baseline: np.ndarray, candidate: np.ndarray, confidence: float = 0.95,
+                           resamples: int = 10000, seed: int = 0) -> tuple[float, float]:
+    """
+    Bootstrap confidence interval of the ratio of the candidate median to the baseline median. All resamples are
+    drawn and reduced at once. Equal medians have a ratio of 1, also when both are 0, and a larger candidate median
+    than a baseline median of 0 an infinite ratio. The bounds are resampled ratios, not interpolated between two.
+
+    :param baseline: The baseline samples
+    :param candidate: The candidate samples
+    :param confidence: The confidence level of the interval
+    :param resamples: The number of bootstrap resamples
+    :param seed: The seed of the random generator, for reproducible intervals
+    :return: The lower and upper bound of the ratio
+    """
+    rng = np.random.default_rng(seed)
+    baseline_medians = np.median(baseline[rng.integers(0, len(baseline), (resamples, len(baseline)))], axis=1)
+    candidate_medians = np.median(candidate[rng.integers(0, len(candidate), (resamples, len(candidate)))], axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = np.where(candidate_medians == baseline_medians, 1.0, candidate_medians / baseline_medians)
+    tail = (1 - confidence) / 2 * 100
+    low = np.percentile(ratios, tail, method='lower')
+    high = np.percentile(ratios, 100 - tail, method='higher')
+    return float(low), float(high)
+
+
+class RegressionDetector:
+    """
+    Detects performance regressions of the generators of a candidate benchmark compared to a baseline benchmark, by
+    testing the per-run samples of every generator and coverage level.
+    """
+
+    def __init__(self, method: str = 'mann_whitney', alpha: float = 0.05, threshold: float = 5.0,
+                 resamples: int = 10000, seed: int = 0):
+        """
+        Create a regression detector
+
+        :param method: The statistical test, "mann_whitney" or "bootstrap" (confidence interval of the median ratio)
+        :param alpha: The significance level
+        :param threshold: The minimum change of the median, in percentage, for a significant difference to count
+        :param resamples: The number of bootstrap resamples
+        :param seed: The seed of the bootstrap's random generator
+        """
+        if method not in METHODS:
+            raise ValueError(f'Unknown method "{method}", expected one of {", ".join(METHODS)}')
+        self.method = method
+        self.alpha = alpha
+        self.threshold = threshold
+        self.resamples = resamples
+        self.seed = seed
+
+    def compare(self, baseline: Benchmark, candidate: Benchmark, whitelist: list[str] = None,
+                blacklist: list[str] = None) -> list[dict]:
+        """
+        Compare every generator present in both benchmarks
+
+        :param baseline: The baseline benchmark
+        :param candidate: The candidate benchmark
+        :param whitelist: The whitelist of generators to compare
+        :param blacklist: The blacklist of generators to exclude
+        :return: One result per generator and metric, sorted by generator. The "status" of a result is "regression",
+                 "improvement" or "unchanged"
+        """
+        baseline_groups = self._run_groups(baseline, whitelist, blacklist)
+        candidate_groups = self._run_groups(candidate, whitelist, blacklist)
+
+        results = []
+        for name in sorted(baseline_groups.keys() & candidate_groups.keys(),
+                           key=lambda group_name: baseline_groups[group_name].generator_name.sort_key):
+            baseline_group, candidate_group = baseline_groups[name], candidate_groups[name]
+            for metric, key in COMPARED_METRICS.items():
+                baseline_values = baseline_group.metric_values(metric)
+                candidate_values = candidate_group.metric_values(metric)
+                if len(baseline_values) == 0 or len(candidate_values) == 0:
+                    continue  # No test results for the test execution metrics
+                results.append({'generator': name, 'algorithm': baseline_group.algorithm,
+                                'stop_coverage': baseline_group.stop_coverage, 'metric': key,
+                                **self.compare_samples(baseline_values, candidate_values)})
+        return results
+
+    def compare_samples(self, baseline: np.ndarray, candidate: np.ndarray) -> dict:
+        """
+        Compare the samples of a metric, where larger values are worse
+
+        :param baseline: The baseline samples
+        :param candidate: The candidate samples
+        :return: The medians and their change in percentage, the p-values (Mann-Whitney U) or the confidence
+                 interval of the change in percentage (bootstrap), and the status
+        """
+        baseline_median = float(np.median(baseline))
+        candidate_median = float(np.median(candidate))
+        if baseline_median:
+            change = (candidate_median / baseline_median - 1) * 100
+        else:
+            change = 0.0 if candidate_median == 0 else float('inf')
+        result = {'baseline_runs': len(baseline), 'candidate_runs': len(candidate),
+                  'baseline_median': baseline_median, 'candidate_median': candidate_median, 'change': change,
+                  'p_value': None, 'ci_low': None, 'ci_high': None}
+
+        if self.method == 'mann_whitney':
+            _, p_slower = mann_whitney_u(baseline, candidate)
+            _, p_faster = mann_whitney_u(candidate, baseline)
+            result['p_value'] = min(p_slower, p_faster)
+            slower, faster = p_slower < self.alpha, p_faster < self.alpha
+        else:
+            low, high = bootstrap_median_ratio(baseline, candidate, 1 - self.alpha, self.resamples, self.seed)
+            result['ci_low'], result['ci_high'] = (low - 1) * 100, (high - 1) * 100
+            slower, faster = low > 1, high < 1
+
+        if slower and change >= self.threshold:
+            result['status'] = 'regression'
+        elif faster and change <= -self.threshold:
+            result['status'] = 'improvement'
+        else:
+            result['status'] = 'unchanged'
+        return result
+
+    @staticmethod
+    def _run_groups(benchmark: Benchmark, whitelist: list[str], blacklist: list[str]) -> dict[str, BenchmarkRunGroup]:
+        """
+        Get the run groups of a benchmark by generator name, filtered by algorithm
+        """
+        grouped_run_groups = {}
+        for run_group in benchmark.run_groups:
+            grouped_run_groups.setdefault(run_group.algorithm, []).append(run_group)
+        return {run_group.name: run_group
+                for run_groups in filter_grouped_generators(grouped_run_groups, whitelist, blacklist).values()
+                for run_group in run_groups}
@@ -0,0 +1,118 @@
+from typing import Any, Callable
+
+import numpy as np
+
+
+class StatisticsEngine:
+    """
+    Vectorized comparison of generator metrics.
+
+    Every metric of every generator (or run group) is loaded once into a single
+    (benchmark x generator x coverage x metric) array, so that all comparisons of any number of benchmarks are computed
+    in one pass.
+    """
+
+    def __init__(self, values: np.ndarray, present: np.ndarray, generator_names: list[str], coverages: list[int],
+                 metric_names: list[str], layouts: list[list[tuple[str, list[int]]]]):
+        """
+        Create a statistics engine
+
+        :param values: The metric values, shaped (benchmark, generator, coverage, metric)
+        :param present: Whether a generator has a value at a coverage level, shaped (benchmark, generator, coverage)
+        :param generator_names: The generator names, in the order of the generator axis
+        :param coverages: The stop coverages, in the order of the coverage axis
+        :param metric_names: The metric names, in the order of the metric axis
+        :param layouts: Per benchmark, the (generator name, stop coverages) in their original order, used to rebuild
+                        the nested dictionaries
+        """
+        self.values = values
+        self.present = present
+        self.generator_names = generator_names
+        self.coverages = coverages
+        self.metric_names = metric_names
+        self.layouts = layouts
+
+    @classmethod
+    def from_grouped(cls, grouped_items: list[dict[str, list[Any]]],
+                     metrics: dict[str, Callable[[Any], int | float]]) -> 'StatisticsEngine':
+        """
+        Load the metrics of grouped generators or run groups, of one or more benchmarks
+
+        :param grouped_items: Per benchmark, the items to compare grouped by generator name. Every item needs a
+                              stop_coverage
+        :param metrics: The functions returning each metric of an item, by metric name
+        :return: The statistics engine
+        """
+        generator_index: dict[str, int] = {}
+        coverage_index: dict[int, int] = {}
+        for grouped in grouped_items:
+            for generator_name, items in grouped.items():
+                generator_index.setdefault(generator_name, len(generator_index))
+                for item in items:
+                    coverage_index.setdefault(item.stop_coverage, len(coverage_index))
+
+        metric_functions = list(metrics.values())
+        values = np.zeros((len(grouped_items), len(generator_index), len(coverage_index), len(metric_functions)))
+        present = np.zeros(values.shape[:3], dtype=bool)
+        layouts = []
+
+        for b, grouped in enumerate(grouped_items):
+            layout = []
+            for generator_name, items in grouped.items():
+                g = generator_index[generator_name]
+                for item in items:
+                    c = coverage_index[item.stop_coverage]
+                    values[b, g, c] = [metric_function(item) for metric_function in metric_functions]
+                    present[b, g, c] = True
+                layout.append((generator_name, [item.stop_coverage for item in items]))
+            layouts.append(layout)
+
+        return cls(values, present, list(generator_index), list(coverage_index), list(metrics), layouts)
+
+    def percentual_comparison(self) -> np.ndarray:
+        """
+        Calculate the percentual comparison of every metric, using the smallest value of a benchmark's generators at the
+        same coverage level as 100%
+
+        :return: The comparison, shaped like values, NaN where a generator has no value. Where the smallest value is 0,
+                 the other values are infinite and the zero values NaN
+        """
+        lowest = np.where(self.present[..., np.newaxis], self.values, np.inf).min(axis=1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            comparison = self.values / lowest * 100
+        comparison[~self.present] = np.nan
+        return comparison
+
+    def to_dicts(self, array: np.ndarray) -> list[dict[str, dict[str, dict[int, float]]]]:
+        """
+        Convert a result array back to nested dictionaries
+
+        :param array: The result, shaped like values
+        :return: Per benchmark, a dictionary of {metric name: {generator name: {stop coverage: value}}}, with the
+                 generators and coverages in their original order
+        """
+        generator_index = {name: g for g, name in enumerate(self.generator_names)}
+        coverage_index = {coverage: c for c, coverage in enumerate(self.coverages)}
+        values = array.tolist()
+
+        results = []
+        for b, layout in enumerate(self.layouts):
+            result = {metric_name: {} for metric_name in self.metric_names}
+            for generator_name, coverages in layout:
+                g = generator_index[generator_name]
+                for metric_name in self.metric_names:
+                    result[metric_name][generator_name] = {}
+                for coverage in coverages:
+                    metric_values = values[b][g][coverage_index[coverage]]
+                    for m, metric_name in enumerate(self.metric_names):
+                        result[metric_name][generator_name][coverage] = metric_values[m]
+            results.append(result)
+        return results
+
+    def percentual_comparison_dicts(self) -> list[dict[str, dict[str, dict[int, float]]]]:
+        """
+        Calculate the percentual comparison of every metric, as nested dictionaries
+
+        :return: Per benchmark, a dictionary of {metric name: {generator name: {stop coverage: percentage}}}
+        """
+        return self.to_dicts(self.percentual_comparison())
@@ -0,0 +1,362 @@
+import hashlib
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import IO, Iterator
+
+ARCHIVE_FORMATS = {'.zip': 'zip', '.tar.gz': 'tar.gz', '.tgz': 'tar.gz', '.tar.zst': 'tar.zst', '.tzst': 'tar.zst'}
+PACK_FORMATS = ['zip', 'tar.gz', 'tar.zst']
+# Directory of the temporary directory that tar archives are extracted to
+EXTRACT_DIR_NAME = 'benchmark_archives'
+
+# The archives opened by this process, by file and process ID, so a forked worker never shares a file handle
+_open_archives: dict[tuple[str, int], 'BenchmarkArchive'] = {}
+_open_archives_lock = threading.Lock()
+
+
+def archive_format(path: Path) -> str | None:
+    """
+    Get the format of a benchmark archive by its file name
+
+    :param path: The path of the archive
+    :return: The format, one of PACK_FORMATS, or None if the path is not an archive
+    """
+    name = Path(path).name.lower()
+    for suffix, archive_type in ARCHIVE_FORMATS.items():
+        if name.endswith(suffix):
+            return archive_type
+    return None
+
+
+def is_benchmark_archive(path: Path) -> bool:
+    """
+    Check whether a path is an archive of a benchmark output directory, by its file name
+
+    :param path: The path to check
+    :return: Whether the path is a file with an archive suffix of ARCHIVE_FORMATS
+    """
+    return Path(path).is_file() and archive_format(path) is not None
+
+
+def archive_benchmark_name(path: Path) -> str:
+    """
+    Get the name of the benchmark of an archive, its file name without the archive suffix
+
+    :param path: The path of the archive
+    :return: The benchmark name
+    """
+    name = Path(path).name
+    for suffix in ARCHIVE_FORMATS:
+        if name.lower().endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError('Reading and writing .tar.zst benchmark archives requires the zstandard package '
+                          '(\'pip install zstandard\')') from e
+    return zstandard
+
+
+def check_archive_format(archive_type: str):
+    """
+    Check that the optional packages an archive format needs are installed
+
+    :param archive_type: The format, one of PACK_FORMATS
+    :raises ImportError: If a package the format needs is not installed
+    """
+    if archive_type == 'tar.zst':
+        _zstandard()
+
+
+class BenchmarkArchive:
+    """
+    A benchmark output directory packed in a .zip, .tar.gz or .tar.zst archive.
+
+    The members of a zip archive are read on demand, without extracting them to disk. Compressed tar archives can only
+    be read from the start, so they are extracted in a single pass to the temporary directory the first time one is
+    opened, and read from there: the worker processes of a report, and later reports of the same archive, reuse the
+    extracted files instead of decompressing the archive again. Use open to share the archive within a process.
+    """
+
+    def __init__(self, file: Path):
+        """
+        Open a benchmark archive
+
+        :param file: The archive file
+        """
+        self.file = Path(file)
+        self.format = archive_format(self.file)
+        self._zip: zipfile.ZipFile | None = None
+        self._extracted: Path | None = None
+
+        if self.format == 'zip':
+            self._zip = zipfile.ZipFile(self.file)
+            names = [info.filename for info in self._zip.infolist() if not info.is_dir()]
+        elif self.format in ('tar.gz', 'tar.zst'):
+            self._extracted = self._extract_tar()
+            names = [file.relative_to(self._extracted).as_posix() for file in self._extracted.rglob('*')
+                     if file.is_file()]
+        else:
+            raise ValueError(f'Unknown benchmark archive format of \"{self.file}\", supported suffixes: '
+                             f'{", ".join(ARCHIVE_FORMATS)}')
+
+        self.files = {name.rstrip('/') for name in names}
+        self.dirs = {str(parent) for name in self.files for parent in PurePosixPath(name).parents}
+        self.dirs.discard('.')
+        self.dirs.add('')
+        self.root = self._find_root()
+
+    @classmethod
+    def open(cls, file: Path) -> 'BenchmarkArchive':
+        """
+        Get the archive of a file, opened once per process
+
+        :param file: The archive file
+        :return: The archive
+        """
+        key = (str(Path(file).absolute()), os.getpid())
+        with _open_archives_lock:
+            if key not in _open_archives:
+                _open_archives[key] = cls(file)
+            return _open_archives[key]
+
+    def _extract_tar(self) -> Path:
+        """
+        Extract a tar archive to the temporary directory in a single pass, unless this version of the archive, by its
+        size and modification time, was already extracted. The files are extracted to a new directory that is renamed
+        when complete, so processes opening the archive at the same time never read a partial extraction.
+
+        :return: The directory the archive is extracted to
+        """
+        archive_dir = Path(tempfile.gettempdir()) / EXTRACT_DIR_NAME / hashlib.sha1(
+            str(self.file.absolute()).encode()).hexdigest()
+        stat = self.file.stat()
+        extracted = archive_dir / f'{stat.st_size}_{stat.st_mtime_ns}'
+        if extracted.is_dir():
+            return extracted
+
+        # Extractions of previous versions of the archive, but not the ones in progress
+        if archive_dir.is_dir():
+            for previous in archive_dir.iterdir():
+                if not previous.name.startswith('.'):
+                    shutil.rmtree(previous, ignore_errors=True)
+
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        temp_dir = Path(tempfile.mkdtemp(prefix='.', dir=archive_dir))
+        try:
+            with open(self.file, 'rb') as f:
+                if self.format == 'tar.zst':
+                    stream = _zstandard().ZstdDecompressor().stream_reader(f)
+                    mode = 'r|'
+                else:
+                    stream = f
+                    mode = 'r|gz'
+                with tarfile.open(fileobj=stream, mode=mode) as tar:
+                    for member in tar:
+                        name = PurePosixPath(member.name[2:] if member.name.startswith('./') else member.name)
+                        if not member.isfile() or name.is_absolute() or '..' in name.parts:
+                            continue
+                        target = temp_dir / name
+                        target.parent.mkdir(parents=True, exist_ok=True)
+                        with tar.extractfile(member) as source, open(target, 'wb') as destination:
+                            shutil.copyfileobj(source, destination)
+            temp_dir.rename(extracted)
+        except OSError:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            # Extracted by another process in the meantime
+            if not extracted.is_dir():
+                raise
+        except BaseException:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+        return extracted
+
+    def _find_root(self) -> str:
+        """
+        Find the directory of the archive holding report.json: the archive's root, or its single top directory
+        """
+        if 'report.json' in self.files:
+            return ''
+        top_dirs = {name.split('/', 1)[0] for name in self.files if '/' in name}
+        for top_dir in sorted(top_dirs):
+            if f'{top_dir}/report.json' in self.files:
+                return top_dir
+        raise FileNotFoundError(f'{self.file} does not contain a benchmark report.json.')
+
+    def path(self) -> 'ArchivePath':
+        """
+        Get the benchmark directory of the archive
+
+        :return: The path of the directory holding report.json
+        """
+        return ArchivePath(self.file, self.root)
+
+    def read_bytes(self, member: str) -> bytes:
+        """
+        Read a file of the archive
+
+        :param member: The path of the file in the archive
+        :return: The content of the file
+        """
+        if member not in self.files:
+            raise FileNotFoundError(f'{self.file}/{member} does not exist.')
+        if self._zip is not None:
+            return self._zip.read(member)
+        return (self._extracted / member).read_bytes()
+
+    def open_member(self, member: str) -> IO[bytes]:
+        """
+        Open a file of the archive as a binary stream, decompressed while it is read for zip archives
+
+        :param member: The path of the file in the archive
+        :return: The binary stream
+        """
+        if member not in self.files:
+            raise FileNotFoundError(f'{self.file}/{member} does not exist.')
+        if self._zip is not None:
+            return self._zip.open(member)
+        return open(self._extracted / member, 'rb')
+
+    def iterdir(self, directory: str) -> Iterator[str]:
+        """
+        Iterate over the files and directories directly in a directory of the archive
+
+        :param directory: The path of the directory in the archive, '' for the root
+        :return: An iterator of the paths of the children in the archive
+        """
+        prefix = f'{directory}/' if directory else ''
+        children = {prefix + name[len(prefix):].split('/', 1)[0]
+                    for name in self.files | self.dirs if name.startswith(prefix) and name != directory}
+        return iter(sorted(children))
+
+
+class ArchivePath:
+    """
+    A file or directory in a benchmark archive, with the part of the pathlib.Path interface the benchmark models use,
+    so runs can be read from an archive as from a directory.
+
+    Only the archive file and member name are stored, so paths can be sent to worker processes, which open the archive
+    themselves when a member is read.
+    """
+
+    def __init__(self, archive_file: Path, member: str = ''):
+        """
+        Create an archive path
+
+        :param archive_file: The archive file
+        :param member: The path of the file or directory in the archive, '' for the root
+        """
+        self.archive_file = Path(archive_file)
+        self.member = member.strip('/')
+
+    @property
+    def archive(self) -> BenchmarkArchive:
+        """
+        The opened archive
+        """
+        return BenchmarkArchive.open(self.archive_file)
+
+    @property
+    def name(self) -> str:
+        return PurePosixPath(self.member).name if self.member else archive_benchmark_name(self.archive_file)
+
+    def __truediv__(self, other: str) -> 'ArchivePath':
+        return ArchivePath(self.archive_file, f'{self.member}/{other}' if self.member else str(other))
+
+    def exists(self) -> bool:
+        return self.is_file() or self.is_dir()
+
+    def is_file(self) -> bool:
+        return self.member in self.archive.files
+
+    def is_dir(self) -> bool:
+        return self.member in self.archive.dirs
+
+    def iterdir(self) -> Iterator['ArchivePath']:
+        if not self.is_dir():
+            raise NotADirectoryError(f'{self} is not a directory.')
+        return (ArchivePath(self.archive_file, child) for child in self.archive.iterdir(self.member))
+
+    def read_bytes(self) -> bytes:
+        return self.archive.read_bytes(self.member)
+
+    def read_text(self, encoding: str = 'utf-8') -> str:
+        return self.read_bytes().decode(encoding)
+
+    def open(self, mode: str = 'r', encoding: str = 'utf-8') -> IO:
+        if mode not in ('r', 'rb'):
+            raise ValueError(f'Benchmark archives are read-only, cannot open {self} with mode \"{mode}\"')
+        stream = self.archive.open_member(self.member)
+        return stream if mode == 'rb' else io.TextIOWrapper(stream, encoding=encoding)
+
+    def relative_to(self, other: 'ArchivePath') -> PurePosixPath:
+        return PurePosixPath(self.member).relative_to(other.member)
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, ArchivePath) and self.archive_file == other.archive_file
+                and self.member == other.member)
+
+    def __lt__(self, other: 'ArchivePath') -> bool:
+        return (str(self.archive_file), self.member) < (str(other.archive_file), other.member)
+
+    def __hash__(self) -> int:
+        return hash((self.archive_file, self.member))
+
+    def __str__(self) -> str:
+        return f'{self.archive_file}/{self.member}' if self.member else str(self.archive_file)
+
+    def __repr__(self) -> str:
+        return f'ArchivePath({str(self.archive_file)!r}, {self.member!r})'
+
+
+def pack_benchmark(benchmark_dir: Path, output_file: Path, archive_type: str = None, compression_level: int = None,
+                   exclude: list[str] = None):
+    """
+    Pack a benchmark output directory into an archive, which Benchmark.from_dir reads (see BenchmarkArchive). The
+    files are stored under a directory named after the benchmark.
+
+    :param benchmark_dir: The benchmark directory
+    :param output_file: The archive file to write
+    :param archive_type: The format, one of PACK_FORMATS, by default from the suffix of the output file
+    :param compression_level: The compression level, by default the format's default level
+    :param exclude: Names of the files and directories to leave out, such as the columnar cache
+    """
+    benchmark_dir = Path(benchmark_dir)
+    output_file = Path(output_file)
+    archive_type = archive_type or archive_format(output_file)
+    if archive_type not in PACK_FORMATS:
+        raise ValueError(f'Unknown archive format \"{archive_type}\", options: {", ".join(PACK_FORMATS)}')
+
+    exclude = set(exclude or [])
+    files = sorted(file for file in benchmark_dir.rglob('*')
+                   if file.is_file() and not exclude.intersection(file.relative_to(benchmark_dir).parts))
+    names = [f'{benchmark_dir.name}/{file.relative_to(benchmark_dir).as_posix()}' for file in files]
+
+    # Written next to the output, then renamed, so an interrupted pack never leaves a partial archive
+    temp_file = output_file.with_name(f'{output_file.name}.tmp')
+    if archive_type == 'zip':
+        with zipfile.ZipFile(temp_file, 'w', compression=zipfile.ZIP_DEFLATED,
+                             compresslevel=compression_level) as archive:
+            for file, name in zip(files, names):
+                archive.write(file, name)
+    elif archive_type == 'tar.gz':
+        with tarfile.open(temp_file, 'w:gz', compresslevel=9 if compression_level is None else compression_level) \
+                as archive:
+            for file, name in zip(files, names):
+                archive.add(file, name)
+    else:
+        compressor = _zstandard().ZstdCompressor(level=3 if compression_level is None else compression_level)
+        with open(temp_file, 'wb') as f, compressor.stream_writer(f) as stream, \
+                tarfile.open(fileobj=stream, mode='w|') as archive:
+            for file, name in zip(files, names):
+                archive.add(file, name)
+    temp_file.replace(output_file)
@@ -1,4 +1,189 @@
+import fnmatch
+import operator
+import re
+from functools import lru_cache
+from typing import Callable, TypeVar
+
 from models.benchmark_generator import BenchmarkGenerator
+from utils.benchmark_name_parser import GeneratorName, condition_kind, parse_generator_name
+
+T = TypeVar('T')
+
+_CLAUSE_PATTERN = re.compile(r'\s*(coverage|condition)\s*(>=|<=|!=|==|=|>|<)\s*(.*?)\s*', re.IGNORECASE)
+_RANGE_PATTERN = re.compile(r'(-?[\d.]+)\s*(?:\.\.|-)\s*(-?[\d.]+)')
+_COMPARISONS = {'>=': operator.ge, '<=': operator.le, '>': operator.gt, '<': operator.lt, '=': operator.eq,
+                '==': operator.eq, '!=': operator.ne}
+
+
+def _compile_text_matcher(pattern: str) -> Callable[[str], bool]:
+    """
+    Compile a case-insensitive glob, or a regular expression between slashes, into a predicate
+    """
+    if len(pattern) > 1 and pattern.startswith('/') and pattern.endswith('/'):
+        return re.compile(pattern[1:-1], re.IGNORECASE).search
+    return re.compile(fnmatch.translate(pattern), re.IGNORECASE).match
+
+
+def _parse_number(text: str, pattern: str) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        raise ValueError(f'Invalid coverage \"{text}\" in generator pattern \"{pattern}\"') from None
+
+
+class GeneratorPattern:
+    """
+    A pattern matching generators by their parsed name (see parse_generator_name):
+    "<algorithm>[:<clause>[:<clause>...]]".
+
+    The algorithm is a case-insensitive glob, such as "QuickRandom*", or a regular expression between slashes, such as
+    "/^(Random|QuickRandom)Path$/", or empty to match every algorithm. A pattern with parentheses, such as
+    "RandomPath(EdgeCoverage(8*))", matches the whole generator name instead. Every clause must hold:
+
+    - coverage<op><number> compares the stop coverage, with op one of >=, <=, >, <, =, !=. coverage=80..100 matches a
+      range. Generators without a stop coverage never match a coverage clause.
+    - condition=<glob or /regex/> matches the stop condition, or any of its terms as written, by name or by kind,
+      such as condition=reached_vertex or condition=ReachedVertex. condition!=<...> matches generators whose stop
+      condition does not.
+    """
+
+    def __init__(self, pattern: str):
+        """
+        Compile a generator pattern
+
+        :param pattern: The pattern
+        :raises ValueError: If a clause is not a coverage or condition clause
+        """
+        self.pattern = pattern
+        if pattern.startswith('/') and pattern.find('/', 1) != -1:
+            end = pattern.find('/', 1) + 1
+            head, clauses = pattern[:end], pattern[end:].split(':')[1:]
+        else:
+            head, *clauses = pattern.split(':')
+        head = head.strip() or '*'
+
+        self.matches_name = '(' in head and not head.startswith('/')
+        # A plain algorithm name is compared by equality, see GeneratorFilter
+        self.algorithm = head.lower() if not clauses and not self.matches_name and \
+            not any(character in head for character in '*?[/') else None
+        self._head_matcher = _compile_text_matcher(head)
+        self._predicates = [self._compile_clause(clause) for clause in clauses]
+
+    def _compile_clause(self, clause: str) -> Callable[[GeneratorName], bool]:
+        match = _CLAUSE_PATTERN.fullmatch(clause)
+        if match is None:
+            raise ValueError(f'Invalid clause \"{clause}\" in generator pattern \"{self.pattern}\", expected '
+                             f'coverage<op><number> or condition=<pattern>')
+        field, comparison, value = match.group(1).lower(), match.group(2), match.group(3)
+
+        if field == 'condition':
+            if comparison not in ('=', '==', '!='):
+                raise ValueError(f'Invalid condition comparison \"{comparison}\" in generator pattern '
+                                 f'\"{self.pattern}\", expected = or !=')
+            matcher = _compile_text_matcher(value)
+            # A glob written in camel case, such as ReachedVertex, also matches the kind, reached_vertex
+            kind_matcher = matcher if value.startswith('/') else _compile_text_matcher(condition_kind(value))
+            negate = comparison == '!='
+
+            def condition_predicate(name: GeneratorName) -> bool:
+                stop_condition = name.stop_condition
+                matched = matcher(stop_condition.text) is not None or any(
+                    matcher(str(term)) is not None or matcher(term.name) is not None
+                    or kind_matcher(term.kind) is not None for term in stop_condition.terms)
+                return matched != negate
+            return condition_predicate
+
+        range_match = _RANGE_PATTERN.fullmatch(value)
+        if range_match is not None and comparison in ('=', '=='):
+            low, high = (_parse_number(bound, self.pattern) for bound in range_match.groups())
+            return lambda name: name.stop_coverage is not None and low <= name.stop_coverage <= high
+
+        compare, number = _COMPARISONS[comparison], _parse_number(value, self.pattern)
+        return lambda name: name.stop_coverage is not None and compare(name.stop_coverage, number)
+
+    def matches(self, name: GeneratorName) -> bool:
+        """
+        Check whether a generator matches the pattern
+
+        :param name: The parsed generator name
+        :return: Whether the generator matches
+        """
+        if self._head_matcher(name.name if self.matches_name else name.algorithm) is None:
+            return False
+        return all(predicate(name) for predicate in self._predicates)
+
+    def __repr__(self) -> str:
+        return f'GeneratorPattern({self.pattern!r})'
+
+
+class GeneratorFilter:
+    """
+    A whitelist and blacklist of generator patterns (see GeneratorPattern), compiled once. A generator is kept if it
+    matches any whitelist pattern, or the whitelist is empty, and no blacklist pattern. Plain algorithm names are
+    looked up in a set, the other patterns are tested in order.
+    """
+
+    def __init__(self, whitelist: list[str] = None, blacklist: list[str] = None):
+        """
+        Compile a generator filter
+
+        :param whitelist: The patterns of the generators to include, or None to include every generator
+        :param blacklist: The patterns of the generators to exclude
+        """
+        self.whitelist = [GeneratorPattern(pattern) for pattern in whitelist or []]
+        self.blacklist = [GeneratorPattern(pattern) for pattern in blacklist or []]
+        self._whitelist_algorithms = {pattern.algorithm for pattern in self.whitelist if pattern.algorithm is not None}
+        self._whitelist_patterns = [pattern for pattern in self.whitelist if pattern.algorithm is None]
+        self._blacklist_algorithms = {pattern.algorithm for pattern in self.blacklist if pattern.algorithm is not None}
+        self._blacklist_patterns = [pattern for pattern in self.blacklist if pattern.algorithm is None]
+
+    @property
+    def is_empty(self) -> bool:
+        """
+        Whether the filter keeps every generator
+        """
+        return not self.whitelist and not self.blacklist
+
+    def matches(self, name: GeneratorName | str) -> bool:
+        """
+        Check whether a generator is kept by the filter
+
+        :param name: The generator name, parsed or not
+        :return: Whether the generator is kept
+        """
+        if isinstance(name, str):
+            name = parse_generator_name(name)
+        algorithm = name.algorithm.lower()
+        if self.whitelist and algorithm not in self._whitelist_algorithms and \
+                not any(pattern.matches(name) for pattern in self._whitelist_patterns):
+            return False
+        return algorithm not in self._blacklist_algorithms and \
+            not any(pattern.matches(name) for pattern in self._blacklist_patterns)
+
+    def filter_grouped(self, grouped: dict[str, list[T]]) -> dict[str, list[T]]:
+        """
+        Filter grouped generators or run groups, leaving out the groups without a kept generator
+
+        :param grouped: The generators or run groups, by algorithm, with a generator_name
+        :return: The kept generators or run groups, by algorithm
+        """
+        if self.is_empty:
+            return grouped
+        filtered = {key: [item for item in items if self.matches(item.generator_name)]
+                    for key, items in grouped.items()}
+        return {key: items for key, items in filtered.items() if items}
+
+
+@lru_cache(maxsize=64)
+def compile_generator_filter(whitelist: tuple[str, ...] | None, blacklist: tuple[str, ...] | None) -> GeneratorFilter:
+    """
+    Get the compiled filter of a whitelist and blacklist, compiled once per combination
+
+    :param whitelist: The patterns of the generators to include
+    :param blacklist: The patterns of the generators to exclude
+    :return: The filter
+    """
+    return GeneratorFilter(list(whitelist or []), list(blacklist or []))
 
 
 def filter_whitelist_grouped_generators(grouped_generators: dict[str, list[BenchmarkGenerator]],
@@ -7,12 +192,10 @@ def filter_whitelist_grouped_generators(grouped_generators: dict[str, list[Bench
     Filter grouped generators by the whitelist
 
     :param grouped_generators: The generator benchmarks to filter
-    :param whitelist: The whitelist of generators to include
+    :param whitelist: The patterns of the generators to include, see GeneratorPattern
     :return: The filtered generators
     """
-    if not whitelist:
-        return grouped_generators
-    return {key: value for key, value in grouped_generators.items() if key.lower() in [x.lower() for x in whitelist]}
+    return compile_generator_filter(tuple(whitelist or []), None).filter_grouped(grouped_generators)
 
 
 def filter_blacklist_grouped_generators(grouped_generators: dict[str, list[BenchmarkGenerator]],
@@ -21,13 +204,10 @@ def filter_blacklist_grouped_generators(grouped_generators: dict[str, list[Bench
     Filter grouped generators by the blacklist
 
     :param grouped_generators: The generator benchmarks to filter
-    :param blacklist: The blacklist of generators to exclude
+    :param blacklist: The patterns of the generators to exclude, see GeneratorPattern
     :return: The filtered generators
     """
-    if not blacklist:
-        return grouped_generators
-    return {key: value for key, value in grouped_generators.items() if
-            key.lower() not in [x.lower() for x in blacklist]}
+    return compile_generator_filter(None, tuple(blacklist or [])).filter_grouped(grouped_generators)
 
 
 def filter_grouped_generators(generators: dict[str, list[BenchmarkGenerator]], whitelist: list[str],
@@ -36,8 +216,8 @@ def filter_grouped_generators(generators: dict[str, list[BenchmarkGenerator]], w
     Filter the generators by the whitelist and blacklist
 
     :param generators: The generator benchmarks to filter
-    :param whitelist: The whitelist of generators to include
-    :param blacklist: The blacklist of generators to exclude
+    :param whitelist: The patterns of the generators to include, see GeneratorPattern
+    :param blacklist: The patterns of the generators to exclude, see GeneratorPattern
     :return: The filtered generators
     """
-    return filter_blacklist_grouped_generators(filter_whitelist_grouped_generators(generators, whitelist), blacklist)
+    return compile_generator_filter(tuple(whitelist or []), tuple(blacklist or [])).filter_grouped(generators)
@@ -1,3 +1,326 @@
+import re
+import warnings
+from functools import lru_cache
+from typing import Iterable, TypeVar
+
+_GENERATOR_PATTERN = re.compile(r'\s*([^()\s]+)\s*\((.*)\)\s*', re.DOTALL)
+_TERM_PATTERN = re.compile(r'\s*([A-Za-z_]\w*)\s*(?:\(\s*([^()]*?)\s*\))?\s*')
+_OPERATOR_PATTERN = re.compile(r'\s*(?:(and|or)\b|(&&|\|\|))\s*', re.IGNORECASE)
+_CAMEL_CASE_PATTERN = re.compile(r'(?<=[a-z0-9])(?=[A-Z])')
+_OPERATORS = {'and': 'and', 'or': 'or', '&&': 'and', '||': 'or'}
+
+T = TypeVar('T')
+
+
+class StopConditionTerm:
+    """
+    A single stop condition of a generator, such as EdgeCoverage(80), reached_vertex(v_Login) or TimeDuration(30).
+    """
+
+    __slots__ = ('name', 'kind', 'argument', 'coverage')
+
+    def __init__(self, name: str, argument: str | None):
+        """
+        Create a stop condition term
+
+        :param name: The name of the condition as written, e.g. "EdgeCoverage" or "edge_coverage"
+        :param argument: The argument of the condition as written, or None if it has none
+        """
+        self.name = name
+        self.kind = condition_kind(name)
+        self.argument = argument
+        self.coverage = parse_number(argument) if self.kind.endswith('coverage') else None
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, StopConditionTerm) and (self.kind, self.argument) == (other.kind, other.argument)
+
+    def __hash__(self) -> int:
+        return hash((self.kind, self.argument))
+
+    def __str__(self) -> str:
+        return self.name if self.argument is None else f'{self.name}({self.argument})'
+
+    def __repr__(self) -> str:
+        return f'StopConditionTerm({self.name!r}, {self.argument!r})'
+
+
+class StopCondition:
+    """
+    The stop condition of a generator: one or more terms joined by "and" or "or", as GraphWalker combines them.
+    """
+
+    __slots__ = ('text', 'terms', 'operators')
+
+    def __init__(self, text: str, terms: tuple[StopConditionTerm, ...], operators: tuple[str, ...]):
+        """
+        Create a stop condition, use parse_stop_condition
+
+        :param text: The stop condition as written
+        :param terms: The terms, in order
+        :param operators: The operator between every two consecutive terms, "and" or "or"
+        """
+        self.text = text
+        self.terms = terms
+        self.operators = operators
+
+    @property
+    def coverage(self) -> int | float | None:
+        """
+        The coverage of the first coverage term, the stop coverage generators are grouped and plotted by
+
+        :return: The coverage, or None if no term is a coverage condition
+        """
+        return next((term.coverage for term in self.terms if term.coverage is not None), None)
+
+    @property
+    def coverage_kind(self) -> str | None:
+        """
+        The kind of the first coverage term, "edge_coverage" or "vertex_coverage", which the stop coverage is measured in
+
+        :return: The kind, or None if no term is a coverage condition
+        """
+        return next((term.kind for term in self.terms if term.coverage is not None), None)
+
+    @property
+    def kinds(self) -> tuple[str, ...]:
+        """
+        The kind of every term, in snake case, e.g. ("edge_coverage", "reached_vertex")
+        """
+        return tuple(term.kind for term in self.terms)
+
+    def __str__(self) -> str:
+        return self.text
+
+
+class GeneratorName:
+    """
+    A generator or run group folder name, such as "RandomPath(EdgeCoverage(80))", parsed into its algorithm and stop
+    condition.
+    """
+
+    __slots__ = ('name', 'algorithm', 'stop_condition')
+
+    def __init__(self, name: str, algorithm: str, stop_condition: StopCondition):
+        """
+        Create a generator name, use parse_generator_name
+
+        :param name: The generator name
+        :param algorithm: The path generation algorithm
+        :param stop_condition: The stop condition
+        """
+        self.name = name
+        self.algorithm = algorithm
+        self.stop_condition = stop_condition
+
+    @property
+    def stop_coverage(self) -> int | float | None:
+        """
+        The stop coverage, see StopCondition.coverage
+        """
+        return self.stop_condition.coverage
+
+    @property
+    def series(self) -> str:
+        """
+        The series the generator is compared and plotted in over the stop coverage, so that generators of a series only
+        differ in their stop coverage: the algorithm if the stop condition is a single coverage term, otherwise the
+        qualified series, see qualified_series
+        """
+        terms = self.stop_condition.terms
+        if len(terms) == 1 and terms[0].coverage is not None:
+            return self.algorithm
+        return self.qualified_series
+
+    @property
+    def qualified_series(self) -> str:
+        """
+        The algorithm and the stop condition with the stop coverage replaced by "%", e.g. "RandomPath(EdgeCoverage(%))",
+        "RandomPath(EdgeCoverage(%) or TimeDuration(5))" or "RandomPath(TimeDuration(30))". The series of generators
+        whose algorithm stops at more than one coverage kind, see group_by_series.
+        """
+        terms = self.stop_condition.terms
+        coverage_term = next((term for term in terms if term.coverage is not None), None)
+        texts = [f'{term.name}(%)' if term is coverage_term else str(term) for term in terms]
+        condition = texts[0] + ''.join(f' {operator} {text}'
+                                       for operator, text in zip(self.stop_condition.operators, texts[1:]))
+        return f'{self.algorithm}({condition})'
+
+    def series_among(self, mixed_algorithms: set[str]) -> str:
+        """
+        The series of the generator among others, the qualified series if its algorithm stops at more than one coverage
+        kind among them, otherwise its series
+
+        :param mixed_algorithms: The algorithms stopping at more than one coverage kind, see mixed_coverage_algorithms
+        :return: The series
+        """
+        return self.qualified_series if self.algorithm in mixed_algorithms else self.series
+
+    @property
+    def sort_key(self) -> tuple:
+        """
+        The key generators are sorted by: algorithm, then stop coverage, with generators without a coverage last, then
+        stop condition
+        """
+        return self.algorithm, self.stop_coverage is None, self.stop_coverage or 0, self.stop_condition.text
+
+    def __str__(self) -> str:
+        return self.name
+
+    def __repr__(self) -> str:
+        return f'GeneratorName({self.name!r})'
+
+
+def condition_kind(name: str) -> str:
+    """
+    Get the kind of a stop condition by its name, in snake case: "EdgeCoverage" and "edge_coverage" are both
+    "edge_coverage"
+
+    :param name: The name of the condition as written
+    :return: The kind
+    """
+    return _CAMEL_CASE_PATTERN.sub('_', name).lower()
+
+
+def parse_number(text: str | None) -> int | float | None:
+    """
+    Parse a coverage or other condition argument as it is written, an integer where possible
+
+    :param text: The text to parse
+    :return: The number, or None if the text is None or not a number
+    """
+    if text is None:
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        try:
+            return float(text)
+        except ValueError:
+            return None
+
+
+@lru_cache(maxsize=None)
+def parse_stop_condition(stop_condition: str) -> StopCondition:
+    """
+    Parse a stop condition, such as "EdgeCoverage(80)" or "edge_coverage(80) and reached_vertex(v_Login)". Parsed stop
+    conditions are cached, the same object is returned for the same text.
+
+    :param stop_condition: The stop condition
+    :return: The parsed stop condition
+    :raises ValueError: If the stop condition is not one or more terms joined by and, or, && or ||
+    """
+    terms = []
+    operators = []
+    position = 0
+    while True:
+        match = _TERM_PATTERN.match(stop_condition, position)
+        if match is None:
+            raise ValueError(f'Cannot parse stop condition \"{stop_condition}\" at position {position}')
+        terms.append(StopConditionTerm(match.group(1), match.group(2)))
+        position = match.end()
+        if position == len(stop_condition):
+            return StopCondition(stop_condition, tuple(terms), tuple(operators))
+
+        match = _OPERATOR_PATTERN.match(stop_condition, position)
+        if match is None:
+            raise ValueError(f'Cannot parse stop condition \"{stop_condition}\" at position {position}')
+        operators.append(_OPERATORS[(match.group(1) or match.group(2)).lower()])
+        position = match.end()
+
+
+@lru_cache(maxsize=None)
+def parse_generator_name(name: str) -> GeneratorName:
+    """
+    Parse a generator name, "<algorithm>(<stop condition>)". Parsed names are cached, the same object is returned for
+    the same name.
+
+    :param name: The generator name
+    :return: The parsed name
+    :raises ValueError: If the name is not an algorithm followed by a stop condition in parentheses
+    """
+    match = _GENERATOR_PATTERN.fullmatch(name)
+    if match is None:
+        raise ValueError(f'Cannot parse generator name \"{name}\"')
+    return GeneratorName(name, match.group(1), parse_stop_condition(match.group(2).strip()))
+
+
+def mixed_coverage_algorithms(names: Iterable[GeneratorName]) -> set[str]:
+    """
+    Get the algorithms whose generators stop at a single coverage term of more than one kind, such as
+    RandomPath(EdgeCoverage(80)) and RandomPath(VertexCoverage(80)). Their series are qualified by the stop condition.
+
+    :param names: The generator names
+    :return: The algorithms
+    """
+    kinds = {}
+    for name in names:
+        terms = name.stop_condition.terms
+        if len(terms) == 1 and terms[0].coverage is not None:
+            kinds.setdefault(name.algorithm, set()).add(terms[0].kind)
+    return {algorithm for algorithm, algorithm_kinds in kinds.items() if len(algorithm_kinds) > 1}
+
+
+def group_by_series(items: Iterable[T], mixed_algorithms: set[str] = None) -> dict[str, list[T]]:
+    """
+    Group generators or run groups by series, see GeneratorName.series, keeping their order. The series of an algorithm
+    stopping at more than one coverage kind is qualified by the stop condition, e.g. RandomPath(EdgeCoverage(%)) and
+    RandomPath(VertexCoverage(%)). Statistics and plots are keyed by series and stop coverage, so an item of the same
+    series and stop coverage as an earlier one, such as RandomPath(edge_coverage(80.0)) after
+    RandomPath(EdgeCoverage(80)), is left out with a warning.
+
+    :param items: The generators or run groups, with a generator_name
+    :param mixed_algorithms: The algorithms whose series to qualify, by default those of the items, see
+    mixed_coverage_algorithms
+    :return: The items, by series
+    """
+    items = list(items)
+    if mixed_algorithms is None:
+        mixed_algorithms = mixed_coverage_algorithms(item.generator_name for item in items)
+
+    grouped = {}
+    keys = {}
+    for item in items:
+        name = item.generator_name
+        series = name.series_among(mixed_algorithms)
+        key = (series, name.stop_coverage)
+        if key in keys:
+            warnings.warn(f'Leaving out generator \"{name.name}\", it has the same series and stop coverage as '
+                          f'\"{keys[key]}\"', stacklevel=2)
+            continue
+        keys[key] = name.name
+        grouped.setdefault(series, []).append(item)
+    return grouped
+
+
+def group_like(items: Iterable[T], grouped_generators: dict[str, list]) -> dict[str, list[T]]:
+    """
+    Group run groups in the series of the generators of the same name, keeping their order. Run groups without a
+    generator in the grouped generators are left out.
+
+    :param items: The run groups, or other items with a generator_name
+    :param grouped_generators: The generators, grouped by series
+    :return: The items, by series
+    """
+    series_by_name = series_of(grouped_generators)
+    grouped = {}
+    for item in items:
+        series = series_by_name.get(item.generator_name.name)
+        if series is not None:
+            grouped.setdefault(series, []).append(item)
+    return grouped
+
+
+def series_of(grouped_generators: dict[str, list]) -> dict[str, str]:
+    """
+    Get the series of each grouped generator
+
+    :param grouped_generators: The generators, grouped by series
+    :return: The series, by generator name
+    """
+    return {generator.generator_name.name: series
+            for series, generators in grouped_generators.items() for generator in generators}
+
+
 def parse_algorithm_from_name(name: str) -> str:
     """
     Parse the algorithm from a generator name.
@@ -5,7 +328,7 @@ def parse_algorithm_from_name(name: str) -> str:
     :param name: The generator name.
     :return: The algorithm.
     """
-    return name.split("(")[0]
+    return parse_generator_name(name).algorithm
 
 
 def parse_stop_condition_from_name(name: str) -> str:
@@ -15,18 +338,14 @@ def parse_stop_condition_from_name(name: str) -> str:
     :param name: The generator name.
     :return: The stop condition.
     """
-    start = name.find("(")
-    end = name.rfind(")")
-    return name[start + 1:end]
+    return parse_generator_name(name).stop_condition.text
 
 
-def parse_coverage_from_stop_condition(stop_condition: str) -> int:
+def parse_coverage_from_stop_condition(stop_condition: str) -> int | float | None:
     """
     Parse the coverage from a stop condition.
 
     :param stop_condition: The stop condition.
-    :return: The coverage.
+    :return: The coverage of the first coverage term, or None if it has none.
     """
-    start = stop_condition.lower().find("coverage(")
-    end = stop_condition.find(")")
-    return int(stop_condition[start + 9:end])
+    return parse_stop_condition(stop_condition).coverage
@@ -0,0 +1,59 @@
+import glob
+from pathlib import Path
+
+from models.run_store import RUN_STORE_SUFFIX, is_run_store
+from utils.benchmark_archive import archive_benchmark_name, is_benchmark_archive
+
+
+def is_benchmark_dir(path: Path) -> bool:
+    """
+    Check whether a path is a benchmark output directory, an archive of one (see BenchmarkArchive) or a run store (see
+    RunStore)
+
+    :param path: The path to check
+    :return: Whether the path is a directory with a benchmark report, a benchmark archive or a run store
+    """
+    return (path.is_dir() and (path / "report.json").exists()) or is_benchmark_archive(path) or is_run_store(path)
+
+
+def benchmark_name(path: Path) -> str:
+    """
+    Get the name of a benchmark from its path, without loading it
+
+    :param path: The benchmark directory, archive or run store
+    :return: The name of the benchmark, as Benchmark.from_dir names it
+    """
+    if is_run_store(path):
+        return path.name[:-len(RUN_STORE_SUFFIX)]
+    return archive_benchmark_name(path)
+
+
+def find_benchmark_dirs(patterns: list[str]) -> list[Path]:
+    """
+    Find the benchmark directories matching a list of paths or glob patterns. A directory that is not a benchmark
+    itself is searched for benchmark subdirectories, benchmark archives and run stores.
+
+    :param patterns: The benchmark directories, parent directories or glob patterns
+    :return: The benchmark directories, in the order of the patterns and sorted by name within a pattern
+    :raises FileNotFoundError: If a path does not exist, or a glob pattern matches nothing
+    """
+    benchmark_dirs: dict[Path, None] = {}
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            paths = [Path(match) for match in sorted(glob.glob(pattern))]
+            if not paths:
+                raise FileNotFoundError(f"No paths match \"{pattern}\".")
+        else:
+            paths = [Path(pattern)]
+            if not paths[0].exists():
+                raise FileNotFoundError(f"{paths[0].absolute()} does not exist.")
+
+        for path in paths:
+            if is_benchmark_dir(path):
+                benchmark_dirs.setdefault(path, None)
+            elif path.is_dir():
+                for child in sorted(path.iterdir()):
+                    if is_benchmark_dir(child):
+                        benchmark_dirs.setdefault(child, None)
+
+    return list(benchmark_dirs)
@@ -0,0 +1,99 @@
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def resolve_jobs(jobs: int | None) -> int:
+    """
+    Resolve the number of workers to use.
+
+    :param jobs: The requested number of workers, 0 or less to use every available CPU
+    :return: The number of workers
+    """
+    if jobs is None:
+        return 1
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def create_executor(jobs: int | None, use_threads: bool = False, initializer: Callable = None,
+                    initargs: tuple = ()) -> Executor | None:
+    """
+    Create a worker pool.
+
+    :param jobs: The number of workers, 0 or less to use every available CPU
+    :param use_threads: Whether to use a thread pool instead of a process pool
+    :param initializer: Function called at the start of every worker
+    :param initargs: Arguments passed to the initializer
+    :return: The executor, or None if the work should run serially
+    """
+    jobs = resolve_jobs(jobs)
+    if jobs <= 1:
+        return None
+    if use_threads:
+        return ThreadPoolExecutor(max_workers=jobs, initializer=initializer, initargs=initargs)
+    return ProcessPoolExecutor(max_workers=jobs, initializer=initializer, initargs=initargs)
+
+
+def parallel_map(function: Callable[[T], R], items: Iterable[T], jobs: int | None = 1,
+                 use_threads: bool = False, initializer: Callable = None, initargs: tuple = ()) -> list[R]:
+    """
+    Apply a function to every item, optionally across a worker pool. Results keep the order of the items.
+
+    :param function: The function to apply, must be picklable when using a process pool
+    :param items: The items to apply the function to
+    :param jobs: The number of workers, 0 or less to use every available CPU
+    :param use_threads: Whether to use a thread pool instead of a process pool
+    :param initializer: Function called at the start of every worker, or once before a serial run
+    :param initargs: Arguments passed to the initializer
+    :return: The results, in the order of the items
+    """
+    items = list(items)
+    executor = create_executor(min(resolve_jobs(jobs), max(len(items), 1)), use_threads, initializer, initargs)
+    if executor is None:
+        if initializer is not None:
+            initializer(*initargs)
+        return [function(item) for item in items]
+
+    with executor:
+        return list(executor.map(function, items))
+
+
+def parallel_imap(function: Callable[[T], R], items: Iterable[T], jobs: int | None = 1,
+                  use_threads: bool = False, initializer: Callable = None, initargs: tuple = ()) -> Iterator[R]:
+    """
+    Lazily apply a function to every item, optionally across a worker pool. Results are yielded in the order of the
+    items as soon as they are available, with at most twice the number of workers in flight, so that finished results
+    do not pile up in memory.
+
+    :param function: The function to apply, must be picklable when using a process pool
+    :param items: The items to apply the function to
+    :param jobs: The number of workers, 0 or less to use every available CPU
+    :param use_threads: Whether to use a thread pool instead of a process pool
+    :param initializer: Function called at the start of every worker, or once before a serial run
+    :param initargs: Arguments passed to the initializer
+    :return: An iterator over the results, in the order of the items
+    """
+    items = list(items)
+    jobs = min(resolve_jobs(jobs), max(len(items), 1))
+    executor = create_executor(jobs, use_threads, initializer, initargs)
+    if executor is None:
+        if initializer is not None:
+            initializer(*initargs)
+        for item in items:
+            yield function(item)
+        return
+
+    with executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(function, item))
+            if len(pending) >= jobs * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,68 @@
+import json
+import re
+from array import array
+from itertools import repeat
+from pathlib import Path
+from typing import Iterator, TextIO
+
+import numpy as np
+
+PATH_CHUNK_SIZE = 1 << 16
+
+_ELEMENT_ID_PATTERN = re.compile(r'"elementId"\s*:\s*"([^"\\]*(?:\\.[^"\\]*)*)"')
+
+
+def iter_element_id_batches(stream: TextIO, chunk_size: int = PATH_CHUNK_SIZE) -> Iterator[list[str]]:
+    """
+    Iterate over the element IDs of the steps of a path, reading the path in chunks.
+
+    :param stream: The text stream of the path JSON, a list of {"elementId": ...} steps.
+    :param chunk_size: The number of characters to read at once.
+    :return: An iterator of the element IDs of every chunk, in path order.
+    """
+    buffer = ''
+    while True:
+        chunk = stream.read(chunk_size)
+        buffer += chunk
+
+        end = 0
+        element_ids = []
+        for match in _ELEMENT_ID_PATTERN.finditer(buffer):
+            element_ids.append(match.group(1))
+            end = match.end()
+        if element_ids:
+            yield [json.loads(f'"{element_id}"') if '\\' in element_id else element_id for element_id in element_ids]
+
+        if not chunk:
+            return
+        # Keep the unmatched tail, it may hold the start of a step cut off by the chunk boundary
+        buffer = buffer[end:]
+
+
+def iter_element_ids(file: Path, chunk_size: int = PATH_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Iterate over the element IDs of the steps of a path file, without loading the whole file.
+
+    :param file: The path file, a Path or an ArchivePath.
+    :param chunk_size: The number of characters to read at once.
+    :return: An iterator of the element IDs, in path order.
+    """
+    with file.open(encoding='utf-8') as stream:
+        for element_ids in iter_element_id_batches(stream, chunk_size):
+            yield from element_ids
+
+
+def intern_path(file: Path, element_index: dict[str, int], unknown_code: int) -> np.ndarray:
+    """
+    Read a path file as integer codes.
+
+    :param file: The path file, a Path or an ArchivePath.
+    :param element_index: The code per element ID, not modified.
+    :param unknown_code: The code of every element ID that is not in the index.
+    :return: The code of every step of the path.
+    """
+    codes = array('i')
+    with file.open(encoding='utf-8') as stream:
+        for element_ids in iter_element_id_batches(stream):
+            codes.extend(map(element_index.get, element_ids, repeat(unknown_code, len(element_ids))))
+    return np.frombuffer(codes, dtype=np.int32) if codes else np.empty(0, dtype=np.int32)
@@ -0,0 +1,229 @@
+import json
+import platform
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter, process_time
+from typing import Callable, ContextManager, Iterator
+
+TIMINGS_FILE_NAME = 'timings.json'
+TIMINGS_VERSION = 1
+
+# The measurements of this process that are in progress, outermost first
+_open_measurements: list['Measurement'] = []
+# How memory is measured in this process, decided by the first measurement, see memory_source
+_memory_source: str | None = None
+
+
+def memory_source() -> str:
+    """
+    Get how this process measures memory. On Linux the peak resident set size can be reset, so the peak of every
+    measurement is the peak resident set size of the process, at almost no cost. Elsewhere the peak memory allocated
+    through tracemalloc is used, which is started by the first measurement and slows allocations down while it runs.
+
+    :return: "rss" for the resident set size, or "traced" for tracemalloc
+    """
+    global _memory_source
+    if _memory_source is None:
+        try:
+            _reset_peak_rss()
+            _memory_source = 'rss'
+        except OSError:
+            _memory_source = 'traced'
+            tracemalloc.start()
+    return _memory_source
+
+
+def _reset_peak_rss():
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')
+
+
+def _memory_usage() -> tuple[int, int]:
+    """
+    Get the current and peak memory of this process, in bytes, see memory_source
+    """
+    if memory_source() == 'traced':
+        return tracemalloc.get_traced_memory()
+
+    current = peak = 0
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                current = int(line.split()[1]) * 1024
+            elif line.startswith('VmHWM:'):
+                peak = int(line.split()[1]) * 1024
+    return current, peak
+
+
+def _reset_peak():
+    if memory_source() == 'traced':
+        tracemalloc.reset_peak()
+    else:
+        _reset_peak_rss()
+
+
+class Measurement:
+    """
+    Measures the wall time, CPU time and peak memory of a block of code, see memory_source. Measurements can be nested,
+    the peak memory of an outer measurement includes the peaks of the measurements inside it.
+    """
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.start_memory = 0
+        self.peak_memory = 0
+        self._start = 0.0
+        self._start_cpu = 0.0
+
+    def __enter__(self) -> 'Measurement':
+        # The peak is reset for this measurement, the peak so far is kept by the measurements it is nested in
+        current, peak = _memory_usage()
+        for measurement in _open_measurements:
+            measurement.peak_memory = max(measurement.peak_memory, peak)
+        _reset_peak()
+
+        self.start_memory = current
+        self.peak_memory = current
+        _open_measurements.append(self)
+        self._start = perf_counter()
+        self._start_cpu = process_time()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.seconds = perf_counter() - self._start
+        self.cpu_seconds = process_time() - self._start_cpu
+        self.peak_memory = max(self.peak_memory, _memory_usage()[1])
+        _open_measurements.remove(self)
+
+    def to_dict(self) -> dict[str, float | int]:
+        """
+        Get the measured values
+
+        :return: The wall time and CPU time in seconds, the peak memory in bytes, and the increase of the peak over the
+                 memory at the start in bytes
+        """
+        return {'seconds': self.seconds, 'cpu_seconds': self.cpu_seconds, 'peak_memory': self.peak_memory,
+                'memory_increase': self.peak_memory - self.start_memory}
+
+
+def measure(function: Callable, *args) -> tuple[object, dict[str, float | int]]:
+    """
+    Call a function and measure it, see Measurement. Used to measure work done in a worker process, whose measurement
+    is then recorded by the Profiler of the main process.
+
+    :param function: The function to call
+    :param args: The arguments to call the function with
+    :return: The result of the function, and its measurement as in Measurement.to_dict
+    """
+    with Measurement() as measurement:
+        result = function(*args)
+    return result, measurement.to_dict()
+
+
+class Profiler:
+    """
+    Records the time and peak memory of the stages of a report, as written to timings.json by the --profile option.
+
+    Stages are nested with the stage context manager, every recorded stage lists the names of the stages it is part of:
+
+        profiler = Profiler()
+        with profiler.stage('report'):
+            with profiler.stage('plots'):
+                ...
+        profiler.write(output / TIMINGS_FILE_NAME)
+    """
+
+    def __init__(self):
+        self.stages: list[dict] = []
+        self._parents: list[str] = []
+        self._measurement = Measurement().__enter__()
+
+    @contextmanager
+    def stage(self, name: str, function: Callable = None) -> Iterator[None]:
+        """
+        Measure a stage, nested in the stages that are in progress
+
+        :param name: The name of the stage
+        :param function: The registered plot or statistics function the stage runs, if any
+        """
+        # Recorded in start order, so a stage comes before the stages nested in it
+        record = self._new_record(name, function)
+        self.stages.append(record)
+        self._parents.append(name)
+        try:
+            with Measurement() as measurement:
+                yield
+        finally:
+            self._parents.pop()
+            record.update(measurement.to_dict())
+
+    def record(self, name: str, values: dict[str, float | int], function: Callable = None, parent: str = None):
+        """
+        Record a stage that was measured elsewhere, such as in a worker process, nested in the stages that are in
+        progress
+
+        :param name: The name of the stage
+        :param values: The measured values, see Measurement.to_dict
+        :param function: The registered plot or statistics function the stage ran, if any
+        :param parent: The name of a recorded stage this stage is part of, nested in the stages that are in progress
+        """
+        record = self._new_record(name, function, parent)
+        record.update(values)
+        self.stages.append(record)
+
+    def _new_record(self, name: str, function: Callable = None, parent: str = None) -> dict:
+        record = {'name': name, 'parents': self._parents + [parent] if parent is not None else list(self._parents)}
+        if function is not None:
+            record['function'] = getattr(function, '__qualname__', repr(function))
+        return record
+
+    def stop(self):
+        """
+        Stop measuring the totals of the profile, if not stopped yet
+        """
+        if self._measurement in _open_measurements:
+            self._measurement.__exit__(None, None, None)
+
+    def to_dict(self, **metadata) -> dict:
+        """
+        Stop the profile and get the recorded stages, with the totals of the whole profile
+
+        :param metadata: Additional values describing the profiled run, such as the benchmark name
+        :return: The timings, as written to timings.json
+        """
+        self.stop()
+        return {'version': TIMINGS_VERSION,
+                'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'memory_source': memory_source(),
+                **metadata,
+                'total': self._measurement.to_dict(),
+                'stages': self.stages}
+
+    def write(self, file: Path, **metadata):
+        """
+        Stop the profile and write the timings to a JSON file
+
+        :param file: The file to write, usually TIMINGS_FILE_NAME in the report's output directory
+        :param metadata: Additional values describing the profiled run, see to_dict
+        """
+        with open(file, 'w') as f:
+            f.write(json.dumps(self.to_dict(**metadata), indent=4))
+
+
+def profile_stage(profiler: Profiler | None, name: str, function: Callable = None) -> ContextManager:
+    """
+    Measure a stage if profiling, see Profiler.stage
+
+    :param profiler: The profiler, or None when not profiling
+    :param name: The name of the stage
+    :param function: The registered plot or statistics function the stage runs, if any
+    :return: The context manager measuring the stage
+    """
+    if profiler is None:
+        return nullcontext()
+    return profiler.stage(name, function)
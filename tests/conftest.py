@@ -0,0 +1,76 @@
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+# The modules import each other as main.py runs them, with PYTHONPATH=src
+sys.path[:0] = [str(ROOT / 'src'), str(ROOT)]
+
+from performance.synthetic_benchmark import SyntheticBenchmark  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def synthetic_benchmark(tmp_path_factory) -> Path:
+    """
+    A small synthetic benchmark of RandomPath and QuickRandomPath at 80, 90 and 100% edge coverage
+    """
+    benchmark_dir, _ = SyntheticBenchmark(generators=2, runs=5, vertices=10, edges=20, path_length=40).write(
+        tmp_path_factory.mktemp('synthetic'))
+    return benchmark_dir
+
+
+def rename_generator(benchmark_dir: Path, name: str, new_name: str, copy: bool = False,
+                     test_suite_size_factor: int = 1):
+    """
+    Rename or copy a generator of a benchmark, in its report and its runs directory
+
+    :param benchmark_dir: The benchmark directory
+    :param name: The generator to rename or copy
+    :param new_name: The new generator name
+    :param copy: Whether to keep the original generator
+    :param test_suite_size_factor: Factor of the test suite sizes in the report, to tell a copy apart
+    """
+    report_file = benchmark_dir / 'report.json'
+    report = json.loads(report_file.read_text())
+    generator = dict(report['Generators'][name])
+    for key in ('TotalTestSuiteSize', 'AverageTestSuiteSize', 'MinTestSuiteSize', 'MaxTestSuiteSize'):
+        generator[key] *= test_suite_size_factor
+    report['Generators'][new_name] = generator
+    if not copy:
+        del report['Generators'][name]
+    report_file.write_text(json.dumps(report, indent=2))
+
+    if copy:
+        shutil.copytree(benchmark_dir / 'runs' / name, benchmark_dir / 'runs' / new_name)
+    else:
+        (benchmark_dir / 'runs' / name).rename(benchmark_dir / 'runs' / new_name)
+
+
+@pytest.fixture
+def mixed_benchmark(tmp_path, synthetic_benchmark) -> Path:
+    """
+    The synthetic benchmark with mixed stop conditions: RandomPath(EdgeCoverage(80)) renamed to
+    RandomPath(TimeDuration(30)), which has no stop coverage, and RandomPath(EdgeCoverage(100)) copied to
+    RandomPath(EdgeCoverage(100) or TimeDuration(5)), of the same algorithm and stop coverage with twice the test suite
+    size
+    """
+    benchmark_dir = tmp_path / 'mixed'
+    shutil.copytree(synthetic_benchmark, benchmark_dir)
+    rename_generator(benchmark_dir, 'RandomPath(EdgeCoverage(80))', 'RandomPath(TimeDuration(30))')
+    rename_generator(benchmark_dir, 'RandomPath(EdgeCoverage(100))', 'RandomPath(EdgeCoverage(100) or TimeDuration(5))',
+                     copy=True, test_suite_size_factor=2)
+    return benchmark_dir
+
+
+@pytest.fixture
+def mixed_kinds_benchmark(mixed_benchmark) -> Path:
+    """
+    The mixed benchmark with RandomPath(EdgeCoverage(90)) also copied to RandomPath(VertexCoverage(90)), of the same
+    algorithm and stop coverage in another coverage kind with three times the test suite size
+    """
+    rename_generator(mixed_benchmark, 'RandomPath(EdgeCoverage(90))', 'RandomPath(VertexCoverage(90))', copy=True,
+                     test_suite_size_factor=3)
+    return mixed_benchmark
@@ -0,0 +1,64 @@
+import os
+import tempfile
+
+import pytest
+
+from models.benchmark import Benchmark
+from utils.benchmark_archive import EXTRACT_DIR_NAME, BenchmarkArchive, check_archive_format, pack_benchmark
+
+
+@pytest.fixture(autouse=True)
+def temp_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path / 'temp'))
+    (tmp_path / 'temp').mkdir()
+    return tmp_path / 'temp'
+
+
+@pytest.mark.parametrize('archive_type', ['zip', 'tar.gz'])
+def test_archive_loads_as_the_directory(synthetic_benchmark, tmp_path, archive_type):
+    archive_file = tmp_path / f'{synthetic_benchmark.name}.{archive_type}'
+    pack_benchmark(synthetic_benchmark, archive_file)
+
+    benchmark = Benchmark.from_dir(archive_file, jobs=2)
+    expected = Benchmark.from_dir(synthetic_benchmark)
+    assert benchmark.name == expected.name
+    assert [run_group.name for run_group in benchmark.run_groups_sorted] == \
+        [run_group.name for run_group in expected.run_groups_sorted]
+    assert [sorted(run.seed for run in run_group.runs) for run_group in benchmark.run_groups_sorted] == \
+        [sorted(run.seed for run in run_group.runs) for run_group in expected.run_groups_sorted]
+
+
+def test_tar_archive_is_extracted_once(synthetic_benchmark, tmp_path, temp_dir):
+    archive_file = tmp_path / f'{synthetic_benchmark.name}.tar.gz'
+    pack_benchmark(synthetic_benchmark, archive_file)
+
+    archive = BenchmarkArchive(archive_file)
+    [extracted] = (temp_dir / EXTRACT_DIR_NAME).glob('*/*')
+    assert archive.read_bytes(f'{archive.root}/report.json') == (synthetic_benchmark / 'report.json').read_bytes()
+    with archive.open_member(f'{archive.root}/report.json') as f:
+        assert f.read() == (synthetic_benchmark / 'report.json').read_bytes()
+
+    # Another process opening the same archive reuses the extracted files
+    extracted_report = extracted / archive.root / 'report.json'
+    modified = extracted_report.stat().st_mtime_ns
+    assert BenchmarkArchive(archive_file).files == archive.files
+    assert list((temp_dir / EXTRACT_DIR_NAME).glob('*/*')) == [extracted]
+    assert extracted_report.stat().st_mtime_ns == modified
+
+    # A new version of the archive replaces the previous extraction
+    os.utime(archive_file, ns=(archive_file.stat().st_atime_ns, archive_file.stat().st_mtime_ns + 10 ** 9))
+    BenchmarkArchive(archive_file)
+    assert [file.name for file in (temp_dir / EXTRACT_DIR_NAME).glob('*/*')] != [extracted.name]
+    assert not extracted.exists()
+
+
+def test_tar_zst_without_zstandard():
+    try:
+        import zstandard  # noqa: F401
+        pytest.skip('zstandard is installed')
+    except ImportError:
+        pass
+    check_archive_format('zip')
+    check_archive_format('tar.gz')
+    with pytest.raises(ImportError, match='zstandard'):
+        check_archive_format('tar.zst')
@@ -0,0 +1,129 @@
+import pytest
+
+from utils.benchmark_filter import GeneratorFilter, GeneratorPattern, compile_generator_filter, \
+    filter_blacklist_grouped_generators, filter_grouped_generators, filter_whitelist_grouped_generators
+from utils.benchmark_name_parser import group_by_series, parse_generator_name
+
+NAMES = ['QuickRandomPath(EdgeCoverage(80))', 'QuickRandomPath(EdgeCoverage(100))', 'RandomPath(EdgeCoverage(90))',
+         'RandomPath(EdgeCoverage(99.5))', 'RandomPath(ReachedVertex(v_A))',
+         'DirectedChinesePostmanPath(EdgeCoverage(70))', 'random(edge_coverage(50) and reached_vertex(v_Login))']
+
+
+class Item:
+    def __init__(self, name: str):
+        self.generator_name = parse_generator_name(name)
+
+
+def kept(whitelist: list[str] = None, blacklist: list[str] = None) -> list[str]:
+    generator_filter = GeneratorFilter(whitelist, blacklist)
+    return [name for name in NAMES if generator_filter.matches(name)]
+
+
+def test_empty_filter_keeps_every_generator():
+    assert GeneratorFilter().is_empty
+    assert kept() == NAMES
+
+
+def test_plain_algorithm_name_is_exact_and_case_insensitive():
+    assert GeneratorPattern('quickrandompath').algorithm == 'quickrandompath'
+    assert kept(['quickrandompath']) == ['QuickRandomPath(EdgeCoverage(80))', 'QuickRandomPath(EdgeCoverage(100))']
+    assert kept(['RandomPath']) == ['RandomPath(EdgeCoverage(90))', 'RandomPath(EdgeCoverage(99.5))',
+                                    'RandomPath(ReachedVertex(v_A))']
+
+
+def test_glob_head():
+    assert GeneratorPattern('*Random*').algorithm is None
+    assert kept(['Quick*']) == ['QuickRandomPath(EdgeCoverage(80))', 'QuickRandomPath(EdgeCoverage(100))']
+    assert kept(['?andomPath']) == ['RandomPath(EdgeCoverage(90))', 'RandomPath(EdgeCoverage(99.5))',
+                                    'RandomPath(ReachedVertex(v_A))']
+
+
+def test_regex_head():
+    assert kept(['/^(Random|random)/']) == ['RandomPath(EdgeCoverage(90))', 'RandomPath(EdgeCoverage(99.5))',
+                                            'RandomPath(ReachedVertex(v_A))',
+                                            'random(edge_coverage(50) and reached_vertex(v_Login))']
+    # A regex is searched, not matched against the whole algorithm
+    assert kept(['/Postman/']) == ['DirectedChinesePostmanPath(EdgeCoverage(70))']
+    # A colon inside the slashes belongs to the regex
+    assert kept(['/^Random(:|P)ath/:coverage>=95']) == ['RandomPath(EdgeCoverage(99.5))']
+
+
+def test_full_name_head():
+    assert kept(['RandomPath(EdgeCoverage(9*))']) == ['RandomPath(EdgeCoverage(90))', 'RandomPath(EdgeCoverage(99.5))']
+
+
+@pytest.mark.parametrize('clause, coverages', [
+    ('coverage>=90', [100, 90, 99.5]),
+    ('coverage<=80', [80, 70, 50]),
+    ('coverage>90', [100, 99.5]),
+    ('coverage<70', [50]),
+    ('coverage=90', [90]),
+    ('coverage==90', [90]),
+    ('coverage!=90', [80, 100, 99.5, 70, 50]),
+    ('coverage=80..99.5', [80, 90, 99.5]),
+    ('coverage = 60 .. 80', [80, 70]),
+])
+def test_coverage_clause(clause, coverages):
+    generator_filter = GeneratorFilter([f':{clause}'])
+    assert [parse_generator_name(name).stop_coverage for name in NAMES if generator_filter.matches(name)] == coverages
+
+
+def test_coverage_clause_never_matches_without_coverage():
+    assert 'RandomPath(ReachedVertex(v_A))' not in kept([':coverage!=90'])
+    assert 'RandomPath(ReachedVertex(v_A))' in kept(None, [':coverage>=0'])
+
+
+@pytest.mark.parametrize('pattern, names', [
+    ('*:condition=reached_vertex', ['RandomPath(ReachedVertex(v_A))',
+                                    'random(edge_coverage(50) and reached_vertex(v_Login))']),
+    ('*:condition=ReachedVertex', ['RandomPath(ReachedVertex(v_A))',
+                                   'random(edge_coverage(50) and reached_vertex(v_Login))']),
+    ('*:condition=*v_Login*', ['random(edge_coverage(50) and reached_vertex(v_Login))']),
+    ('*:condition=/^edge_coverage\\(\\d+\\)$/', ['random(edge_coverage(50) and reached_vertex(v_Login))']),
+    ('*:condition!=edge_coverage', ['RandomPath(ReachedVertex(v_A))']),
+])
+def test_condition_clause(pattern, names):
+    assert kept([pattern]) == names
+
+
+def test_clauses_must_all_hold():
+    assert kept(['*:coverage<80:condition=edge_coverage']) == [
+        'DirectedChinesePostmanPath(EdgeCoverage(70))', 'random(edge_coverage(50) and reached_vertex(v_Login))']
+
+
+def test_blacklist_overrides_whitelist():
+    assert kept(['QuickRandom*:coverage>=80', 'RandomPath'], ['RandomPath:coverage>95', ':condition=*Reached*']) == [
+        'QuickRandomPath(EdgeCoverage(80))', 'QuickRandomPath(EdgeCoverage(100))', 'RandomPath(EdgeCoverage(90))']
+
+
+@pytest.mark.parametrize('pattern, message', [
+    ('RandomPath:foo=1', 'Invalid clause'),
+    ('RandomPath:coverage', 'Invalid clause'),
+    ('RandomPath:coverage>=abc', 'Invalid coverage'),
+    ('RandomPath:coverage=a..b', 'Invalid coverage'),
+    ('RandomPath:condition>=edge_coverage', 'Invalid condition comparison'),
+])
+def test_invalid_pattern(pattern, message):
+    with pytest.raises(ValueError, match=message):
+        GeneratorPattern(pattern)
+
+
+def test_filter_grouped_drops_empty_groups():
+    grouped = group_by_series(Item(name) for name in NAMES)
+    filtered = GeneratorFilter(None, ['DirectedChinesePostmanPath', 'QuickRandomPath:coverage<100']).filter_grouped(
+        grouped)
+    assert 'DirectedChinesePostmanPath' not in filtered
+    assert [item.generator_name.name for item in filtered['QuickRandomPath']] == ['QuickRandomPath(EdgeCoverage(100))']
+    assert filtered['RandomPath'] == grouped['RandomPath']
+
+
+def test_compiled_filters_are_cached():
+    assert compile_generator_filter(('RandomPath',), None) is compile_generator_filter(('RandomPath',), None)
+
+
+def test_legacy_filter_functions():
+    grouped = group_by_series(Item(name) for name in NAMES)
+    assert list(filter_whitelist_grouped_generators(grouped, ['Quick*'])) == ['QuickRandomPath']
+    assert 'QuickRandomPath' not in filter_blacklist_grouped_generators(grouped, ['Quick*'])
+    assert list(filter_grouped_generators(grouped, ['*Path'], ['RandomPath'])) == ['QuickRandomPath',
+                                                                                   'DirectedChinesePostmanPath']
@@ -0,0 +1,182 @@
+import re
+import warnings
+
+import pytest
+
+from utils.benchmark_name_parser import group_by_series, group_like, mixed_coverage_algorithms, \
+    parse_algorithm_from_name, parse_coverage_from_stop_condition, parse_generator_name, parse_number, \
+    parse_stop_condition, parse_stop_condition_from_name, series_of
+
+
+class Item:
+    def __init__(self, name: str):
+        self.generator_name = parse_generator_name(name)
+
+
+def test_parse_generator_name():
+    name = parse_generator_name('RandomPath(EdgeCoverage(80))')
+    assert name.name == 'RandomPath(EdgeCoverage(80))'
+    assert name.algorithm == 'RandomPath'
+    assert name.stop_condition.text == 'EdgeCoverage(80)'
+    assert name.stop_condition.kinds == ('edge_coverage',)
+    assert name.stop_coverage == 80
+    assert isinstance(name.stop_coverage, int)
+
+
+def test_parse_generator_name_is_cached():
+    assert parse_generator_name('RandomPath(EdgeCoverage(80))') is parse_generator_name('RandomPath(EdgeCoverage(80))')
+
+
+@pytest.mark.parametrize('text, operators', [
+    ('edge_coverage(50) and reached_vertex(v_A)', ('and',)),
+    ('edge_coverage(50) AND reached_vertex(v_A)', ('and',)),
+    ('edge_coverage(50) && reached_vertex(v_A)', ('and',)),
+    ('edge_coverage(50) or reached_vertex(v_A)', ('or',)),
+    ('edge_coverage(50)||reached_vertex(v_A)', ('or',)),
+    ('edge_coverage(50) and reached_vertex(v_A) or time_duration(30)', ('and', 'or')),
+])
+def test_parse_stop_condition_operators(text, operators):
+    stop_condition = parse_stop_condition(text)
+    assert stop_condition.operators == operators
+    assert len(stop_condition.terms) == len(operators) + 1
+    assert stop_condition.terms[0].argument == '50'
+    assert stop_condition.terms[1].argument == 'v_A'
+
+
+@pytest.mark.parametrize('term, kind', [
+    ('EdgeCoverage(80)', 'edge_coverage'),
+    ('edge_coverage(80)', 'edge_coverage'),
+    ('VertexCoverage(80)', 'vertex_coverage'),
+    ('ReachedVertex(v_Login)', 'reached_vertex'),
+    ('TimeDuration(30)', 'time_duration'),
+    ('Never', 'never'),
+])
+def test_parse_stop_condition_kind(term, kind):
+    assert parse_stop_condition(term).kinds == (kind,)
+
+
+def test_parse_stop_condition_without_argument():
+    term = parse_stop_condition('Never').terms[0]
+    assert term.argument is None
+    assert str(term) == 'Never'
+
+
+@pytest.mark.parametrize('text, coverage, coverage_kind', [
+    ('EdgeCoverage(80)', 80, 'edge_coverage'),
+    ('EdgeCoverage(99.5)', 99.5, 'edge_coverage'),
+    ('TimeDuration(30)', None, None),
+    ('ReachedVertex(v_A)', None, None),
+    ('TimeDuration(5) or VertexCoverage(70) and EdgeCoverage(90)', 70, 'vertex_coverage'),
+])
+def test_stop_condition_coverage(text, coverage, coverage_kind):
+    assert parse_stop_condition(text).coverage == coverage
+    assert parse_stop_condition(text).coverage_kind == coverage_kind
+    assert parse_coverage_from_stop_condition(text) == coverage
+
+
+@pytest.mark.parametrize('name', [
+    'RandomPath',
+    'RandomPath()',
+    'RandomPath(EdgeCoverage(80) xor TimeDuration(5))',
+    'RandomPath(EdgeCoverage(80) and)',
+    'RandomPath(EdgeCoverage(80)',
+])
+def test_parse_generator_name_invalid(name):
+    with pytest.raises(ValueError):
+        parse_generator_name(name)
+
+
+@pytest.mark.parametrize('text, number', [('80', 80), ('80.5', 80.5), ('-1', -1), ('v_A', None), (None, None)])
+def test_parse_number(text, number):
+    assert parse_number(text) == number
+
+
+def test_legacy_parse_functions():
+    assert parse_algorithm_from_name('QuickRandomPath(EdgeCoverage(90))') == 'QuickRandomPath'
+    assert parse_stop_condition_from_name('QuickRandomPath(EdgeCoverage(90) or TimeDuration(5))') == \
+        'EdgeCoverage(90) or TimeDuration(5)'
+
+
+def test_sort_key_puts_generators_without_coverage_last():
+    names = ['RandomPath(TimeDuration(30))', 'RandomPath(EdgeCoverage(100) or TimeDuration(5))',
+             'RandomPath(EdgeCoverage(100))', 'RandomPath(EdgeCoverage(80))', 'QuickRandomPath(EdgeCoverage(90))']
+    assert sorted(names, key=lambda name: parse_generator_name(name).sort_key) == [
+        'QuickRandomPath(EdgeCoverage(90))', 'RandomPath(EdgeCoverage(80))', 'RandomPath(EdgeCoverage(100))',
+        'RandomPath(EdgeCoverage(100) or TimeDuration(5))', 'RandomPath(TimeDuration(30))']
+
+
+@pytest.mark.parametrize('name, series', [
+    ('RandomPath(EdgeCoverage(80))', 'RandomPath'),
+    ('RandomPath(edge_coverage(80))', 'RandomPath'),
+    ('RandomPath(EdgeCoverage(100) or TimeDuration(5))', 'RandomPath(EdgeCoverage(%) or TimeDuration(5))'),
+    ('RandomPath(EdgeCoverage(80) || TimeDuration(5))', 'RandomPath(EdgeCoverage(%) or TimeDuration(5))'),
+    ('RandomPath(TimeDuration(30))', 'RandomPath(TimeDuration(30))'),
+    ('RandomPath(reached_vertex(v_A) and edge_coverage(50))', 'RandomPath(reached_vertex(v_A) and edge_coverage(%))'),
+])
+def test_series(name, series):
+    assert parse_generator_name(name).series == series
+
+
+@pytest.mark.parametrize('name, series', [
+    ('RandomPath(EdgeCoverage(80))', 'RandomPath(EdgeCoverage(%))'),
+    ('RandomPath(vertex_coverage(80))', 'RandomPath(vertex_coverage(%))'),
+    ('RandomPath(EdgeCoverage(80) || TimeDuration(5))', 'RandomPath(EdgeCoverage(%) or TimeDuration(5))'),
+    ('RandomPath(TimeDuration(30))', 'RandomPath(TimeDuration(30))'),
+])
+def test_qualified_series(name, series):
+    generator_name = parse_generator_name(name)
+    assert generator_name.qualified_series == series
+    assert generator_name.series_among({'RandomPath'}) == series
+    assert generator_name.series_among({'QuickRandomPath'}) == generator_name.series
+
+
+def test_group_by_series():
+    items = [Item(name) for name in ['RandomPath(EdgeCoverage(80))', 'RandomPath(EdgeCoverage(100))',
+                                     'RandomPath(EdgeCoverage(100) or TimeDuration(5))',
+                                     'RandomPath(TimeDuration(30))', 'QuickRandomPath(EdgeCoverage(80))']]
+    grouped = group_by_series(items)
+    assert {series: [item.generator_name.name for item in series_items] for series, series_items in grouped.items()} \
+        == {'RandomPath': ['RandomPath(EdgeCoverage(80))', 'RandomPath(EdgeCoverage(100))'],
+            'RandomPath(EdgeCoverage(%) or TimeDuration(5))': ['RandomPath(EdgeCoverage(100) or TimeDuration(5))'],
+            'RandomPath(TimeDuration(30))': ['RandomPath(TimeDuration(30))'],
+            'QuickRandomPath': ['QuickRandomPath(EdgeCoverage(80))']}
+
+
+def test_group_by_series_qualifies_mixed_coverage_kinds():
+    items = [Item(name) for name in ['RandomPath(EdgeCoverage(80))', 'RandomPath(VertexCoverage(80))',
+                                     'RandomPath(EdgeCoverage(90))', 'RandomPath(EdgeCoverage(90) or TimeDuration(5))',
+                                     'QuickRandomPath(EdgeCoverage(80))']]
+    assert mixed_coverage_algorithms(item.generator_name for item in items) == {'RandomPath'}
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        grouped = group_by_series(items)
+    assert {series: [item.generator_name.name for item in series_items] for series, series_items in grouped.items()} \
+        == {'RandomPath(EdgeCoverage(%))': ['RandomPath(EdgeCoverage(80))', 'RandomPath(EdgeCoverage(90))'],
+            'RandomPath(VertexCoverage(%))': ['RandomPath(VertexCoverage(80))'],
+            'RandomPath(EdgeCoverage(%) or TimeDuration(5))': ['RandomPath(EdgeCoverage(90) or TimeDuration(5))'],
+            'QuickRandomPath': ['QuickRandomPath(EdgeCoverage(80))']}
+
+    # The algorithms to qualify may come from other items, such as the generators of other benchmarks
+    grouped = group_by_series(items[2:], mixed_algorithms={'RandomPath'})
+    assert list(grouped) == ['RandomPath(EdgeCoverage(%))', 'RandomPath(EdgeCoverage(%) or TimeDuration(5))',
+                             'QuickRandomPath']
+
+
+def test_group_by_series_leaves_out_duplicates():
+    items = [Item(name) for name in ['DuplicatePath(EdgeCoverage(80))', 'DuplicatePath(edge_coverage(80.0))',
+                                     'DuplicatePath(EdgeCoverage(90))']]
+    with pytest.warns(UserWarning, match=re.escape('DuplicatePath(edge_coverage(80.0))')):
+        grouped = group_by_series(items)
+    assert [item.generator_name.name for item in grouped['DuplicatePath']] == ['DuplicatePath(EdgeCoverage(80))',
+                                                                              'DuplicatePath(EdgeCoverage(90))']
+
+
+def test_group_like():
+    generators = group_by_series(Item(name) for name in ['RandomPath(EdgeCoverage(80))',
+                                                         'RandomPath(VertexCoverage(80))'])
+    run_groups = [Item(name) for name in ['RandomPath(VertexCoverage(80))', 'RandomPath(EdgeCoverage(70))',
+                                          'RandomPath(EdgeCoverage(80))']]
+    assert series_of(generators) == {'RandomPath(EdgeCoverage(80))': 'RandomPath(EdgeCoverage(%))',
+                                     'RandomPath(VertexCoverage(80))': 'RandomPath(VertexCoverage(%))'}
+    assert group_like(run_groups, generators) == {'RandomPath(VertexCoverage(%))': [run_groups[0]],
+                                                  'RandomPath(EdgeCoverage(%))': [run_groups[2]]}
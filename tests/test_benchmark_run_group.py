@@ -0,0 +1,79 @@
+import json
+import shutil
+
+import numpy as np
+
+from models.benchmark import Benchmark
+from models.benchmark_run_group import BenchmarkRunGroup
+from statistics.coverage_curves import CoverageCurves
+from statistics.redundancy_statistics import RedundancyStatistics
+
+
+def test_cached_computes_once_until_invalidated():
+    run_group = BenchmarkRunGroup.from_runs('RandomPath(EdgeCoverage(80))', [])
+    calls = []
+    assert run_group.cached('answer', lambda: calls.append(1) or 42) == 42
+    assert run_group.cached('answer', lambda: calls.append(1) or 0) == 42
+    assert calls == [1]
+
+    run_group.invalidate_aggregates()
+    assert run_group.cached('answer', lambda: 0) == 0
+
+
+def test_redundancy_metrics_are_cached(synthetic_benchmark):
+    benchmark = Benchmark.from_dir(synthetic_benchmark)
+    benchmark.load_model_graph(synthetic_benchmark.parent / 'models')
+    run_group = benchmark.run_groups_sorted[0]
+    metrics = RedundancyStatistics.run_group_metrics(benchmark.model_graph, benchmark.element_index, run_group)
+    assert len(metrics['excess_steps']) == len(run_group.runs)
+    assert RedundancyStatistics.run_group_metrics(benchmark.model_graph, benchmark.element_index, run_group) is metrics
+
+
+def test_coverage_curves_are_cached(synthetic_benchmark):
+    benchmark = Benchmark.from_dir(synthetic_benchmark)
+    run_group = benchmark.run_groups_sorted[0]
+    curves = CoverageCurves.run_group_curves(run_group, benchmark.element_index)
+    assert curves['edge'].shape[0] == len(run_group.runs)
+    assert CoverageCurves.run_group_curves(run_group, benchmark.element_index) is curves
+
+
+def test_path_codes_of_unknown_elements(synthetic_benchmark, tmp_path):
+    shutil.copytree(synthetic_benchmark, tmp_path / 'benchmark')
+    path_file = tmp_path / 'benchmark' / 'runs' / 'RandomPath(EdgeCoverage(80))' / 'run_0_path.json'
+    path = json.loads(path_file.read_text())
+    # An edge and a vertex of an older version of the model
+    path_file.write_text(json.dumps(path + [{'elementId': 'removed_edge'}, {'elementId': 'removed_vertex'}]))
+
+    benchmark = Benchmark.from_dir(tmp_path / 'benchmark')
+    benchmark.load_model_graph(synthetic_benchmark.parent / 'models')
+    element_index = benchmark.element_index
+    element_codes = dict(element_index.element_codes)
+    [run_group] = [run_group for run_group in benchmark.run_groups if run_group.name == path_file.parent.name]
+    [run] = [run for run in run_group.runs if run.path_file.name == path_file.name]
+    codes = run.path_codes(element_index)
+
+    assert element_index.element_codes == element_codes
+    assert codes[-2:].tolist() == [element_index.unknown_code] * 2
+    assert len(element_index.path_visits(codes)) == element_index.element_count
+    assert len(codes) == len(path) + 2 and (codes[:-2] < element_index.element_count).all()
+
+    metrics = RedundancyStatistics.run_group_metrics(benchmark.model_graph, element_index, run_group)
+    assert np.isfinite(metrics['excess_steps']).all()
+    curves = CoverageCurves.run_group_curves(run_group, element_index)
+    assert curves['edge'].max() <= 100 and curves['vertex'].max() <= 100
+
+
+def test_redundancy_bound_follows_the_coverage_kind(synthetic_benchmark):
+    benchmark = Benchmark.from_dir(synthetic_benchmark)
+    benchmark.load_model_graph(synthetic_benchmark.parent / 'models')
+    runs = benchmark.run_groups_sorted[0].runs
+
+    def excess_steps(name: str) -> np.ndarray:
+        return RedundancyStatistics.run_group_metrics(benchmark.model_graph, benchmark.element_index,
+                                                      BenchmarkRunGroup.from_runs(name, runs))['excess_steps']
+
+    vertex_bound = excess_steps('RandomPath(VertexCoverage(80))')
+    edge_bound = excess_steps('RandomPath(EdgeCoverage(80))')
+    assert not np.array_equal(vertex_bound, edge_bound)
+    assert np.array_equal(excess_steps('RandomPath(ReachedVertex(v_A) && VertexCoverage(80))'), vertex_bound)
+    assert np.array_equal(excess_steps('RandomPath(ReachedVertex(v_A) && EdgeCoverage(80))'), edge_bound)
@@ -0,0 +1,105 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from models.benchmark import Benchmark
+from plotters import benchmark_plotter
+from plotters.benchmark_plotter import BenchmarkPlotter
+from report.incremental_build import IncrementalBuild, _package_source_files
+from report.report_factory import ReportFactory
+from statistics.benchmark_statistics import BenchmarkStatistics
+
+
+@pytest.fixture
+def benchmark_dir(tmp_path, synthetic_benchmark) -> Path:
+    shutil.copytree(synthetic_benchmark, tmp_path / 'benchmark')
+    return tmp_path / 'benchmark'
+
+
+def fingerprints(benchmark_dir: Path, tmp_path: Path) -> dict[str, str]:
+    """
+    Fingerprint every plot and statistics task of a benchmark, in a new build
+    """
+    benchmark = Benchmark.from_dir(benchmark_dir)
+    grouped = benchmark.report.generators_grouped
+    build = IncrementalBuild(tmp_path / 'output')
+    tasks = BenchmarkPlotter.get_plot_tasks(benchmark, grouped) + \
+        BenchmarkStatistics.get_statistics_tasks(benchmark, grouped)
+    return {f'{task[0]}{task[3]}': build.fingerprint_task(benchmark, grouped, task) for task in tasks}
+
+
+def changed(before: dict[str, str], after: dict[str, str]) -> set[str]:
+    return {task for task in before if before[task] != after[task]}
+
+
+def test_path_changes_invalidate_tasks_at_their_coverage(benchmark_dir, tmp_path):
+    before = fingerprints(benchmark_dir, tmp_path)
+
+    path_file = benchmark_dir / 'runs' / 'RandomPath(EdgeCoverage(90))' / 'run_0_path.json'
+    path = json.loads(path_file.read_text())
+    path_file.write_text(json.dumps(path + path[-2:]))
+    after = fingerprints(benchmark_dir, tmp_path)
+
+    invalidated = changed(before, after)
+    assert 'Vertex Coverage over Steps - 90%(90,)' in invalidated
+    assert 'Edge Coverage over Steps - 90%(90,)' in invalidated
+    assert not any(task.endswith(('(80,)', '(100,)')) for task in invalidated)
+    # Per coverage plots of the report do not read the runs
+    assert 'Histogram Total Visited Edges - 90%(90,)' in before
+    assert 'Histogram Total Visited Edges - 90%(90,)' not in invalidated
+    # Tasks of every coverage only depend on the run files they read
+    assert after['Average Test Execution Time()'] == before['Average Test Execution Time()']
+    assert not any(task.startswith(('Average Test Execution Time', 'average_test_execution_time', 'generation_time'))
+                   for task in invalidated)
+
+
+def test_test_result_changes_invalidate_test_execution_tasks(benchmark_dir, tmp_path):
+    before = fingerprints(benchmark_dir, tmp_path)
+
+    test_results_file = benchmark_dir / 'runs' / 'RandomPath(EdgeCoverage(90))' / 'run_0_test_results.json'
+    test_results = json.loads(test_results_file.read_text())
+    test_results['testDuration'] += 1
+    test_results_file.write_text(json.dumps(test_results))
+    invalidated = changed(before, fingerprints(benchmark_dir, tmp_path))
+
+    assert 'Average Test Execution Time()' in invalidated
+    assert 'average_test_execution_time_comparison()' in invalidated
+    assert not any(task.startswith(('Edge Coverage over Steps', 'generation_time')) for task in invalidated)
+
+
+def test_unchanged_benchmark_keeps_fingerprints(benchmark_dir, tmp_path):
+    assert fingerprints(benchmark_dir, tmp_path) == fingerprints(benchmark_dir, tmp_path)
+
+
+def test_source_digest_covers_helper_modules(tmp_path):
+    build = IncrementalBuild(tmp_path)
+    source_files = {Path(source_file).name for source_file in _package_source_files(benchmark_plotter)}
+    assert {'benchmark_plotter.py', 'coverage_curves.py', 'model_graph.py', 'benchmark_run_group.py'} <= source_files
+    assert build._source_digest(BenchmarkPlotter.plot_edge_coverage_curves) == \
+        build._source_digest(BenchmarkPlotter.plot_vertex_coverage_curves)
+
+
+def test_images_of_removed_tasks_are_deleted(benchmark_dir, tmp_path):
+    output = tmp_path / 'output'
+    benchmark = Benchmark.from_dir(benchmark_dir)
+    build = IncrementalBuild(output)
+    ReportFactory.create_plots(benchmark, benchmark.report.generators_grouped, output / 'images', build=build)
+    build.save()
+    assert (output / 'images' / 'Edge Coverage over Steps - 80%.png').exists()
+
+    # Without the 80% generators, their coverage value has no plots anymore
+    report = json.loads((benchmark_dir / 'report.json').read_text())
+    for name in ('RandomPath(EdgeCoverage(80))', 'QuickRandomPath(EdgeCoverage(80))'):
+        del report['Generators'][name]
+        shutil.rmtree(benchmark_dir / 'runs' / name)
+    (benchmark_dir / 'report.json').write_text(json.dumps(report))
+
+    benchmark = Benchmark.from_dir(benchmark_dir)
+    build = IncrementalBuild.load(output)
+    names = ReportFactory.create_plots(benchmark, benchmark.report.generators_grouped, output / 'images', build=build)
+    build.save()
+
+    assert sorted(file.stem for file in (output / 'images').iterdir()) == sorted(names)
+    assert not any(artifact.endswith('80%.png') for artifact in IncrementalBuild.load(output).previous)
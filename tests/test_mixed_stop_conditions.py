@@ -0,0 +1,109 @@
+import json
+import shutil
+
+import pytest
+
+from models.benchmark import Benchmark
+from models.cross_benchmark import CrossBenchmark
+from report.incremental_build import IncrementalBuild
+from report.report_factory import ReportFactory
+from statistics.benchmark_statistics import BenchmarkStatistics
+from statistics.cross_benchmark_statistics import CrossBenchmarkStatistics
+from statistics.regression_detection import RegressionDetector
+
+COMPOUND_SERIES = 'RandomPath(EdgeCoverage(%) or TimeDuration(5))'
+TIME_SERIES = 'RandomPath(TimeDuration(30))'
+
+
+def test_generators_are_grouped_by_series(mixed_benchmark):
+    grouped = Benchmark.from_dir(mixed_benchmark).report.generators_grouped
+    assert {series: [generator.stop_coverage for generator in generators] for series, generators in grouped.items()} \
+        == {'QuickRandomPath': [80, 90, 100], 'RandomPath': [90, 100], COMPOUND_SERIES: [100], TIME_SERIES: [None]}
+
+
+def test_statistics_keep_both_generators_of_a_coverage(mixed_benchmark):
+    benchmark = Benchmark.from_dir(mixed_benchmark)
+    statistics = BenchmarkStatistics.create_statistics(benchmark, benchmark.report.generators_grouped)
+
+    sizes = statistics['total_test_suite_size_comparison']
+    assert sizes[COMPOUND_SERIES][100] == 2 * sizes['RandomPath'][100]
+    assert list(sizes[TIME_SERIES]) == [None]
+    assert list(statistics['generation_time_median'][COMPOUND_SERIES]) == [100]
+
+
+def test_cross_benchmark_with_generators_without_coverage(mixed_benchmark, tmp_path):
+    shutil.copytree(mixed_benchmark, tmp_path / 'mixed_copy')
+    cross_benchmark = CrossBenchmark([Benchmark.from_dir(mixed_benchmark),
+                                      Benchmark.from_dir(tmp_path / 'mixed_copy')])
+
+    assert cross_benchmark.aligned_keys == [('QuickRandomPath', 80), ('QuickRandomPath', 90), ('QuickRandomPath', 100),
+                                            ('RandomPath', 90), ('RandomPath', 100), (COMPOUND_SERIES, 100),
+                                            (TIME_SERIES, None)]
+    statistics = CrossBenchmarkStatistics.create_statistics(cross_benchmark)
+    assert list(statistics['generation_time_per_element'][TIME_SERIES]) == [None]
+
+
+def test_compare_with_generators_without_coverage(mixed_benchmark, tmp_path):
+    shutil.copytree(mixed_benchmark, tmp_path / 'mixed_copy')
+    results = RegressionDetector().compare(Benchmark.from_dir(mixed_benchmark),
+                                           Benchmark.from_dir(tmp_path / 'mixed_copy'))
+
+    generators = list(dict.fromkeys(result['generator'] for result in results))
+    assert generators[-3:] == ['RandomPath(EdgeCoverage(100))', 'RandomPath(EdgeCoverage(100) or TimeDuration(5))',
+                               'RandomPath(TimeDuration(30))']
+    assert all(result['status'] == 'unchanged' for result in results)
+
+
+def test_incremental_statistics_restore_generators_without_coverage(mixed_benchmark, tmp_path):
+    benchmark = Benchmark.from_dir(mixed_benchmark)
+    grouped = benchmark.report.generators_grouped
+
+    build = IncrementalBuild(tmp_path)
+    statistics = ReportFactory.create_statistics(benchmark, grouped, build)
+    build.save()
+
+    build = IncrementalBuild.load(tmp_path)
+    restored = ReportFactory.create_statistics(benchmark, grouped, build)
+    assert build.artifacts and all(build.artifacts[artifact] is build.previous[artifact]
+                                   for artifact in build.artifacts)
+    assert restored['total_test_suite_size_comparison'][TIME_SERIES] == {None: 100.0}
+    assert json.dumps(restored, sort_keys=True) == json.dumps(statistics, sort_keys=True)
+
+
+def test_cross_benchmark_normalizes_by_the_coverage_kind_of_each_generator(mixed_benchmark, tmp_path):
+    shutil.copytree(mixed_benchmark, tmp_path / 'mixed_copy')
+    benchmark = Benchmark.from_dir(mixed_benchmark)
+    statistics = CrossBenchmarkStatistics.create_statistics(CrossBenchmark([benchmark,
+                                                                            Benchmark.from_dir(tmp_path / 'mixed_copy')]))
+
+    model = benchmark.report.model
+    generators = {generator.name: generator for generator in benchmark.report.generators}
+    sizes = statistics['test_suite_size_per_element']
+    assert sizes['QuickRandomPath'][80][benchmark.name] == pytest.approx(
+        generators['QuickRandomPath(EdgeCoverage(80))'].average_test_suite_size / model.edges)
+    assert sizes[TIME_SERIES][None][benchmark.name] == pytest.approx(
+        generators['RandomPath(TimeDuration(30))'].average_test_suite_size / (model.vertices + model.edges))
+
+
+
+def test_mixed_coverage_kinds_keep_every_generator(mixed_kinds_benchmark):
+    benchmark = Benchmark.from_dir(mixed_kinds_benchmark)
+    grouped = benchmark.report.generators_grouped
+    assert {series: [generator.stop_coverage for generator in generators] for series, generators in grouped.items()} \
+        == {'QuickRandomPath': [80, 90, 100], 'RandomPath(EdgeCoverage(%))': [90, 100],
+            'RandomPath(VertexCoverage(%))': [90], COMPOUND_SERIES: [100], TIME_SERIES: [None]}
+
+    statistics = BenchmarkStatistics.create_statistics(benchmark, grouped)
+    sizes = statistics['total_test_suite_size_comparison']
+    assert sizes['RandomPath(VertexCoverage(%))'][90] == 3 * sizes['RandomPath(EdgeCoverage(%))'][90]
+    assert list(statistics['generation_time_median']['RandomPath(VertexCoverage(%))']) == [90]
+    assert list(statistics['average_test_execution_time_comparison']['RandomPath(VertexCoverage(%))']) == [90]
+
+
+def test_cross_benchmark_qualifies_series_mixed_in_any_benchmark(mixed_kinds_benchmark, synthetic_benchmark):
+    cross_benchmark = CrossBenchmark([Benchmark.from_dir(synthetic_benchmark),
+                                      Benchmark.from_dir(mixed_kinds_benchmark)])
+    assert cross_benchmark.aligned_keys == [('QuickRandomPath', 80), ('QuickRandomPath', 90), ('QuickRandomPath', 100),
+                                            ('RandomPath(EdgeCoverage(%))', 90), ('RandomPath(EdgeCoverage(%))', 100)]
+    statistics = CrossBenchmarkStatistics.create_statistics(cross_benchmark)
+    assert list(statistics['generation_time_per_element']['RandomPath(EdgeCoverage(%))']) == [90, 100]
@@ -0,0 +1,103 @@
+import itertools
+from collections import deque
+
+import numpy as np
+import pytest
+
+from models.model_graph import ModelGraph
+
+GRAPHS = 300
+
+
+def random_graph(rng: np.random.Generator) -> ModelGraph:
+    vertex_count = int(rng.integers(1, 6))
+    edge_count = int(rng.integers(1, 8))
+    edge_sources = rng.integers(0, vertex_count, edge_count)
+    edge_targets = rng.integers(0, vertex_count, edge_count)
+    return ModelGraph(vertex_count, edge_sources, edge_targets, start=int(rng.integers(0, vertex_count)))
+
+
+def shortest_covering_walk(graph: ModelGraph, edge_mask: np.ndarray, start: int) -> float:
+    """
+    The number of edges of the shortest walk from the start vertex that traverses every required edge, by a
+    breadth-first search over (vertex, traversed required edges)
+    """
+    required = {edge: bit for bit, edge in enumerate(np.flatnonzero(edge_mask))}
+    complete = (1 << len(required)) - 1
+    outgoing = [[(edge, int(graph.edge_targets[edge])) for edge in np.flatnonzero(graph.edge_sources == vertex)]
+                for vertex in range(graph.vertex_count)]
+
+    steps = {(start, 0): 0}
+    queue = deque([(start, 0)])
+    while queue:
+        vertex, traversed = queue.popleft()
+        if traversed == complete:
+            return float(steps[vertex, traversed])
+        for edge, target in outgoing[vertex]:
+            state = (target, traversed | (1 << required[edge]) if edge in required else traversed)
+            if state not in steps:
+                steps[state] = steps[vertex, traversed] + 1
+                queue.append(state)
+    return np.inf
+
+
+def brute_force_balancing_cost(balance: np.ndarray, distances: np.ndarray) -> float:
+    """
+    The minimal balancing cost over every assignment of the units of supply to the units of demand, one unit of which
+    may be left over at no cost
+    """
+    sources = [vertex for vertex in np.flatnonzero(balance > 0) for _ in range(balance[vertex])]
+    sinks = [vertex for vertex in np.flatnonzero(balance < 0) for _ in range(-balance[vertex])]
+    sinks += [None] * (len(sources) - len(sinks))
+    return min((sum(0.0 if sink is None else distances[source, sink] for source, sink in zip(sources, assignment))
+                for assignment in set(itertools.permutations(sinks))), default=0.0)
+
+
+def balance_of(graph: ModelGraph, edge_mask: np.ndarray, start: int) -> np.ndarray:
+    required = np.flatnonzero(edge_mask)
+    balance = (np.bincount(graph.edge_targets[required], minlength=graph.vertex_count) -
+               np.bincount(graph.edge_sources[required], minlength=graph.vertex_count))
+    balance[start] += 1
+    return balance
+
+
+def is_strongly_connected(graph: ModelGraph) -> bool:
+    return bool(np.isfinite(graph.distances).all())
+
+
+@pytest.mark.parametrize('seed', range(GRAPHS))
+def test_covering_walk_lower_bound_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    graph = random_graph(rng)
+    edge_mask = rng.random(graph.edge_count) < 0.6
+
+    bound = graph.covering_walk_lower_bound(edge_mask)
+    balance = balance_of(graph, edge_mask, graph.start)
+    if edge_mask.any():
+        assert bound == edge_mask.sum() + brute_force_balancing_cost(balance, graph.distances)
+    else:
+        assert bound == 0
+
+    # A lower bound of every covering walk, reached by the Chinese postman walk of a strongly connected graph
+    shortest = shortest_covering_walk(graph, edge_mask, graph.start)
+    assert bound <= shortest
+    if is_strongly_connected(graph):
+        assert graph.chinese_postman_bound == shortest_covering_walk(graph, np.ones(graph.edge_count, dtype=bool),
+                                                                     graph.start)
+
+
+@pytest.mark.parametrize('balance, distances, cost', [
+    # Each sink is reached from its nearest source, the left over unit stays at the first source
+    ([2, 1, -1, -1], [[0, 1, 1, 5], [1, 0, 5, 1], [1, 1, 0, 1], [1, 1, 1, 0]], 2),
+    # Every walk may end where it started
+    ([1, 0], [[0, 1], [1, 0]], 0),
+    # A sink that no source reaches
+    ([2, -1], [[0, np.inf], [np.inf, 0]], np.inf),
+    # A sink that no source reaches, left after the other sinks are balanced
+    ([2, 1, -1, -1], [[0, 1, 1, np.inf], [1, 0, 1, np.inf], [1, 1, 0, np.inf], [np.inf, np.inf, np.inf, 0]], np.inf),
+])
+def test_balancing_cost(balance, distances, cost):
+    balance = np.array(balance)
+    distances = np.array(distances, dtype=float)
+    assert ModelGraph._balancing_cost(balance, distances) == cost
+    assert brute_force_balancing_cost(balance, distances) == cost
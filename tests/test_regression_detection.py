@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from statistics.regression_detection import RegressionDetector, bootstrap_median_ratio, mann_whitney_u, rank_with_ties
+
+
+def test_rank_with_ties():
+    assert rank_with_ties(np.array([3, 1, 2, 2, 3, 3])).tolist() == [5, 1, 2.5, 2.5, 5, 5]
+
+
+@pytest.mark.parametrize('baseline, candidate, u, p_value', [
+    # The normal approximation of R's wilcox.test(candidate, baseline, alternative = "greater", exact = FALSE)
+    ([1, 2, 3], [4, 5, 6], 9, 0.04042780),
+    ([1, 2, 3, 4, 5], [6, 7, 8, 9, 10], 25, 0.00609289),
+    ([4, 5, 6], [1, 2, 3], 0, 0.98545183),
+    # Ties: ranks 1, 2.5, 2.5, 5, 5, 5, 7, the tie correction is (2^3 - 2 + 3^3 - 3) / (7 * 6)
+    ([1, 2, 3], [2, 3, 3, 4], 9.5, 0.13318996),
+    # Zero variance within each sample, but not across them
+    ([1, 1, 1], [2, 2, 2], 9, 0.02342709),
+])
+def test_mann_whitney_u_known_values(baseline, candidate, u, p_value):
+    assert mann_whitney_u(np.array(baseline, dtype=float), np.array(candidate, dtype=float)) == \
+        pytest.approx((u, p_value))
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_mann_whitney_u_counts_the_larger_pairs(seed):
+    rng = np.random.default_rng(seed)
+    baseline = rng.integers(0, 6, int(rng.integers(1, 10))).astype(float)
+    candidate = rng.integers(0, 6, int(rng.integers(1, 10))).astype(float)
+
+    u, _ = mann_whitney_u(baseline, candidate)
+    pairs = (candidate[:, np.newaxis] > baseline).sum() + 0.5 * (candidate[:, np.newaxis] == baseline).sum()
+    assert u == pairs
+    assert u + mann_whitney_u(candidate, baseline)[0] == len(baseline) * len(candidate)
+
+
+def test_mann_whitney_u_all_tied():
+    samples = np.full(5, 3.0)
+    assert mann_whitney_u(samples, samples) == (12.5, 1.0)
+    assert mann_whitney_u(np.array([7.0]), np.array([7.0])) == (0.5, 1.0)
+
+    result = RegressionDetector().compare_samples(samples, samples)
+    assert result['p_value'] == 1.0
+    assert result['change'] == 0
+    assert result['status'] == 'unchanged'
+
+
+@pytest.mark.parametrize('baseline, candidate, ratio', [
+    ([2, 2, 2], [3, 3, 3], 1.5),
+    ([4, 4], [4, 4, 4], 1.0),
+    ([0, 0, 0], [0, 0], 1.0),
+    ([0, 0, 0], [3, 3, 3], np.inf),
+])
+def test_bootstrap_median_ratio_zero_variance(baseline, candidate, ratio):
+    assert bootstrap_median_ratio(np.array(baseline, dtype=float), np.array(candidate, dtype=float),
+                                  resamples=100) == (ratio, ratio)
+
+
+def test_bootstrap_median_ratio_interval():
+    rng = np.random.default_rng(1)
+    baseline = rng.normal(100, 5, 40)
+    candidate = rng.normal(120, 5, 40)
+
+    low, high = bootstrap_median_ratio(baseline, candidate, resamples=2000)
+    assert low < np.median(candidate) / np.median(baseline) < high
+    assert 1 < low and high < 1.4
+    assert bootstrap_median_ratio(baseline, candidate, resamples=2000) == (low, high)
+    assert bootstrap_median_ratio(baseline, candidate, confidence=0.5, resamples=2000) != (low, high)
+
+
+@pytest.mark.parametrize('method', ['mann_whitney', 'bootstrap'])
+def test_compare_samples_status(method):
+    rng = np.random.default_rng(2)
+    baseline = rng.normal(100, 5, 30)
+    detector = RegressionDetector(method, resamples=2000)
+
+    assert detector.compare_samples(baseline, baseline * 1.2)['status'] == 'regression'
+    assert detector.compare_samples(baseline, baseline * 0.8)['status'] == 'improvement'
+    # Significant, but below the threshold
+    assert detector.compare_samples(baseline, baseline + 1)['status'] == 'unchanged'
+    assert detector.compare_samples(np.zeros(5), np.full(5, 3.0))['status'] == 'regression'
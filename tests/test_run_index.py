@@ -0,0 +1,34 @@
+import sqlite3
+
+import pytest
+
+from models.benchmark import Benchmark
+from models.run_index import RunIndex
+
+
+@pytest.fixture
+def index(tmp_path, synthetic_benchmark):
+    with RunIndex(tmp_path / 'runs.sqlite') as index:
+        index.add(Benchmark.from_dir(synthetic_benchmark))
+        yield index
+
+
+def test_query(index, synthetic_benchmark):
+    result = index.query('SELECT algorithm, COUNT(*) AS runs FROM run_view GROUP BY algorithm ORDER BY algorithm')
+    assert result['algorithm'].tolist() == ['QuickRandomPath', 'RandomPath']
+    assert result['runs'].tolist() == [15, 15]
+
+
+@pytest.mark.parametrize('sql', ['DROP TABLE runs', 'DELETE FROM runs', 'UPDATE runs SET seed = 0',
+                                 'CREATE TABLE notes (text TEXT)', 'PRAGMA query_only = OFF; DELETE FROM runs'])
+def test_query_cannot_change_the_index(index, sql):
+    with pytest.raises((sqlite3.OperationalError, sqlite3.ProgrammingError)):
+        index.query(sql)
+    assert index.query('SELECT COUNT(*) AS runs FROM runs')['runs'].tolist() == [30]
+
+
+def test_index_stays_writable_after_a_query(index, synthetic_benchmark):
+    with pytest.raises(sqlite3.OperationalError):
+        index.query('DROP TABLE runs')
+    index.remove(synthetic_benchmark.name)
+    assert index.benchmarks == {}
@@ -0,0 +1,58 @@
+import json
+import math
+import shutil
+
+import numpy as np
+import pytest
+
+from models.benchmark import Benchmark
+from report.report_factory import ReportFactory
+from statistics.benchmark_statistics import BenchmarkStatistics
+from statistics.statistics_engine import StatisticsEngine
+
+
+def strict_loads(text: str):
+    def reject(constant: str):
+        raise ValueError(f'{constant} is not valid JSON')
+    return json.loads(text, parse_constant=reject)
+
+
+class Item:
+    def __init__(self, stop_coverage: int, value: float):
+        self.stop_coverage = stop_coverage
+        self.value = value
+
+
+def test_percentual_comparison_of_a_zero_value():
+    engine = StatisticsEngine.from_grouped([{'A': [Item(80, 0), Item(90, 2)], 'B': [Item(80, 5), Item(90, 4)]}],
+                                           {'value': lambda item: item.value})
+    [comparison] = engine.percentual_comparison_dicts()
+    assert math.isnan(comparison['value']['A'][80])
+    assert comparison['value']['B'][80] == np.inf
+    assert comparison['value']['B'][90] == 200
+
+    assert strict_loads(ReportFactory.to_json(comparison)) == {'value': {'A': {'80': None, '90': 100.0},
+                                                                         'B': {'80': None, '90': 200.0}}}
+
+
+def test_to_json_keeps_finite_values():
+    value = {'a': [1, 2.5, 'text', None, True], 'b': {1: -0.5}, 'c': (float('-inf'), np.float64(np.nan))}
+    assert strict_loads(ReportFactory.to_json(value)) == {'a': [1, 2.5, 'text', None, True], 'b': {'1': -0.5},
+                                                          'c': [None, None]}
+
+
+def test_statistics_of_a_zero_generation_time_are_valid_json(synthetic_benchmark, tmp_path):
+    benchmark_dir = tmp_path / 'benchmark'
+    shutil.copytree(synthetic_benchmark, benchmark_dir)
+    report = json.loads((benchmark_dir / 'report.json').read_text())
+    report['Generators']['RandomPath(EdgeCoverage(80))']['MinGenerationTime'] = 0
+    (benchmark_dir / 'report.json').write_text(json.dumps(report))
+
+    benchmark = Benchmark.from_dir(benchmark_dir)
+    statistics = BenchmarkStatistics.create_statistics(benchmark, benchmark.report.generators_grouped)
+    assert statistics['min_generation_time_comparison']['QuickRandomPath'][80] == np.inf
+
+    restored = strict_loads(ReportFactory.to_json(statistics))
+    assert restored['min_generation_time_comparison']['QuickRandomPath']['80'] is None
+    assert restored['min_generation_time_comparison']['RandomPath']['90'] == pytest.approx(
+        statistics['min_generation_time_comparison']['RandomPath'][90])